@@ -0,0 +1,207 @@
+"""Before/after query plans for the performance index migration.
+
+Usage (from the project root, with DB_* settings in .env):
+
+    python -m database.benchmarks.index_query_plans [--seed-rows 20000]
+
+Everything runs in a single transaction that is rolled back at the end:
+optional synthetic rows are inserted, the indexes from migration 004 are
+ensured, each hot query is EXPLAIN ANALYZE'd, the indexes are dropped and the
+queries are explained again. Dropping an index inside the transaction holds
+an exclusive lock on its table until the rollback, so run this against a
+development database or outside working hours.
+"""
+
+import argparse
+import os
+import re
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MIGRATION_FILE = PROJECT_ROOT / "database" / "migrations" / "004_20261017_add_performance_indexes.sql"
+
+HOT_QUERIES = [
+    ("file_client_batch by file/client",
+     "SELECT batch_number FROM file_client_batch WHERE file_id = %(file_id)s AND client_id = %(client_id)s ORDER BY id DESC LIMIT 1"),
+    ("file_client_batch by batch/client",
+     "SELECT file_id FROM file_client_batch WHERE batch_number = %(batch_number)s AND client_id = %(client_id)s"),
+    ("file_client_price by file",
+     "SELECT client_id FROM file_client_price WHERE file_id = %(file_id)s"),
+    ("earnings by item_price",
+     "SELECT id, amount FROM earnings WHERE item_price_id = %(item_price_id)s"),
+    ("earnings by team",
+     "SELECT COUNT(*) FROM earnings WHERE team_id = %(team_id)s"),
+    ("attendance by team/date",
+     "SELECT id FROM attendance WHERE team_id = %(team_id)s AND date >= %(date_from)s AND date < %(date_to)s"),
+    ("file_url by file",
+     "SELECT id, url_value FROM file_url WHERE file_id = %(file_id)s ORDER BY created_at DESC"),
+    ("files by status",
+     "SELECT id FROM files WHERE status_id = %(status_id)s LIMIT 20"),
+    ("files by root",
+     "SELECT id FROM files WHERE root = %(root)s LIMIT 20"),
+    ("files by category/subcategory",
+     "SELECT id FROM files WHERE category_id = %(category_id)s AND subcategory_id = %(subcategory_id)s LIMIT 20"),
+    ("wallet_transactions by pocket",
+     "SELECT id FROM wallet_transactions WHERE pocket_id = %(pocket_id)s ORDER BY transaction_date DESC LIMIT 100"),
+    ("wallet_transaction_items by transaction",
+     "SELECT id FROM wallet_transaction_items WHERE wallet_transaction_id = %(wallet_transaction_id)s ORDER BY id"),
+]
+
+SEED_SQL = """
+    INSERT INTO statuses (name) VALUES ('bench_status') ON CONFLICT (name) DO NOTHING;
+    INSERT INTO categories (name) VALUES ('bench_category') ON CONFLICT (name) DO NOTHING;
+    INSERT INTO subcategories (category_id, name)
+        SELECT id, 'bench_sub_' || g FROM categories, generate_series(1, 20) g WHERE name = 'bench_category';
+    INSERT INTO client (client_name) SELECT 'bench_client_' || g FROM generate_series(1, 50) g;
+    INSERT INTO teams (username, full_name) SELECT 'bench_team_' || g, 'Bench ' || g FROM generate_series(1, 20) g;
+    INSERT INTO url_provider (name) VALUES ('bench_provider') ON CONFLICT (name) DO NOTHING;
+    INSERT INTO wallet_pockets (name) SELECT 'bench_pocket_' || g FROM generate_series(1, 10) g;
+    INSERT INTO wallet_currency (code, name) VALUES ('BNC', 'Bench') ON CONFLICT (code) DO NOTHING;
+
+    -- Parents are picked from the rows seeded above, never by id arithmetic:
+    -- ids of a real database have gaps
+    CREATE TEMP TABLE bench_parents ON COMMIT DROP AS SELECT
+        (SELECT array_agg(s.id ORDER BY s.id) FROM subcategories s JOIN categories c ON c.id = s.category_id
+         WHERE c.name = 'bench_category' AND starts_with(s.name, 'bench_sub_')) AS subcategory_ids,
+        (SELECT array_agg(id ORDER BY id) FROM client WHERE starts_with(client_name, 'bench_client_')) AS client_ids,
+        (SELECT array_agg(id ORDER BY id) FROM teams WHERE starts_with(username, 'bench_team_')) AS team_ids,
+        (SELECT array_agg(id ORDER BY id) FROM wallet_pockets WHERE starts_with(name, 'bench_pocket_')) AS pocket_ids;
+
+    INSERT INTO batch_list (batch_number, client_id)
+        SELECT 'BENCH-' || g, p.client_ids[1] FROM bench_parents p, generate_series(1, 200) g;
+    INSERT INTO files (date, name, root, path, status_id, category_id, subcategory_id)
+        SELECT '2025\\Januari\\01', 'bench_' || g, 'ROOT' || (g %% 10), '/bench/' || g,
+               (SELECT id FROM statuses WHERE name = 'bench_status'),
+               (SELECT id FROM categories WHERE name = 'bench_category'),
+               p.subcategory_ids[1 + g %% cardinality(p.subcategory_ids)]
+        FROM bench_parents p, generate_series(1, %(rows)s) g;
+    CREATE TEMP TABLE bench_files ON COMMIT DROP AS
+        SELECT id FROM files WHERE starts_with(name, 'bench_') AND starts_with(path, '/bench/');
+    INSERT INTO item_price (file_id, price, currency)
+        SELECT id, 1000, 'IDR' FROM bench_files;
+    INSERT INTO file_client_price (file_id, item_price_id, client_id)
+        SELECT ip.file_id, ip.id, p.client_ids[1 + ip.id %% cardinality(p.client_ids)]
+        FROM bench_parents p, item_price ip JOIN bench_files f ON f.id = ip.file_id;
+    INSERT INTO file_client_batch (batch_number, client_id, file_id)
+        SELECT 'BENCH-' || (1 + fcp.id %% 200), fcp.client_id, fcp.file_id
+        FROM file_client_price fcp JOIN bench_files f ON f.id = fcp.file_id;
+    INSERT INTO earnings (team_id, item_price_id, amount)
+        SELECT p.team_ids[1 + ip.id %% cardinality(p.team_ids)], ip.id, 450
+        FROM bench_parents p, item_price ip JOIN bench_files f ON f.id = ip.file_id;
+    INSERT INTO attendance (team_id, date, check_in)
+        SELECT p.team_ids[1 + g %% cardinality(p.team_ids)], DATE '2020-01-01' + (g / 20), now()
+        FROM bench_parents p, generate_series(1, %(rows)s) g;
+    INSERT INTO file_url (file_id, provider_id, url_value)
+        SELECT id, (SELECT id FROM url_provider WHERE name = 'bench_provider'), 'https://example.invalid/' || id
+        FROM bench_files;
+    INSERT INTO wallet_transactions (pocket_id, currency_id, transaction_name, transaction_date, transaction_type)
+        SELECT p.pocket_ids[1 + g %% cardinality(p.pocket_ids)], (SELECT id FROM wallet_currency WHERE code = 'BNC'),
+               'bench_tx_' || g, now() - (g || ' minutes')::interval, 'expense'
+        FROM bench_parents p, generate_series(1, %(rows)s) g;
+    INSERT INTO wallet_transaction_items (wallet_transaction_id, item_type, item_name, amount)
+        SELECT id, 'bench', 'item', 1 FROM wallet_transactions WHERE starts_with(transaction_name, 'bench_tx_');
+"""
+
+
+def load_index_statements():
+    statements = []
+    with open(MIGRATION_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.upper().startswith("CREATE INDEX"):
+                statements.append(line.rstrip(";").replace(" CONCURRENTLY", ""))
+    return statements
+
+
+def load_sample_params(cursor):
+    params = {"date_from": "2020-01-01", "date_to": "2020-02-01"}
+    samples = {
+        "file_id": "SELECT file_id FROM file_client_price ORDER BY id DESC LIMIT 1",
+        "client_id": "SELECT client_id FROM file_client_price ORDER BY id DESC LIMIT 1",
+        "batch_number": "SELECT batch_number FROM file_client_batch ORDER BY id DESC LIMIT 1",
+        "item_price_id": "SELECT item_price_id FROM earnings ORDER BY id DESC LIMIT 1",
+        "team_id": "SELECT team_id FROM attendance ORDER BY id DESC LIMIT 1",
+        "status_id": "SELECT status_id FROM files ORDER BY id DESC LIMIT 1",
+        "root": "SELECT root FROM files ORDER BY id DESC LIMIT 1",
+        "category_id": "SELECT category_id FROM files WHERE category_id IS NOT NULL ORDER BY id DESC LIMIT 1",
+        "subcategory_id": "SELECT subcategory_id FROM files WHERE subcategory_id IS NOT NULL ORDER BY id DESC LIMIT 1",
+        "pocket_id": "SELECT pocket_id FROM wallet_transactions ORDER BY id DESC LIMIT 1",
+        "wallet_transaction_id": "SELECT wallet_transaction_id FROM wallet_transaction_items ORDER BY id DESC LIMIT 1",
+    }
+    for key, sql in samples.items():
+        cursor.execute(sql)
+        row = cursor.fetchone()
+        params[key] = row[0] if row else None
+    return params
+
+
+def explain(cursor, sql, params):
+    cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT TEXT) " + sql, params)
+    lines = [row[0] for row in cursor.fetchall()]
+    execution = next((line for line in lines if line.startswith("Execution Time")), "")
+    return lines, execution
+
+
+def run(seed_rows=0, verbose=False):
+    load_dotenv(PROJECT_ROOT / ".env")
+    dsn = {
+        "host": os.getenv("DB_HOST"),
+        "port": os.getenv("DB_PORT"),
+        "dbname": os.getenv("DB_NAME"),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASSWORD"),
+    }
+    if os.getenv("DB_SSLMODE"):
+        dsn["sslmode"] = os.getenv("DB_SSLMODE")
+
+    conn = psycopg2.connect(**dsn)
+    cursor = conn.cursor()
+    try:
+        if seed_rows:
+            print(f"[BENCH] Seeding {seed_rows} synthetic rows per table (rolled back afterwards)")
+            cursor.execute(SEED_SQL, {"rows": seed_rows})
+
+        index_statements = load_index_statements()
+        for statement in index_statements:
+            cursor.execute(statement)
+        cursor.execute("ANALYZE")
+        params = load_sample_params(cursor)
+
+        results = {}
+        for label, sql in HOT_QUERIES:
+            results[label] = {"after": explain(cursor, sql, params)}
+
+        for statement in index_statements:
+            index_name = re.search(r"IF NOT EXISTS (\w+)", statement).group(1)
+            cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+        for label, sql in HOT_QUERIES:
+            results[label]["before"] = explain(cursor, sql, params)
+
+        for label, _ in HOT_QUERIES:
+            before_lines, before_time = results[label]["before"]
+            after_lines, after_time = results[label]["after"]
+            print(f"\n== {label}")
+            print(f"   before: {before_lines[0].strip()}")
+            print(f"           {before_time}")
+            print(f"   after:  {after_lines[0].strip()}")
+            print(f"           {after_time}")
+            if verbose:
+                print("   -- before plan --")
+                print("\n".join("   " + line for line in before_lines))
+                print("   -- after plan --")
+                print("\n".join("   " + line for line in after_lines))
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare query plans with and without the performance indexes.")
+    parser.add_argument("--seed-rows", type=int, default=0, help="insert N synthetic rows per table inside the rolled-back transaction")
+    parser.add_argument("--verbose", action="store_true", help="print the full plans")
+    args = parser.parse_args()
+    run(seed_rows=args.seed_rows, verbose=args.verbose)
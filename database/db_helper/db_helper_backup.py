@@ -1,113 +1,171 @@
 import os
 import csv
+import gzip
+import io
+import json
+import queue
 import sys
 import shutil
 import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 from PySide6.QtCore import QTimer
 from helpers.show_statusbar_helper import show_statusbar_message, find_main_window
-
-
-def _split_sql_statements(sql):
-    """Split a SQL script into individual statements, respecting string literals and dollar-quoted blocks."""
-    statements = []
-    current = []
-    i = 0
-    n = len(sql)
-    in_single_quote = False
-    in_dollar_quote = False
-    dollar_tag = ''
-    in_line_comment = False
-    in_block_comment = False
-    while i < n:
-        c = sql[i]
-        nxt = sql[i + 1] if i + 1 < n else ''
-
-        if in_line_comment:
-            if c == '\n':
-                in_line_comment = False
-                current.append(c)
-            i += 1
-            continue
-
-        if in_block_comment:
-            if c == '*' and nxt == '/':
-                in_block_comment = False
-                current.append('*/')
-                i += 2
-                continue
-            current.append(c)
-            i += 1
-            continue
-
-        if in_single_quote:
-            current.append(c)
-            if c == "'":
-                if nxt == "'":
-                    current.append("'")
-                    i += 2
-                    continue
-                in_single_quote = False
-            i += 1
-            continue
-
-        if in_dollar_quote:
-            # check for closing tag
-            if c == '$' and sql[i:i + len(dollar_tag)] == dollar_tag:
-                current.append(dollar_tag)
-                i += len(dollar_tag)
-                in_dollar_quote = False
-                dollar_tag = ''
+from .db_helper_sql_script import split_sql_statements
+
+
+class _BackupScriptReader:
+    """Reads a built-in backup script: statement lines, and COPY data blocks in large chunks."""
+
+    def __init__(self, stream, chunk_size, on_fill=None):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._on_fill = on_fill
+        self._buffer = b''
+
+    def _fill(self):
+        chunk = self._stream.read(self._chunk_size)
+        self._buffer += chunk
+        if chunk and self._on_fill:
+            self._on_fill()
+        return bool(chunk)
+
+    def readline(self):
+        while b'\n' not in self._buffer:
+            if not self._fill():
+                line, self._buffer = self._buffer, b''
+                return line
+        index = self._buffer.index(b'\n') + 1
+        line, self._buffer = self._buffer[:index], self._buffer[index:]
+        return line
+
+    def read_copy_data(self):
+        """Return the next whole lines of the current COPY block; b'' once its \\. line is consumed."""
+        while True:
+            if self._buffer.startswith(b'\\.\n'):
+                self._buffer = self._buffer[3:]
+                return b''
+            end = self._buffer.find(b'\n\\.\n')
+            if end >= 0:
+                data, self._buffer = self._buffer[:end + 1], self._buffer[end + 1:]
+                return data
+            cut = self._buffer.rfind(b'\n')
+            if cut >= 0 and len(self._buffer) >= self._chunk_size:
+                # Hand over complete rows; a partial last line may be the start of the terminator
+                data, self._buffer = self._buffer[:cut + 1], self._buffer[cut + 1:]
+                return data
+            if not self._fill():
+                raise ValueError("Backup file ends inside a COPY data block")
+
+
+class _CopyBlock:
+    """File-like object handed to copy_expert for one COPY ... FROM stdin block."""
+
+    def __init__(self, reader):
+        self._reader = reader
+
+    def read(self, size=-1):
+        return self._reader.read_copy_data()
+
+
+class _CountingWriter:
+    """Wraps the backup output to report the bytes COPY streams into it, every report_every bytes."""
+
+    def __init__(self, out, on_write, report_every):
+        self._out = out
+        self._on_write = on_write
+        self._report_every = report_every
+        self._unreported = 0
+
+    def write(self, data):
+        self._out.write(data)
+        self._unreported += len(data)
+        if self._unreported >= self._report_every:
+            self._on_write(self._unreported)
+            self._unreported = 0
+
+
+class _LineCountingWriter:
+    """Wraps an output to report the lines (rows) COPY streams into it, every report_every lines."""
+
+    def __init__(self, out, on_lines, report_every):
+        self._out = out
+        self._on_lines = on_lines
+        self._report_every = report_every
+        self._unreported = 0
+
+    def write(self, data):
+        self._out.write(data)
+        self._unreported += data.count(b'\n')
+        if self._unreported >= self._report_every:
+            self._on_lines(self._unreported)
+            self._unreported = 0
+
+    def flush_count(self):
+        if self._unreported:
+            self._on_lines(self._unreported)
+            self._unreported = 0
+
+
+class _CopyProgress:
+    """Adds up bytes streamed by one or more COPY workers for progress_callback."""
+
+    def __init__(self, callback, stage, total):
+        self._callback = callback
+        self._stage = stage
+        self._total = total
+        self._done = 0
+        self._lock = threading.Lock()
+        self.enabled = callback is not None
+
+    def add(self, count):
+        with self._lock:
+            self._done += count
+            done = min(self._done, self._total) if self._total else self._done
+        self._callback(self._stage, done, self._total)
+
+
+class _CsvSectionStream:
+    """File-like view of one table section of an export_to_csv() file, for COPY ... FROM STDIN (FORMAT csv).
+
+    Rows are pulled from the shared csv reader until the next "TABLE" row,
+    which is kept in next_table_row for the caller. Blank rows are skipped and
+    every row is padded or cut to the header width, then written back out as
+    CSV in chunks of about the size COPY asks for.
+    """
+
+    def __init__(self, rows, width, on_row=None):
+        self._rows = rows
+        self._width = width
+        self._on_row = on_row
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator='\n')
+        self.row_count = 0
+        self.next_table_row = None
+        self.finished = False
+
+    def read(self, size=-1):
+        while not self.finished and (size is None or size < 0 or self._buffer.tell() < size):
+            row = next(self._rows, None)
+            if row is None:
+                self.finished = True
+            elif not row:
                 continue
-            current.append(c)
-            i += 1
-            continue
-
-        # not in any string/comment
-        if c == '-' and nxt == '-':
-            in_line_comment = True
-            current.append('--')
-            i += 2
-            continue
-        if c == '/' and nxt == '*':
-            in_block_comment = True
-            current.append('/*')
-            i += 2
-            continue
-        if c == "'":
-            in_single_quote = True
-            current.append(c)
-            i += 1
-            continue
-        if c == '$':
-            # possible dollar quote tag, e.g. $$ or $tag$
-            j = i + 1
-            while j < n and (sql[j].isalnum() or sql[j] == '_'):
-                j += 1
-            if j < n and sql[j] == '$':
-                dollar_tag = sql[i:j + 1]
-                in_dollar_quote = True
-                current.append(dollar_tag)
-                i = j + 1
-                continue
-            current.append(c)
-            i += 1
-            continue
-        if c == ';':
-            stmt = ''.join(current).strip()
-            if stmt:
-                statements.append(stmt)
-            current = []
-            i += 1
-            continue
-        current.append(c)
-        i += 1
-
-    remaining = ''.join(current).strip()
-    if remaining:
-        statements.append(remaining)
-    return statements
+            elif row[0] == "TABLE":
+                self.next_table_row = row
+                self.finished = True
+            else:
+                self._writer.writerow((row + [''] * self._width)[:self._width])
+                self.row_count += 1
+                if self._on_row is not None:
+                    self._on_row(self.row_count)
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data.encode('utf-8')
 
 
 class DatabaseBackupHelper:
@@ -117,6 +175,26 @@ class DatabaseBackupHelper:
     LARGE_DB_THRESHOLD = 50 * 1024 * 1024  # 50 MB
     BATCH_SIZE = 1000  # rows per batch on restore (large tables)
 
+    # Built-in COPY engine: first line of its scripts, gzip level and I/O chunk size
+    COPY_BACKUP_HEADER = "-- Rak Arsip Backup (COPY)"
+    COMPRESSION_LEVEL = 6
+    COPY_CHUNK_SIZE = 1024 * 1024
+    ARCHIVE_EXTENSION = ".sql.gz"
+    # Upper bound for database.backup.parallel_workers
+    MAX_PARALLEL_WORKERS = 8
+    # Incremental hourly backups: one full base per day plus deltas read from
+    # backup_change_log (migration 008), kept in <base>.deltas/ next to the base
+    BACKUP_EXCLUDED_TABLES = ('schema_migrations', 'backup_change_log')
+    UNLOGGED_TABLES = ('file_status_counts',)
+    DELTA_DIR_SUFFIX = ".deltas"
+    CHECKPOINT_FILENAME = "checkpoint.json"
+    CHANGE_LOG_RETENTION_DAYS = 2
+    DELTA_DELETE_BATCH = 1000
+    # Change fingerprint of the data held by the last hourly/manual backup
+    BACKUP_STATE_FILENAME = "last_backup.json"
+    # CSV import: staged rows resolved per INSERT (failing chunks are split to find the bad rows)
+    CSV_INSERT_CHUNK = 50000
+
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.backup_dir = os.path.join(self.db_manager.db_dir, "db_backups")
@@ -151,7 +229,8 @@ class DatabaseBackupHelper:
         """
         dsn, env = self._get_pg_env()
 
-        if use_pg_dump and self.has_pg_dump():
+        # pg_dump writes plain text; compressed files always come from the COPY engine
+        if use_pg_dump and self.has_pg_dump() and not self._is_compressed_path(backup_path):
             if progress_callback:
                 progress_callback('pg_dump', 0, None)
             self._run_pg_dump(backup_path, dsn, env, progress_callback)
@@ -215,75 +294,230 @@ class DatabaseBackupHelper:
                     return matches[0]
         return None
 
+    def _is_compressed_path(self, path):
+        return path.lower().endswith(".gz")
+
+    def _open_backup_output(self, path, compressed):
+        if compressed:
+            return gzip.open(path, 'wb', compresslevel=self.COMPRESSION_LEVEL)
+        return open(path, 'wb')
+
+    def _get_backup_columns(self, cur, table):
+        # Generated columns are computed on restore and cannot be loaded by COPY
+        cur.execute("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = %s AND is_generated = 'NEVER'
+            ORDER BY ordinal_position
+        """, (table,))
+        return [row[0] for row in cur.fetchall()]
+
     def _run_backup(self, backup_path, dsn, progress_callback=None):
-        """Pure-Python backup using COPY TO STREAM (chunked) so we don't OOM and don't hit a single statement timeout."""
+        """Built-in backup: one COPY ... TO STDOUT per table, streamed into the file.
+
+        The file is a SQL script holding the data as COPY ... FROM stdin blocks
+        (the layout pg_dump uses for data), gzip-compressed when backup_path
+        ends in .gz. Rows never pass through Python one by one, so memory stays
+        flat whatever the table size. All tables are read in one REPEATABLE READ
+        snapshot; sequence positions are saved with it. With more than one
+        parallel worker configured, tables are copied concurrently on separate
+        connections that share the snapshot (pg_export_snapshot). The file is
+        written next to backup_path and renamed over it only when complete.
+
+        Returns the txid_current_snapshot() the backup was read in.
+        """
         import psycopg2
-        import decimal as _decimal
-
-        def pg_literal(val):
-            if val is None:
-                return 'NULL'
-            if isinstance(val, bool):
-                return 'TRUE' if val else 'FALSE'
-            if isinstance(val, (int, float, _decimal.Decimal)):
-                return str(val)
-            s = str(val).replace("'", "''")
-            return f"'{s}'"
+        import psycopg2.extensions
 
         conn = psycopg2.connect(**dsn)
+        part_path = backup_path + ".part"
+        parts_dir = backup_path + ".parts"
+        compressed = self._is_compressed_path(backup_path)
         try:
-            # Override statement_timeout for this backup session (0 = no limit)
+            conn.set_client_encoding('UTF8')
+            conn.set_session(isolation_level=psycopg2.extensions.ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
             cur = conn.cursor()
-            try:
-                cur.execute("SET statement_timeout = 0")
-                cur.execute("SET lock_timeout = 0")
-            except Exception:
-                pass
-            conn.commit()
+            # Override statement_timeout for this backup session (0 = no limit)
+            cur.execute("SET statement_timeout = 0")
+            cur.execute("SET lock_timeout = 0")
+            # First query of the transaction: this is the snapshot every table is read in
+            cur.execute("SELECT txid_current_snapshot()::text")
+            snapshot = cur.fetchone()[0]
 
             cur.execute("""
-                SELECT tablename FROM pg_tables
-                WHERE schemaname = 'public' AND tablename != 'schema_migrations'
-                ORDER BY tablename
-            """)
-            tables = [row[0] for row in cur.fetchall()]
-            # Order tables by FK dependency so parents are inserted before children.
-            tables = self._topological_sort_tables(conn, tables)
-
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                f.write(f"-- Rak Arsip Backup\n-- {datetime.now().isoformat()}\n\n")
-                f.write("SET session_replication_role = 'replica';\n")
-                f.write("SET statement_timeout = 0;\n")
+                SELECT t.tablename, pg_relation_size(quote_ident(t.tablename)::regclass)
+                FROM pg_tables t
+                WHERE t.schemaname = 'public' AND t.tablename NOT IN %s
+                ORDER BY t.tablename
+            """, (self.BACKUP_EXCLUDED_TABLES,))
+            table_sizes = dict(cur.fetchall())
+            # Order tables by FK dependency so parents are loaded before children.
+            tables = self._topological_sort_tables(conn, list(table_sizes))
+            columns = {table: self._get_backup_columns(cur, table) for table in tables}
+            tables = [table for table in tables if columns[table]]
+            progress = _CopyProgress(progress_callback, 'copy', sum(table_sizes.values()) or None)
+            workers = min(self.get_parallel_workers(), len(tables))
+
+            with self._open_backup_output(part_path, compressed) as out:
+                header = [
+                    self.COPY_BACKUP_HEADER,
+                    f"-- {datetime.now().isoformat()}",
+                    "",
+                    "SET client_encoding = 'UTF8';",
+                    "SET session_replication_role = 'replica';",
+                    "SET statement_timeout = 0;",
+                ]
                 if tables:
                     all_tables = ', '.join(f'"{t}"' for t in tables)
-                    f.write(f'TRUNCATE {all_tables} RESTART IDENTITY;\n\n')
-
-                for table in tables:
-                    cur.execute("""
-                        SELECT column_name FROM information_schema.columns
-                        WHERE table_schema = 'public' AND table_name = %s
-                        ORDER BY ordinal_position
-                    """, (table,))
-                    columns = [row[0] for row in cur.fetchall()]
-                    cols_str = ', '.join(f'"{c}"' for c in columns)
-                    cur.execute(f'SELECT {cols_str} FROM "{table}"')
-                    # Use server-side cursor with batched fetching to keep memory bounded
-                    f.write(f'-- {table}\n')
-                    rows = cur.fetchmany(1000)
-                    had_rows = bool(rows)
-                    while rows:
-                        for row in rows:
-                            vals = ', '.join(pg_literal(v) for v in row)
-                            f.write(f'INSERT INTO "{table}" ({cols_str}) VALUES ({vals});\n')
-                        if progress_callback:
-                            progress_callback('copy', os.path.getsize(backup_path), None)
-                        rows = cur.fetchmany(1000)
-                    if had_rows:
-                        f.write('\n')
-
-                f.write("SET session_replication_role = 'origin';\n")
+                    header.append(f'TRUNCATE {all_tables} RESTART IDENTITY;')
+                out.write(("\n".join(header) + "\n\n").encode('utf-8'))
+                if workers <= 1:
+                    for table in tables:
+                        self._write_table_copy(cur, table, columns[table], out, progress)
+                    self._write_sequences(cur, out)
+
+            if workers > 1:
+                os.makedirs(parts_dir, exist_ok=True)
+                part_files = self._copy_tables_parallel(
+                    conn, dsn, tables, columns, table_sizes, parts_dir, compressed, workers, progress
+                )
+                # gzip members (and plain text) concatenate into one valid stream
+                with open(part_path, 'ab') as out:
+                    for path in part_files:
+                        with open(path, 'rb') as part:
+                            shutil.copyfileobj(part, out, self.COPY_CHUNK_SIZE)
+                with self._open_backup_output(part_path + ".tail", compressed) as out:
+                    self._write_sequences(cur, out)
+                with open(part_path, 'ab') as out, open(part_path + ".tail", 'rb') as tail:
+                    shutil.copyfileobj(tail, out)
+            conn.rollback()
+            os.replace(part_path, backup_path)
+            return snapshot
         finally:
             conn.close()
+            shutil.rmtree(parts_dir, ignore_errors=True)
+            for path in (part_path, part_path + ".tail"):
+                if os.path.exists(path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    def _write_table_copy(self, cur, table, columns, out, progress):
+        cols_str = ', '.join(f'"{c}"' for c in columns)
+        out.write(f'-- {table}\nCOPY "{table}" ({cols_str}) FROM stdin;\n'.encode('utf-8'))
+        writer = _CountingWriter(out, progress.add, self.COPY_CHUNK_SIZE * 8) if progress.enabled else out
+        cur.copy_expert(f'COPY "{table}" ({cols_str}) TO STDOUT', writer, size=self.COPY_CHUNK_SIZE)
+        out.write(b'\\.\n\n')
+
+    def _write_sequences(self, cur, out):
+        # Restoring explicit ids does not advance the sequences; save where they were
+        cur.execute("""
+            SELECT s.schemaname, s.sequencename, s.last_value FROM pg_sequences s
+            WHERE s.schemaname = 'public'
+              AND NOT EXISTS (
+                  -- Sequences of tables left out of backups keep their own position
+                  SELECT 1 FROM pg_depend d JOIN pg_class t ON t.oid = d.refobjid
+                  WHERE d.objid = (quote_ident(s.schemaname) || '.' || quote_ident(s.sequencename))::regclass
+                    AND d.deptype IN ('a', 'i') AND t.relname IN %s
+              )
+            ORDER BY s.sequencename
+        """, (self.BACKUP_EXCLUDED_TABLES,))
+        for schema, sequence, last_value in cur.fetchall():
+            qualified = f'"{schema}"."{sequence}"'.replace("'", "''")
+            if last_value is None:
+                out.write(f"SELECT pg_catalog.setval('{qualified}', 1, false);\n".encode('utf-8'))
+            else:
+                out.write(f"SELECT pg_catalog.setval('{qualified}', {last_value}, true);\n".encode('utf-8'))
+        out.write(b"\nSET session_replication_role = 'origin';\n")
+
+    def _copy_tables_parallel(self, conn, dsn, tables, columns, table_sizes, parts_dir, compressed, workers,
+                              progress):
+        """COPY tables into one part file each, on workers connections sharing conn's snapshot.
+
+        Returns the part files in the order of tables.
+        """
+        import psycopg2
+        import psycopg2.extensions
+
+        cur = conn.cursor()
+        cur.execute("SELECT pg_export_snapshot()")
+        snapshot_id = cur.fetchone()[0]
+        connections = queue.Queue()
+        opened = []
+        try:
+            for _ in range(workers):
+                worker_conn = psycopg2.connect(**dsn)
+                opened.append(worker_conn)
+                worker_conn.set_client_encoding('UTF8')
+                worker_conn.set_session(
+                    isolation_level=psycopg2.extensions.ISOLATION_LEVEL_REPEATABLE_READ, readonly=True
+                )
+                worker_cur = worker_conn.cursor()
+                # Must be the first statement of the worker's transaction
+                worker_cur.execute("SET TRANSACTION SNAPSHOT %s", (snapshot_id,))
+                worker_cur.execute("SET statement_timeout = 0")
+                connections.put(worker_conn)
+
+            def copy_table(index):
+                table = tables[index]
+                path = os.path.join(parts_dir, f"{index:04d}_{table}.part")
+                worker_conn = connections.get()
+                try:
+                    with self._open_backup_output(path, compressed) as out:
+                        self._write_table_copy(worker_conn.cursor(), table, columns[table], out, progress)
+                finally:
+                    connections.put(worker_conn)
+                return path
+
+            # Largest tables first, so a big table does not start last and run alone
+            order = sorted(range(len(tables)), key=lambda i: table_sizes.get(tables[i], 0), reverse=True)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {index: executor.submit(copy_table, index) for index in order}
+            return [futures[index].result() for index in range(len(tables))]
+        finally:
+            for worker_conn in opened:
+                try:
+                    worker_conn.close()
+                except Exception:
+                    pass
+
+    def get_parallel_workers(self):
+        """Connections the built-in engine uses to back up / restore tables concurrently (1 = sequential)."""
+        workers = self.db_manager.config_manager.get("database.backup.parallel_workers")
+        if isinstance(workers, bool) or not isinstance(workers, int) or not 1 <= workers <= self.MAX_PARALLEL_WORKERS:
+            raise ValueError(
+                f"database.backup.parallel_workers must be an integer from 1 to {self.MAX_PARALLEL_WORKERS}: {workers!r}"
+            )
+        return workers
+
+    def set_parallel_workers(self, workers):
+        """Store the number of parallel backup/restore workers in db_config.json."""
+        workers = max(1, min(self.MAX_PARALLEL_WORKERS, int(workers)))
+        self.db_manager.config_manager.set("database.backup.parallel_workers", workers)
+
+    def _get_fk_edges(self, conn, table_set):
+        """Return (parent, child) pairs for the foreign keys between tables in table_set."""
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT
+                tc.table_name   AS child_table,
+                ccu.table_name  AS parent_table
+            FROM information_schema.table_constraints tc
+            JOIN information_schema.referential_constraints rc
+                ON tc.constraint_name = rc.constraint_name
+                AND tc.table_schema = rc.constraint_schema
+            JOIN information_schema.constraint_column_usage ccu
+                ON rc.unique_constraint_name = ccu.constraint_name
+                AND rc.unique_constraint_schema = ccu.constraint_schema
+            WHERE tc.constraint_type = 'FOREIGN KEY'
+              AND tc.table_schema = 'public'
+        """)
+        edges = []
+        for child, parent in cur.fetchall():
+            if child in table_set and parent in table_set and child != parent:
+                edges.append((parent, child))  # parent must come before child
+        cur.close()
+        return edges
 
     def _topological_sort_tables(self, conn, tables):
         """Order tables so that referenced (parent) tables come before referencing (child) tables.
@@ -295,26 +529,7 @@ class DatabaseBackupHelper:
             return tables
         table_set = set(tables)
         try:
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT
-                    tc.table_name   AS child_table,
-                    ccu.table_name  AS parent_table
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.referential_constraints rc
-                    ON tc.constraint_name = rc.constraint_name
-                    AND tc.table_schema = rc.constraint_schema
-                JOIN information_schema.constraint_column_usage ccu
-                    ON rc.unique_constraint_name = ccu.constraint_name
-                    AND rc.unique_constraint_schema = ccu.constraint_schema
-                WHERE tc.constraint_type = 'FOREIGN KEY'
-                  AND tc.table_schema = 'public'
-            """)
-            edges = []
-            for child, parent in cur.fetchall():
-                if child in table_set and parent in table_set and child != parent:
-                    edges.append((parent, child))  # parent must come before child
-            cur.close()
+            edges = self._get_fk_edges(conn, table_set)
         except Exception as e:
             print(f"[BACKUP] FK ordering fallback (could not read constraints): {e}")
             return sorted(tables)
@@ -343,6 +558,343 @@ class DatabaseBackupHelper:
         ordered.extend(sorted(leftover))
         return ordered
 
+    def _topological_waves(self, conn, tables):
+        """Group tables into waves: each table's FK parents are all in earlier waves.
+
+        Tables within a wave do not reference each other, so they can be loaded
+        concurrently. Tables caught in FK cycles form a last wave of their own.
+        """
+        if not tables:
+            return []
+        try:
+            edges = self._get_fk_edges(conn, set(tables))
+        except Exception as e:
+            print(f"[BACKUP] FK ordering fallback (could not read constraints): {e}")
+            return [[table] for table in sorted(tables)]
+        parents = {t: set() for t in tables}
+        for parent, child in edges:
+            parents[child].add(parent)
+        waves = []
+        placed = set()
+        remaining = set(tables)
+        while remaining:
+            wave = sorted(t for t in remaining if parents[t] <= placed)
+            if not wave:
+                waves.append(sorted(remaining))
+                break
+            waves.append(wave)
+            placed.update(wave)
+            remaining.difference_update(wave)
+        return waves
+
+    # ------------------------------------------------------------------ incremental (base + deltas)
+
+    def is_incremental_enabled(self):
+        """Whether hourly backups write deltas after the day's full base (database.backup.incremental)."""
+        return bool(self.db_manager.config_manager.get("database.backup.incremental"))
+
+    def get_delta_dir(self, base_path):
+        """Folder holding the deltas (and the checkpoint) that belong to base_path."""
+        root = base_path
+        for ext in (self.ARCHIVE_EXTENSION, ".sql"):
+            if root.endswith(ext):
+                root = root[:-len(ext)]
+                break
+        return root + self.DELTA_DIR_SUFFIX
+
+    def list_delta_files(self, base_path):
+        """Deltas of base_path in the order they must be replayed."""
+        delta_dir = self.get_delta_dir(base_path)
+        if not os.path.isdir(delta_dir):
+            return []
+        names = sorted(
+            fname for fname in os.listdir(delta_dir)
+            if fname.startswith("delta_") and fname.endswith(self.ARCHIVE_EXTENSION)
+        )
+        return [os.path.join(delta_dir, fname) for fname in names]
+
+    def _load_checkpoint(self, base_path):
+        path = os.path.join(self.get_delta_dir(base_path), self.CHECKPOINT_FILENAME)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return checkpoint if checkpoint.get("snapshot") else None
+
+    def _save_checkpoint(self, base_path, snapshot, sequence):
+        delta_dir = self.get_delta_dir(base_path)
+        os.makedirs(delta_dir, exist_ok=True)
+        path = os.path.join(delta_dir, self.CHECKPOINT_FILENAME)
+        with open(path + ".part", 'w', encoding='utf-8') as f:
+            json.dump({"snapshot": snapshot, "sequence": sequence, "saved_at": datetime.now().isoformat()}, f)
+        os.replace(path + ".part", path)
+
+    def _reset_incremental_chains(self):
+        """Make the next hourly backup a full one; used after data was loaded without change logging."""
+        if not os.path.isdir(self.backup_dir):
+            return
+        try:
+            os.remove(os.path.join(self.backup_dir, self.BACKUP_STATE_FILENAME))
+        except OSError:
+            pass
+        for fname in os.listdir(self.backup_dir):
+            if fname.endswith(self.DELTA_DIR_SUFFIX):
+                try:
+                    os.remove(os.path.join(self.backup_dir, fname, self.CHECKPOINT_FILENAME))
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------ change fingerprint
+
+    def get_change_fingerprint(self, tables=None):
+        """Cheap token that changes whenever rows of tables (default: all) are written.
+
+        Built from the insert/update/delete counters of pg_stat_user_tables,
+        which PostgreSQL keeps anyway, so it costs one catalog read however big
+        the tables are. Counters move only when a transaction ends, and also
+        for rolled back work, so a different token may mean "maybe changed"
+        but an equal one means nothing was committed in between. Truncates are
+        seen through the rows they add to backup_change_log; only its inserts
+        count, because every base backup trims it (_trim_change_log) and that
+        DELETE would otherwise make the next hourly run look changed. Returns
+        None when the server does not track counts or cannot be reached.
+        """
+        import psycopg2
+        try:
+            self.db_manager.connect(write=False)
+        except psycopg2.Error as e:
+            print(f"[BACKUP] Could not read change fingerprint: {e}")
+            return None
+        try:
+            cursor = self.db_manager.connection.cursor()
+            cursor.execute("""
+                SELECT current_setting('track_counts')::boolean, count(*),
+                       COALESCE(sum(n_tup_ins), 0),
+                       COALESCE(sum(n_tup_upd) FILTER (WHERE relname <> 'backup_change_log'), 0),
+                       COALESCE(sum(n_tup_del) FILTER (WHERE relname <> 'backup_change_log'), 0)
+                FROM pg_stat_user_tables
+                WHERE schemaname = 'public' AND (%s::text[] IS NULL OR relname = ANY(%s::text[]))
+            """, (list(tables) if tables else None, list(tables) if tables else None))
+            tracked, table_count, inserted, updated, deleted = cursor.fetchone()
+        except psycopg2.Error as e:
+            print(f"[BACKUP] Could not read change fingerprint: {e}")
+            return None
+        finally:
+            self.db_manager.close()
+        if not tracked:
+            return None
+        return f"{table_count}:{inserted}:{updated}:{deleted}"
+
+    def _load_backup_state(self):
+        try:
+            with open(os.path.join(self.backup_dir, self.BACKUP_STATE_FILENAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_backup_state(self, fingerprint, backup_path):
+        path = os.path.join(self.backup_dir, self.BACKUP_STATE_FILENAME)
+        state = {"fingerprint": fingerprint, "path": backup_path, "saved_at": datetime.now().isoformat()}
+        with open(path + ".part", 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(path + ".part", path)
+
+    def is_unchanged_since_last_backup(self, fingerprint):
+        """True when fingerprint matches the one recorded with the last backup, which still exists."""
+        state = self._load_backup_state()
+        return (
+            fingerprint is not None
+            and state.get("fingerprint") == fingerprint
+            and os.path.exists(state.get("path") or "")
+        )
+
+    def export_incremental(self, base_path, progress_callback=None):
+        """Hourly backup: a full base at base_path, then only what changed since the previous run.
+
+        Once the base exists, each call writes the rows inserted or updated
+        since the previous backup, and the ids deleted since then, to the next
+        <base>.deltas/delta_NNNN_HHMMSS.sql.gz. A full base is written instead
+        when there is none yet, when the change log is missing or a table has
+        no logging trigger, or when a table was truncated. Returns the file
+        written, or None when nothing changed.
+        """
+        dsn, _ = self._get_pg_env()
+        checkpoint = self._load_checkpoint(base_path) if os.path.exists(base_path) else None
+        if checkpoint is not None:
+            sequence = int(checkpoint.get("sequence", 0)) + 1
+            delta_path = os.path.join(
+                self.get_delta_dir(base_path),
+                f"delta_{sequence:04d}_{datetime.now().strftime('%H%M%S')}{self.ARCHIVE_EXTENSION}"
+            )
+            result = self._run_delta_backup(delta_path, dsn, checkpoint["snapshot"], progress_callback)
+            if result is not None:
+                written, snapshot = result
+                self._save_checkpoint(base_path, snapshot, sequence if written else sequence - 1)
+                return delta_path if written else None
+            print("[BACKUP] Changes cannot be written as a delta; writing a full backup")
+        self.write_base_backup(base_path, dsn, progress_callback)
+        return base_path
+
+    def write_base_backup(self, base_path, dsn=None, progress_callback=None):
+        """Full COPY engine backup to base_path that starts a new delta chain."""
+        if dsn is None:
+            dsn, _ = self._get_pg_env()
+        delta_dir = self.get_delta_dir(base_path)
+        stale_dir = delta_dir + ".old"
+        # The old deltas no longer apply on top of the new base; keep them
+        # only until it is in place, in case the backup fails
+        shutil.rmtree(stale_dir, ignore_errors=True)
+        if os.path.isdir(delta_dir):
+            os.replace(delta_dir, stale_dir)
+        try:
+            snapshot = self._run_backup(base_path, dsn, progress_callback)
+        except Exception:
+            if os.path.isdir(stale_dir) and not os.path.exists(delta_dir):
+                os.replace(stale_dir, delta_dir)
+            raise
+        shutil.rmtree(stale_dir, ignore_errors=True)
+        self._save_checkpoint(base_path, snapshot, 0)
+        self._trim_change_log(dsn)
+
+    def _trim_change_log(self, dsn):
+        import psycopg2
+        try:
+            conn = psycopg2.connect(**dsn)
+            try:
+                cur = conn.cursor()
+                cur.execute("SELECT to_regclass('backup_change_log')")
+                if cur.fetchone()[0] is not None:
+                    cur.execute(
+                        "DELETE FROM backup_change_log WHERE changed_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 day'",
+                        (self.CHANGE_LOG_RETENTION_DAYS,)
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[BACKUP] Could not trim backup_change_log: {e}")
+
+    def _run_delta_backup(self, delta_path, dsn, since_snapshot, progress_callback=None):
+        """Write the changes made after since_snapshot as a COPY engine script.
+
+        Changed rows are read by the ids in backup_change_log whose transaction
+        since_snapshot could not see, in one REPEATABLE READ snapshot. Each
+        table's rows are loaded into a temporary table and upserted by id
+        (parents first); ids that no longer exist are deleted (children first).
+        Returns (written, snapshot), written False when nothing changed, or
+        None when the change log cannot describe the changes.
+        """
+        import psycopg2
+        import psycopg2.extensions
+
+        conn = psycopg2.connect(**dsn)
+        part_path = delta_path + ".part"
+        try:
+            conn.set_client_encoding('UTF8')
+            conn.set_session(isolation_level=psycopg2.extensions.ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+            cur = conn.cursor()
+            cur.execute("SET statement_timeout = 0")
+            cur.execute("SET lock_timeout = 0")
+            cur.execute("SELECT txid_current_snapshot()::text")
+            snapshot = cur.fetchone()[0]
+
+            cur.execute("SELECT to_regclass('backup_change_log')")
+            if cur.fetchone()[0] is None:
+                return None
+            cur.execute("""
+                SELECT t.tablename, EXISTS (
+                    SELECT 1 FROM pg_trigger tg
+                    WHERE tg.tgrelid = quote_ident(t.tablename)::regclass
+                      AND tg.tgname = 'trg_' || t.tablename || '_backup_log_ins'
+                )
+                FROM pg_tables t
+                WHERE t.schemaname = 'public' AND t.tablename NOT IN %s
+            """, (self.BACKUP_EXCLUDED_TABLES,))
+            logged = dict(cur.fetchall())
+            if any(not is_logged and table not in self.UNLOGGED_TABLES for table, is_logged in logged.items()):
+                return None
+
+            # Entries of transactions that were not visible to the previous backup
+            changed_filter = cur.mogrify(
+                "txid >= txid_snapshot_xmin(%s::txid_snapshot) AND NOT txid_visible_in_snapshot(txid, %s::txid_snapshot)",
+                (since_snapshot, since_snapshot)
+            ).decode('utf-8')
+            cur.execute(
+                f"SELECT table_name, bool_or(op = 'T') FROM backup_change_log WHERE {changed_filter} GROUP BY table_name"
+            )
+            changes = dict(cur.fetchall())
+            if any(changes.values()):
+                return None
+            tables = self._topological_sort_tables(conn, [t for t in changes if t in logged])
+            if not tables:
+                conn.rollback()
+                return False, snapshot
+
+            progress = _CopyProgress(progress_callback, 'copy', None)
+            deleted = []
+            with self._open_backup_output(part_path, self._is_compressed_path(delta_path)) as out:
+                header = [
+                    self.COPY_BACKUP_HEADER,
+                    f"-- {datetime.now().isoformat()}",
+                    f"-- Incremental: changes since snapshot {since_snapshot}",
+                    "",
+                    "SET client_encoding = 'UTF8';",
+                    "SET session_replication_role = 'replica';",
+                    "SET statement_timeout = 0;",
+                ]
+                out.write(("\n".join(header) + "\n\n").encode('utf-8'))
+                for table in tables:
+                    changed_ids = cur.mogrify(
+                        "SELECT row_id FROM backup_change_log WHERE table_name = %s AND ", (table,)
+                    ).decode('utf-8') + changed_filter
+                    columns = self._get_backup_columns(cur, table)
+                    if columns:
+                        self._write_table_upsert(cur, table, columns, changed_ids, out, progress)
+                    cur.execute(
+                        f'SELECT DISTINCT c.row_id FROM ({changed_ids}) c '
+                        f'WHERE NOT EXISTS (SELECT 1 FROM "{table}" t WHERE t.id = c.row_id) ORDER BY 1'
+                    )
+                    deleted.append((table, [row[0] for row in cur.fetchall()]))
+                # Children first, so no row is removed while others still reference it
+                for table, ids in reversed(deleted):
+                    for start in range(0, len(ids), self.DELTA_DELETE_BATCH):
+                        id_list = ','.join(str(i) for i in ids[start:start + self.DELTA_DELETE_BATCH])
+                        out.write(f"DELETE FROM \"{table}\" WHERE id = ANY('{{{id_list}}}'::bigint[]);\n".encode('utf-8'))
+                out.write(b"\n")
+                self._write_sequences(cur, out)
+            conn.rollback()
+            os.replace(part_path, delta_path)
+            return True, snapshot
+        finally:
+            conn.close()
+            if os.path.exists(part_path):
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+
+    def _write_table_upsert(self, cur, table, columns, changed_ids, out, progress):
+        cols_str = ', '.join(f'"{c}"' for c in columns)
+        staging = f"delta__{table}"
+        out.write(
+            f'-- {table}\n'
+            f'CREATE TEMP TABLE "{staging}" AS SELECT {cols_str} FROM "{table}" WITH NO DATA;\n'
+            f'COPY "{staging}" ({cols_str}) FROM stdin;\n'.encode('utf-8')
+        )
+        writer = _CountingWriter(out, progress.add, self.COPY_CHUNK_SIZE * 8) if progress.enabled else out
+        cur.copy_expert(
+            f'COPY (SELECT {cols_str} FROM "{table}" WHERE id IN ({changed_ids})) TO STDOUT',
+            writer, size=self.COPY_CHUNK_SIZE
+        )
+        updates = ', '.join(f'"{c}" = EXCLUDED."{c}"' for c in columns if c != 'id')
+        action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        out.write(
+            f'\\.\n'
+            f'INSERT INTO "{table}" ({cols_str}) SELECT {cols_str} FROM "{staging}" ON CONFLICT (id) {action};\n'
+            f'DROP TABLE "{staging}";\n\n'.encode('utf-8')
+        )
+
     # ------------------------------------------------------------------ import (restore)
 
     def import_database(self, backup_path, progress_callback=None, resolution_mode='replace'):
@@ -357,7 +909,15 @@ class DatabaseBackupHelper:
 
         format_type = self._detect_backup_format(backup_path)
 
-        if format_type == 'plain' and self.has_psql():
+        if format_type == 'copy':
+            # Written by the built-in COPY engine: streamed back the same way
+            if progress_callback:
+                progress_callback('restore', 0, None)
+            self._run_copy_restore(backup_path, dsn, progress_callback)
+            # A daily base comes back together with the hourly deltas taken after it
+            for delta_path in self.list_delta_files(backup_path):
+                self._run_copy_restore(delta_path, dsn, progress_callback, allow_parallel=False)
+        elif format_type == 'plain' and self.has_psql():
             if progress_callback:
                 progress_callback('psql', 0, None)
             self._run_psql_restore(backup_path, dsn, env, progress_callback)
@@ -371,6 +931,12 @@ class DatabaseBackupHelper:
                 progress_callback('restore', 0, None)
             self._run_restore(backup_path, dsn, progress_callback)
 
+        # Restores load files with triggers disabled; rebuild date_value and the counters
+        self.db_manager.refresh_file_totals()
+        self.db_manager.invalidate_lookups()
+        # Nothing of the restore reached the change log, so deltas cannot follow it
+        self._reset_incremental_chains()
+
         if progress_callback:
             progress_callback('done', 1, 1)
 
@@ -383,6 +949,15 @@ class DatabaseBackupHelper:
         # pg_dump custom format begins with "PGDMP"
         if head.startswith(b'PGDMP'):
             return 'custom'
+        # gzip magic: only the built-in COPY engine writes compressed scripts
+        if head.startswith(b'\x1f\x8b'):
+            return 'copy'
+        try:
+            with open(backup_path, 'rb') as f:
+                if f.readline().startswith(self.COPY_BACKUP_HEADER.encode('utf-8')):
+                    return 'copy'
+        except OSError:
+            pass
         # pg_dump directory format: a "toc" file
         if os.path.isdir(backup_path):
             return 'directory'
@@ -474,7 +1049,7 @@ class DatabaseBackupHelper:
             with open(backup_path, 'r', encoding='utf-8') as f:
                 content = f.read()
 
-            statements = _split_sql_statements(content)
+            statements = split_sql_statements(content)
             total = len(statements) or 1
             batch_commit = 50
             processed = 0
@@ -534,6 +1109,220 @@ class DatabaseBackupHelper:
             except Exception:
                 pass
 
+    def _run_copy_restore(self, backup_path, dsn, progress_callback=None, allow_parallel=True):
+        """Restore a script written by the built-in COPY engine.
+
+        The file is read as a stream (decompressed on the fly) and each COPY
+        block is fed to COPY ... FROM STDIN in large chunks, so memory stays
+        flat. The whole restore is one transaction: it either replaces the data
+        completely or leaves the database as it was. Triggers are switched off
+        with session_replication_role when the role may set it, otherwise user
+        triggers are disabled per table and the FK order of the file keeps
+        foreign keys satisfied. With more than one parallel worker configured
+        the restore runs through _run_parallel_copy_restore instead, except for
+        deltas (allow_parallel=False), whose statements must run in file order.
+        """
+        workers = self.get_parallel_workers()
+        if workers > 1 and allow_parallel:
+            return self._run_parallel_copy_restore(backup_path, dsn, workers, progress_callback)
+
+        import psycopg2
+        conn = psycopg2.connect(**dsn)
+        total = os.path.getsize(backup_path) or None
+        try:
+            cur = self._prepare_restore_session(conn)
+            target_tables = self._get_restore_target_tables(cur)
+            disabled_tables = []
+            if not self._set_replication_role(cur, local=True):
+                for t in target_tables:
+                    cur.execute(f'ALTER TABLE "{t}" DISABLE TRIGGER USER')
+                disabled_tables = target_tables
+
+            with open(backup_path, 'rb') as raw:
+                on_fill = None
+                if progress_callback:
+                    on_fill = lambda: progress_callback('restore', raw.tell(), total)
+                reader = _BackupScriptReader(self._open_backup_stream(raw), self.COPY_CHUNK_SIZE, on_fill)
+                while True:
+                    stmt = self._next_restore_statement(reader)
+                    if stmt is None:
+                        break
+                    if self._is_copy_statement(stmt):
+                        cur.copy_expert(stmt[:-1], _CopyBlock(reader), size=self.COPY_CHUNK_SIZE)
+                    else:
+                        cur.execute(stmt)
+
+            for t in disabled_tables:
+                cur.execute(f'ALTER TABLE "{t}" ENABLE TRIGGER USER')
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _run_parallel_copy_restore(self, backup_path, dsn, workers, progress_callback=None):
+        """Restore a COPY engine script with tables loaded concurrently, in FK waves.
+
+        The file is first split into one temporary file per table. The leading
+        statements (TRUNCATE) run and commit, then each wave of tables that do
+        not reference each other is loaded by up to workers connections, and the
+        sequence positions are set last. Unlike the sequential restore this is
+        not a single transaction: a failure leaves the tables loaded so far.
+        """
+        import psycopg2
+        total = os.path.getsize(backup_path) or None
+        parts_dir = tempfile.mkdtemp(prefix="rak_restore_")
+        leading, trailing, copies = [], [], {}
+        conn = None
+        opened = []
+        disabled_tables = []
+        try:
+            with open(backup_path, 'rb') as raw:
+                on_fill = None
+                if progress_callback:
+                    on_fill = lambda: progress_callback('analyze', raw.tell(), total)
+                reader = _BackupScriptReader(self._open_backup_stream(raw), self.COPY_CHUNK_SIZE, on_fill)
+                while True:
+                    stmt = self._next_restore_statement(reader)
+                    if stmt is None:
+                        break
+                    if not self._is_copy_statement(stmt):
+                        (trailing if copies else leading).append(stmt)
+                        continue
+                    table = stmt.split('"')[1]
+                    path = os.path.join(parts_dir, f"{len(copies):04d}_{table}.copy")
+                    with open(path, 'wb') as part:
+                        data = reader.read_copy_data()
+                        while data:
+                            part.write(data)
+                            data = reader.read_copy_data()
+                    copies[table] = (stmt[:-1], path)
+
+            conn = psycopg2.connect(**dsn)
+            cur = self._prepare_restore_session(conn)
+            use_replication_role = self._set_replication_role(cur, local=False)
+            if not use_replication_role:
+                # Committed so the worker sessions load without user triggers too
+                disabled_tables = self._get_restore_target_tables(cur)
+                for t in disabled_tables:
+                    cur.execute(f'ALTER TABLE "{t}" DISABLE TRIGGER USER')
+            for stmt in leading:
+                cur.execute(stmt)
+            conn.commit()
+
+            connections = queue.Queue()
+            for _ in range(min(workers, len(copies)) or 1):
+                worker_conn = psycopg2.connect(**dsn)
+                opened.append(worker_conn)
+                worker_cur = self._prepare_restore_session(worker_conn)
+                if use_replication_role:
+                    self._set_replication_role(worker_cur, local=False)
+                worker_conn.commit()
+                connections.put(worker_conn)
+
+            loaded = [0]
+            loaded_lock = threading.Lock()
+
+            def load_table(table):
+                copy_sql, path = copies[table]
+                worker_conn = connections.get()
+                try:
+                    with open(path, 'rb') as data:
+                        worker_conn.cursor().copy_expert(copy_sql, data, size=self.COPY_CHUNK_SIZE)
+                    worker_conn.commit()
+                except Exception:
+                    worker_conn.rollback()
+                    raise
+                finally:
+                    connections.put(worker_conn)
+                with loaded_lock:
+                    loaded[0] += 1
+                    count = loaded[0]
+                if progress_callback:
+                    progress_callback('restore', count, len(copies))
+
+            with ThreadPoolExecutor(max_workers=max(1, len(opened))) as executor:
+                for wave in self._topological_waves(conn, list(copies)):
+                    # list() re-raises the first failure before the next wave starts
+                    list(executor.map(load_table, wave))
+
+            for stmt in trailing:
+                cur.execute(stmt)
+            for t in disabled_tables:
+                cur.execute(f'ALTER TABLE "{t}" ENABLE TRIGGER USER')
+            disabled_tables = []
+            conn.commit()
+        finally:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                    if disabled_tables:
+                        cur = conn.cursor()
+                        for t in disabled_tables:
+                            cur.execute(f'ALTER TABLE "{t}" ENABLE TRIGGER USER')
+                        conn.commit()
+                except Exception as e:
+                    print(f"[BACKUP] Could not re-enable triggers after failed restore: {e}")
+            for c in opened + ([conn] if conn is not None else []):
+                try:
+                    c.close()
+                except Exception:
+                    pass
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+    def _prepare_restore_session(self, conn):
+        conn.set_client_encoding('UTF8')
+        cur = conn.cursor()
+        cur.execute("SET statement_timeout = 0")
+        cur.execute("SET lock_timeout = 0")
+        return cur
+
+    def _get_restore_target_tables(self, cur):
+        cur.execute("""
+            SELECT tablename FROM pg_tables
+            WHERE schemaname = 'public' AND tablename != 'schema_migrations'
+        """)
+        return [row[0] for row in cur.fetchall()]
+
+    def _set_replication_role(self, cur, local):
+        """Turn off triggers for cur's session (or transaction); False if the role may not."""
+        import psycopg2
+        cur.execute("SAVEPOINT replication_role")
+        try:
+            cur.execute(f"SET {'LOCAL ' if local else ''}session_replication_role = 'replica'")
+        except psycopg2.Error:
+            cur.execute("ROLLBACK TO SAVEPOINT replication_role")
+            cur.execute("RELEASE SAVEPOINT replication_role")
+            return False
+        cur.execute("RELEASE SAVEPOINT replication_role")
+        return True
+
+    def _open_backup_stream(self, raw):
+        head = raw.read(2)
+        raw.seek(0)
+        return gzip.GzipFile(fileobj=raw) if head == b'\x1f\x8b' else raw
+
+    def _next_restore_statement(self, reader):
+        """Next statement line of a COPY engine script (None at the end); comments and role switches skipped."""
+        while True:
+            line = reader.readline()
+            if not line:
+                return None
+            stmt = line.decode('utf-8').strip()
+            if not stmt or stmt.startswith('--') or stmt.startswith('SET session_replication_role'):
+                continue
+            return stmt
+
+    def _is_copy_statement(self, stmt):
+        return stmt.startswith('COPY ') and stmt.endswith(' FROM stdin;')
+
     # ------------------------------------------------------------------ auto/manual backup (unchanged behavior, but use export_database)
 
     def setup_auto_backup_timer(self):
@@ -544,10 +1333,16 @@ class DatabaseBackupHelper:
     def auto_backup_database_hourly(self):
         os.makedirs(self.backup_dir, exist_ok=True)
         today_str = datetime.now().strftime("%Y%m%d")
-        backup_filename = f"archive_database_{today_str}.sql"
+        backup_filename = f"archive_database_{today_str}{self.ARCHIVE_EXTENSION}"
         backup_path = os.path.join(self.backup_dir, backup_filename)
         lock_path = os.path.join(self.db_manager.temp_dir, "backup.lock")
 
+        # Read before the backup starts: anything committed later moves it again
+        fingerprint = self.get_change_fingerprint()
+        if self.is_unchanged_since_last_backup(fingerprint):
+            print("[BACKUP] No changes since the last backup; hourly backup skipped")
+            return
+
         if os.path.exists(lock_path):
             lock_age = time.time() - os.path.getmtime(lock_path)
             if lock_age > 7200:
@@ -566,13 +1361,24 @@ class DatabaseBackupHelper:
             with open(lock_path, "w") as f:
                 f.write(self.db_manager.session_id)
 
-            dsn, _ = self._get_pg_env()
             old_size = os.path.getsize(backup_path) if os.path.exists(backup_path) else None
 
-            self.export_database(backup_path, use_pg_dump=self.has_pg_dump())
-
-            new_size = os.path.getsize(backup_path)
-            if old_size is not None:
+            if self.is_incremental_enabled():
+                written_path = self.export_incremental(backup_path)
+            else:
+                self.write_base_backup(backup_path)
+                written_path = backup_path
+
+            self._save_backup_state(fingerprint, backup_path)
+            new_size = os.path.getsize(written_path) if written_path else 0
+            if written_path is None:
+                msg = f"Backup unchanged: no changes since the last backup of {backup_filename}"
+            elif written_path != backup_path:
+                msg = (
+                    f"Backup delta written: {backup_filename} + {os.path.basename(written_path)} "
+                    f"({new_size} bytes)"
+                )
+            elif old_size is not None:
                 msg = (
                     f"Backup updated: {backup_filename}\n"
                     f"  Size: {old_size} bytes -> {new_size} bytes"
@@ -595,7 +1401,7 @@ class DatabaseBackupHelper:
     def manual_backup_database(self):
         os.makedirs(self.backup_dir, exist_ok=True)
         today_str = datetime.now().strftime("%Y%m%d")
-        backup_filename = f"archive_database_{today_str}.sql"
+        backup_filename = f"archive_database_{today_str}{self.ARCHIVE_EXTENSION}"
         backup_path = os.path.join(self.backup_dir, backup_filename)
         lock_path = os.path.join(self.db_manager.temp_dir, "backup.lock")
 
@@ -617,7 +1423,9 @@ class DatabaseBackupHelper:
             with open(lock_path, "w") as f:
                 f.write(self.db_manager.session_id)
 
-            self.export_database(backup_path, use_pg_dump=self.has_pg_dump())
+            fingerprint = self.get_change_fingerprint()
+            self.write_base_backup(backup_path)
+            self._save_backup_state(fingerprint, backup_path)
             return backup_path
         except Exception as e:
             print(f"[BACKUP] Error creating manual backup: {e}")
@@ -656,7 +1464,7 @@ class DatabaseBackupHelper:
             return
         backups = []
         for fname in os.listdir(self.backup_dir):
-            if fname.startswith("archive_database_") and fname.endswith(".sql"):
+            if fname.startswith("archive_database_") and fname.endswith((".sql", self.ARCHIVE_EXTENSION)):
                 fpath = os.path.join(self.backup_dir, fname)
                 backups.append((fpath, os.path.getmtime(fpath)))
 
@@ -664,19 +1472,27 @@ class DatabaseBackupHelper:
         while len(backups) >= 7:
             try:
                 os.remove(backups[0][0])
+                shutil.rmtree(self.get_delta_dir(backups[0][0]), ignore_errors=True)
                 backups.pop(0)
             except Exception as e:
                 print(f"Error removing old backup: {e}")
 
+        # Deltas whose base is gone cannot be restored on their own
+        kept = {self.get_delta_dir(fpath) for fpath, _ in backups}
+        for fname in os.listdir(self.backup_dir):
+            fpath = os.path.join(self.backup_dir, fname)
+            if fname.startswith("archive_database_") and os.path.isdir(fpath) and fpath not in kept:
+                shutil.rmtree(fpath, ignore_errors=True)
+
     def get_all_user_tables(self):
         self.db_manager.connect(write=False)
         cursor = self.db_manager.connection.cursor()
         cursor.execute("""
             SELECT tablename FROM pg_tables
             WHERE schemaname = 'public'
-            AND tablename != 'schema_migrations'
+            AND tablename NOT IN %s
             ORDER BY tablename
-        """)
+        """, (self.BACKUP_EXCLUDED_TABLES,))
         tables = [row[0] for row in cursor.fetchall()]
         self.db_manager.close()
         return tables
@@ -693,130 +1509,81 @@ class DatabaseBackupHelper:
         self.db_manager.close()
         return columns
 
-    # ------------------------------------------------------------------ CSV (legacy)
+    # ------------------------------------------------------------------ CSV
 
     def import_from_csv(self, csv_path, progress_callback=None, resolution_mode='skip'):
+        """Import a file written by export_to_csv() in one transaction.
+
+        Each table section is streamed into a temporary all-text staging table
+        with COPY ... FROM STDIN, so the file is read once and no row goes
+        through its own INSERT. The staged rows are then cast and inserted per
+        table, parents first, with one statement per chunk:
+          - replace:   INSERT ... ON CONFLICT (primary key) DO UPDATE
+          - skip:      INSERT ... ON CONFLICT (primary key) DO NOTHING
+          - keep_both: rows whose id is taken get new ids after the current
+                       maximum, the others keep theirs
+        A chunk that fails is split until the failing rows are isolated; those
+        are written to <csv name>_rejects.csv (same layout plus import_error)
+        and everything else is imported. Serial sequences are moved past the
+        imported ids afterwards. The export writes NULL and '' alike, so empty
+        fields are read as NULL, or as '' for text columns that are NOT NULL.
+
+        progress_callback: callable(processed, total) in kilobytes of the file read.
+        Returns {'tables': {table: {'staged', 'imported', 'rejected'}}, 'rejected': n, 'reject_path': path|None}.
+        """
         import psycopg2
         dsn = self.db_manager.connection_helper._get_dsn()
         conn = psycopg2.connect(**dsn)
+        total_kb = max(1, os.path.getsize(csv_path) // 1024)
+        summary = {'tables': {}, 'rejected': 0, 'reject_path': None}
         try:
-            conn.autocommit = False
-            cur = None
-            try:
-                cur = conn.cursor()
-                cur.execute("SET statement_timeout = 0")
-                cur.execute("SET session_replication_role = 'replica'")
-            except Exception:
-                pass
-            conn.commit()
-
-            # Pre-fetch target tables in FK-dependency order and disable triggers
-            # on each, so CSV imports don't trip FK constraints regardless of
-            # the order tables happen to appear in the file.
-            target_tables = []
-            try:
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT tablename FROM pg_tables
-                    WHERE schemaname = 'public' AND tablename != 'schema_migrations'
-                """)
-                target_tables = [row[0] for row in cur.fetchall()]
-                target_tables = self._topological_sort_tables(conn, target_tables)
-                for t in target_tables:
-                    try:
-                        cur.execute(f'ALTER TABLE "{t}" DISABLE TRIGGER ALL')
-                    except Exception:
-                        conn.rollback()
-                        cur = conn.cursor()
-            except Exception as e:
-                print(f"[CSV IMPORT] Could not pre-disable triggers: {e}")
-            conn.commit()
-            cursor = conn.cursor()
-
-            with open(csv_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                current_table = None
-                headers = None
-                processed = 0
-                total_rows = sum(1 for row in csv.reader(open(csv_path, 'r', encoding='utf-8')) if row and row[0] != "TABLE")
-                csvfile.seek(0)
-
-                for row in reader:
-                    if not row:
-                        continue
-                    if row[0] == "TABLE":
-                        current_table = row[1]
-                        headers = None
-                        continue
-                    if headers is None:
-                        headers = row
-                        continue
-
-                    if current_table and headers:
-                        try:
-                            values = [val for val in row[:len(headers)]]
-                            columns_str = ', '.join(headers)
-                            placeholders = ', '.join(['%s'] * len(headers))
-
-                            if resolution_mode == 'replace':
-                                id_column = headers[0] if headers else 'id'
-                                set_clause = ', '.join([f"{col} = EXCLUDED.{col}" for col in headers[1:]])
-                                sql = f"INSERT INTO {current_table} ({columns_str}) VALUES ({placeholders}) ON CONFLICT ({id_column}) DO UPDATE SET {set_clause}"
-                                cursor.execute(sql, values)
-
-                            elif resolution_mode == 'keep_both':
-                                sql = f"INSERT INTO {current_table} ({columns_str}) VALUES ({placeholders})"
-                                try:
-                                    cursor.execute(sql, values)
-                                except psycopg2.IntegrityError:
-                                    conn.rollback()
-                                    cursor = conn.cursor()
-                                    try:
-                                        cursor.execute("SET session_replication_role = 'replica'")
-                                    except Exception:
-                                        pass
-                                    id_column = headers[0] if headers else 'id'
-                                    cursor.execute(f"SELECT MAX({id_column}) FROM {current_table}")
-                                    max_id = cursor.fetchone()[0] or 0
-                                    values[0] = max_id + 1
-                                    cursor.execute(sql, values)
-
-                            elif resolution_mode == 'skip':
-                                id_column = headers[0] if headers else 'id'
-                                cursor.execute(f"SELECT 1 FROM {current_table} WHERE {id_column} = %s", (values[0],))
-                                if not cursor.fetchone():
-                                    sql = f"INSERT INTO {current_table} ({columns_str}) VALUES ({placeholders})"
-                                    cursor.execute(sql, values)
-
-                        except Exception as e:
-                            print(f"[CSV IMPORT] Error importing row in table {current_table}: {e}")
-                            try:
-                                conn.rollback()
-                            except Exception:
-                                pass
-                            cursor = conn.cursor()
-                            try:
-                                cursor.execute("SET session_replication_role = 'replica'")
-                            except Exception:
-                                pass
-
-                    processed += 1
-                    if progress_callback and (processed % 10 == 0 or processed == total_rows):
-                        progress_callback(processed, total_rows)
-
-            # Re-enable triggers
-            try:
-                for t in target_tables:
-                    try:
-                        cursor.execute(f'ALTER TABLE "{t}" ENABLE TRIGGER ALL')
-                    except Exception:
-                        conn.rollback()
-                        cursor = conn.cursor()
-                cursor.execute("SET session_replication_role = 'origin'")
-            except Exception:
-                pass
+            cur = self._prepare_restore_session(conn)
+            cur.execute("""
+                SELECT tablename FROM pg_tables
+                WHERE schemaname = 'public' AND tablename NOT IN %s
+            """, (self.BACKUP_EXCLUDED_TABLES,))
+            known_tables = {row[0] for row in cur.fetchall()}
+
+            with open(csv_path, 'rb') as raw:
+                def on_row(count):
+                    if count % 10000 == 0:
+                        progress_callback(min(raw.tell() // 1024, total_kb), total_kb)
+                text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+                staged = self._stage_csv_sections(
+                    cur, csv.reader(text), known_tables, on_row if progress_callback else None
+                )
+            if progress_callback:
+                progress_callback(total_kb, total_kb)
+
+            disabled_tables = []
+            if not self._set_replication_role(cur, local=True):
+                disabled_tables = list(staged)
+                for t in disabled_tables:
+                    cur.execute(f'ALTER TABLE "{t}" DISABLE TRIGGER USER')
+
+            rejects = {}
+            for table in self._topological_sort_tables(conn, list(staged)):
+                header, row_count = staged[table]
+                imported, rejected = self._import_staged_table(cur, table, header, row_count, resolution_mode)
+                summary['tables'][table] = {'staged': row_count, 'imported': imported, 'rejected': len(rejected)}
+                if rejected:
+                    rejects[table] = rejected
+                self._fix_serial_sequences(cur, table)
+                print(f"[CSV IMPORT] {table}: {imported} of {row_count} rows imported, {len(rejected)} rejected")
+
+            if rejects:
+                summary['reject_path'] = self._write_csv_rejects(cur, csv_path, staged, rejects)
+                summary['rejected'] = sum(len(r) for r in rejects.values())
+                print(f"[CSV IMPORT] {summary['rejected']} rejected rows written to {summary['reject_path']}")
+
+            for t in disabled_tables:
+                cur.execute(f'ALTER TABLE "{t}" ENABLE TRIGGER USER')
             conn.commit()
-        except Exception as e:
+            self.db_manager.refresh_file_totals()
+            self.db_manager.invalidate_lookups()
+            self._reset_incremental_chains()
+            return summary
+        except Exception:
             conn.rollback()
             raise
         finally:
@@ -825,30 +1592,292 @@ class DatabaseBackupHelper:
             except Exception:
                 pass
 
-    def export_to_csv(self, csv_path, progress_callback=None):
+    def _stage_csv_sections(self, cur, rows, known_tables, on_row=None):
+        """COPY every table section into a temp table "csv__<table>"; returns {table: (header, row count)}."""
+        staged = {}
+        pending = next(rows, None)
+        while pending is not None:
+            if not pending or pending[0] != "TABLE":
+                pending = next(rows, None)
+                continue
+            table = pending[1] if len(pending) > 1 else None
+            header = next(rows, None)
+            while header is not None and not header:
+                header = next(rows, None)
+            if header is None:
+                break
+            if header[0] == "TABLE":
+                pending = header
+                continue
+
+            stream = _CsvSectionStream(rows, len(header), on_row)
+            if table not in known_tables:
+                print(f"[CSV IMPORT] Skipping unknown table: {table}")
+                while stream.read(self.COPY_CHUNK_SIZE):
+                    pass
+                pending = stream.next_table_row
+                continue
+
+            # Staging columns keep the CSV header; blank or repeated names are renamed
+            names = []
+            for index, name in enumerate(header):
+                name = name.strip()
+                names.append(name if name and name not in names else f"csv_column_{index}")
+            stage = f"csv__{table}"
+            cols_str = ', '.join(f'"{c}"' for c in names)
+            if table in staged:
+                if staged[table][0] != names:
+                    raise ValueError(f"Table {table} appears twice in the CSV file with different columns")
+            else:
+                column_defs = ', '.join(f'"{c}" TEXT' for c in names)
+                cur.execute(
+                    f'CREATE TEMP TABLE "{stage}" ("_csv_line" BIGSERIAL PRIMARY KEY, '
+                    f'"_csv_conflict" BOOLEAN NOT NULL DEFAULT FALSE, {column_defs}) ON COMMIT DROP'
+                )
+            # FORCE_NOT_NULL: empty fields arrive as '' and are turned into NULL per column type later
+            cur.copy_expert(
+                f'COPY "{stage}" ({cols_str}) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL ({cols_str}))',
+                stream, size=self.COPY_CHUNK_SIZE
+            )
+            previous = staged[table][1] if table in staged else 0
+            staged[table] = (names, previous + stream.row_count)
+            pending = stream.next_table_row
+
+        for table in staged:
+            cur.execute(f'ANALYZE "csv__{table}"')
+        return staged
+
+    def _get_import_columns(self, cur, table):
+        """[(column, type, not null)] of table's non-generated columns."""
+        cur.execute("""
+            SELECT a.attname, format_type(a.atttypid, a.atttypmod), a.attnotnull
+            FROM pg_attribute a
+            WHERE a.attrelid = quote_ident(%s)::regclass AND a.attnum > 0
+              AND NOT a.attisdropped AND a.attgenerated = ''
+            ORDER BY a.attnum
+        """, (table,))
+        return cur.fetchall()
+
+    def _get_primary_key(self, cur, table):
+        cur.execute("""
+            SELECT a.attname
+            FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+            WHERE i.indrelid = quote_ident(%s)::regclass AND i.indisprimary
+            ORDER BY array_position(i.indkey, a.attnum)
+        """, (table,))
+        return [row[0] for row in cur.fetchall()]
+
+    def _import_staged_table(self, cur, table, header, row_count, resolution_mode):
+        """Move the staged rows of table into it; returns (rows imported, [(csv line, error)])."""
+        import_columns = self._get_import_columns(cur, table)
+        types = {name: column_type for name, column_type, _ in import_columns}
+        not_null = {name for name, _, required in import_columns if required}
+        columns = [c for c in header if c in types]
+        if not columns or not row_count:
+            return 0, []
+        stage = f"csv__{table}"
+        key = self._get_primary_key(cur, table)
+        if not key or any(c not in columns for c in key):
+            key = []
+
+        def value_of(column):
+            column_type = types[column]
+            if column_type in ('text', 'name') or column_type.startswith('character'):
+                return f's."{column}"' if column in not_null else f'NULLIF(s."{column}", \'\')'
+            return f'NULLIF(s."{column}", \'\')::{column_type}'
+
+        cols_str = ', '.join(f'"{c}"' for c in columns)
+        values = ', '.join(value_of(c) for c in columns)
+        insert = f'INSERT INTO "{table}" ({cols_str}) SELECT {values} FROM "{stage}" s WHERE s."_csv_line" BETWEEN %s AND %s'
+        statements = []
+        if key and resolution_mode == 'replace':
+            key_str = ', '.join(f'"{c}"' for c in key)
+            updates = ', '.join(f'"{c}" = EXCLUDED."{c}"' for c in columns if c not in key)
+            action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+            statements.append(f"{insert} ON CONFLICT ({key_str}) {action}")
+        elif key and resolution_mode == 'skip':
+            key_str = ', '.join(f'"{c}"' for c in key)
+            statements.append(f"{insert} ON CONFLICT ({key_str}) DO NOTHING")
+        elif len(key) == 1 and resolution_mode == 'keep_both' and types[key[0]] in ('integer', 'bigint', 'smallint'):
+            key_column = key[0]
+            # Compared as text, so a malformed id cannot abort the statement
+            cur.execute(
+                f'UPDATE "{stage}" s SET "_csv_conflict" = TRUE FROM "{table}" t '
+                f'WHERE t."{key_column}"::text = s."{key_column}"'
+            )
+            statements.append(f'{insert} AND NOT s."_csv_conflict"')
+            renumbered = ', '.join(
+                f'(SELECT COALESCE(MAX("{key_column}"), 0) FROM "{table}") + ROW_NUMBER() OVER (ORDER BY s."_csv_line")'
+                if c == key_column else value_of(c)
+                for c in columns
+            )
+            statements.append(
+                f'INSERT INTO "{table}" ({cols_str}) SELECT {renumbered} FROM "{stage}" s '
+                f'WHERE s."_csv_line" BETWEEN %s AND %s AND s."_csv_conflict"'
+            )
+        else:
+            statements.append(insert)
+
+        cur.execute(f'SELECT MIN("_csv_line"), MAX("_csv_line") FROM "{stage}"')
+        first_line, last_line = cur.fetchone()
+        imported = 0
+        rejected = []
+        for statement in statements:
+            for start in range(first_line, last_line + 1, self.CSV_INSERT_CHUNK):
+                end = min(start + self.CSV_INSERT_CHUNK - 1, last_line)
+                imported += self._run_staged_insert(cur, statement, start, end, rejected)
+        return imported, rejected
+
+    def _run_staged_insert(self, cur, statement, first, last, rejected):
+        """Run statement for staged lines first..last; a failing range is halved until the bad lines are found."""
+        import psycopg2
+        cur.execute("SAVEPOINT csv_chunk")
+        try:
+            cur.execute(statement, (first, last))
+        except psycopg2.Error as e:
+            # ROLLBACK TO keeps the savepoint; release it so they do not nest
+            cur.execute("ROLLBACK TO SAVEPOINT csv_chunk")
+            cur.execute("RELEASE SAVEPOINT csv_chunk")
+            if first == last:
+                error = (e.pgerror or str(e)).strip().splitlines()
+                rejected.append((first, error[0] if error else type(e).__name__))
+                return 0
+            middle = (first + last) // 2
+            return (
+                self._run_staged_insert(cur, statement, first, middle, rejected)
+                + self._run_staged_insert(cur, statement, middle + 1, last, rejected)
+            )
+        count = max(cur.rowcount, 0)
+        cur.execute("RELEASE SAVEPOINT csv_chunk")
+        return count
+
+    def _fix_serial_sequences(self, cur, table):
+        """Move the serial sequences of table past the largest imported value."""
+        cur.execute("""
+            SELECT a.attname, pg_get_serial_sequence(quote_ident(%s), a.attname)
+            FROM pg_attribute a
+            WHERE a.attrelid = quote_ident(%s)::regclass AND a.attnum > 0 AND NOT a.attisdropped
+        """, (table, table))
+        for column, sequence in cur.fetchall():
+            if sequence is None:
+                continue
+            cur.execute(
+                f'SELECT setval(%s, m) FROM (SELECT MAX("{column}") AS m FROM "{table}") x '
+                f'WHERE m > COALESCE(pg_sequence_last_value(%s::regclass), 0)',
+                (sequence, sequence)
+            )
+
+    def _write_csv_rejects(self, cur, csv_path, staged, rejects):
+        """Write the rejected rows, in the export_to_csv() layout plus an import_error column."""
+        reject_path = os.path.splitext(csv_path)[0] + "_rejects.csv"
+        with open(reject_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            for table, rejected in rejects.items():
+                header = staged[table][0]
+                errors = dict(rejected)
+                writer.writerow(["TABLE", table])
+                writer.writerow(header + ["import_error"])
+                cols_str = ', '.join(f'"{c}"' for c in header)
+                cur.execute(
+                    f'SELECT "_csv_line", {cols_str} FROM "csv__{table}" WHERE "_csv_line" = ANY(%s) ORDER BY "_csv_line"',
+                    (list(errors),)
+                )
+                for row in cur.fetchall():
+                    writer.writerow(list(row[1:]) + [errors[row[0]]])
+                writer.writerow([])
+        return reject_path
+
+    def estimate_table_rows(self, tables=None):
+        """Planner row estimates (pg_class.reltuples) of tables, default all backed-up tables; no table is scanned."""
         self.db_manager.connect(write=False)
         try:
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                cursor = self.db_manager.connection.cursor()
-                tables = self.get_all_user_tables()
-                processed = 0
-                total_rows = 0
-                for table_name in tables:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    total_rows += cursor.fetchone()[0]
-                for table_name in tables:
-                    writer.writerow(["TABLE", table_name])
-                    columns = self.get_table_columns(table_name)
-                    columns_str = ', '.join(columns)
-                    cursor.execute(f"SELECT {columns_str} FROM {table_name}")
-                    writer.writerow(columns)
-                    rows = cursor.fetchall()
-                    for row in rows:
-                        writer.writerow([row[col] for col in columns])
-                        processed += 1
-                        if progress_callback and (processed % 10 == 0 or processed == total_rows):
-                            progress_callback(processed, total_rows)
-                    writer.writerow([])
+            cursor = self.db_manager.connection.cursor()
+            if tables is None:
+                cursor.execute("""
+                    SELECT tablename FROM pg_tables
+                    WHERE schemaname = 'public' AND tablename NOT IN %s
+                """, (self.BACKUP_EXCLUDED_TABLES,))
+                tables = [row[0] for row in cursor.fetchall()]
+            return self._estimate_table_rows(cursor, tables)
         finally:
             self.db_manager.close()
+
+    def _estimate_table_rows(self, cur, tables):
+        # reltuples is -1 for tables never vacuumed or analyzed
+        cur.execute("""
+            SELECT c.relname, GREATEST(c.reltuples, 0)::bigint
+            FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND c.relname = ANY(%s)
+        """, (list(tables),))
+        return {table: estimate for table, estimate in cur.fetchall()}
+
+    def export_to_csv(self, csv_path, progress_callback=None):
+        """Write every table to one CSV file: a "TABLE,<name>" row, the header, the rows, a blank row.
+
+        Each table is streamed with COPY ... TO STDOUT (FORMAT csv) straight
+        into the file, so memory stays flat whatever the table size, and all
+        tables are read in one REPEATABLE READ snapshot. Progress counts the
+        lines written (rows, plus the extra lines of multi-line values) against
+        the planner's estimate (pg_class.reltuples) instead of running COUNT(*)
+        on every table. The file is written next to csv_path and
+        renamed over it when complete.
+
+        progress_callback: callable(processed, total)
+        """
+        import psycopg2
+        import psycopg2.extensions
+
+        dsn = self.db_manager.connection_helper._get_dsn()
+        conn = psycopg2.connect(**dsn)
+        part_path = csv_path + ".part"
+        try:
+            conn.set_client_encoding('UTF8')
+            conn.set_session(isolation_level=psycopg2.extensions.ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+            cur = conn.cursor()
+            cur.execute("SET statement_timeout = 0")
+            cur.execute("""
+                SELECT c.relname, a.attname
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+                    AND a.attgenerated = ''
+                WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p') AND c.relname NOT IN %s
+                ORDER BY c.relname, a.attnum
+            """, (self.BACKUP_EXCLUDED_TABLES,))
+            columns = {}
+            for table, column in cur.fetchall():
+                columns.setdefault(table, []).append(column)
+            total_rows = sum(self._estimate_table_rows(cur, list(columns)).values())
+
+            processed = [0]
+
+            def on_lines(count):
+                processed[0] += count
+                progress_callback(processed[0], max(total_rows, processed[0]))
+
+            with open(part_path, 'wb') as out:
+                for table, table_columns in columns.items():
+                    section = io.StringIO()
+                    writer = csv.writer(section)
+                    writer.writerow(["TABLE", table])
+                    writer.writerow(table_columns)
+                    out.write(section.getvalue().encode('utf-8'))
+                    cols_str = ', '.join(f'"{c}"' for c in table_columns)
+                    target = _LineCountingWriter(out, on_lines, 1000) if progress_callback else out
+                    cur.copy_expert(
+                        f'COPY (SELECT {cols_str} FROM "{table}") TO STDOUT WITH (FORMAT csv)',
+                        target, size=self.COPY_CHUNK_SIZE
+                    )
+                    if progress_callback:
+                        target.flush_count()
+                    out.write(b"\r\n")
+            conn.rollback()
+            os.replace(part_path, csv_path)
+        finally:
+            conn.close()
+            if os.path.exists(part_path):
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
@@ -30,6 +30,7 @@ class DatabaseCategoriesHelper:
         self.db_manager.connection.commit()
         self.db_manager.close()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("categories")
 
     def rename_subcategory(self, category_name, old_subcategory_name, new_subcategory_name):
         """Rename a subcategory and update all references."""
@@ -68,6 +69,7 @@ class DatabaseCategoriesHelper:
         self.db_manager.connection.commit()
         self.db_manager.close()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("subcategories")
     """Helper class for category and subcategory management."""
     
     def __init__(self, db_manager):
@@ -112,6 +114,7 @@ class DatabaseCategoriesHelper:
         cursor.execute("INSERT INTO categories (name) VALUES (%s) RETURNING id", (category_name,))
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("categories")
         last_id = cursor.fetchone()[0]
         self.db_manager.close()
         return last_id
@@ -137,6 +140,7 @@ class DatabaseCategoriesHelper:
         )
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("subcategories")
         last_id = cursor.fetchone()[0]
         self.db_manager.close()
         return last_id
@@ -158,6 +162,7 @@ class DatabaseCategoriesHelper:
         self.db_manager.connection.commit()
         self.db_manager.close()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("categories", "subcategories")
 
     def delete_subcategory(self, category_name, subcategory_name):
         """Delete specific subcategory."""
@@ -182,3 +187,4 @@ class DatabaseCategoriesHelper:
         self.db_manager.connection.commit()
         self.db_manager.close()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("subcategories")
@@ -5,6 +5,16 @@ class DatabaseClientsHelper:
     
     def __init__(self, db_manager):
         self.db_manager = db_manager
+        connection_helper = db_manager.connection_helper
+        connection_helper.register_statement(
+            "client_name_by_file", ("integer",),
+            "SELECT c.client_name FROM file_client_price fcp JOIN client c ON fcp.client_id = c.id "
+            "WHERE fcp.file_id = $1 LIMIT 1"
+        )
+        connection_helper.register_statement(
+            "client_batch_by_file_client", ("integer", "integer"),
+            "SELECT batch_number FROM file_client_batch WHERE file_id = $1 AND client_id = $2 ORDER BY id DESC LIMIT 1"
+        )
 
     def get_all_clients(self):
         """Get all clients with full details."""
@@ -47,6 +57,7 @@ class DatabaseClientsHelper:
         )
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("client")
         self.db_manager.close()
 
     def update_client(self, client_id, client_name, contact, links, status, note):
@@ -59,6 +70,7 @@ class DatabaseClientsHelper:
         )
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("client")
         self.db_manager.close()
 
     def get_files_by_client_id_paged(self, client_id, search_text=None, batch_filter=None, 
@@ -207,13 +219,7 @@ class DatabaseClientsHelper:
         """Get client name associated with a file."""
         self.db_manager.connect(write=False)
         cursor = self.db_manager.connection.cursor()
-        cursor.execute("""
-            SELECT c.client_name
-            FROM file_client_price fcp
-            JOIN client c ON fcp.client_id = c.id
-            WHERE fcp.file_id = %s
-            LIMIT 1
-        """, (file_id,))
+        self.db_manager.execute_prepared(cursor, "client_name_by_file", (file_id,))
         row = cursor.fetchone()
         self.db_manager.close()
         if row:
@@ -297,6 +303,120 @@ class DatabaseClientsHelper:
         self.db_manager.create_temp_file()
         self.db_manager.close()
 
+    def assign_files_client_bulk(self, file_ids, client_id):
+        """Assign many priced files to a client in set-based statements.
+
+        Mirrors update_file_client_relation per file, and moves each file's
+        batch assignment from its previous client unless it already has one
+        for client_id. Returns the number of files assigned.
+        """
+        file_ids = list(file_ids)
+        if not file_ids:
+            return 0
+        self.db_manager.connect()
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("DELETE FROM file_client_price WHERE file_id = ANY(%s)", (file_ids,))
+        assigned = 0
+        if client_id:
+            cursor.execute("""
+                INSERT INTO file_client_price (file_id, item_price_id, client_id, created_at, updated_at)
+                SELECT ip.file_id, ip.id, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+                FROM item_price ip
+                WHERE ip.file_id = ANY(%s)
+            """, (client_id, file_ids))
+            assigned = cursor.rowcount
+            cursor.execute("""
+                UPDATE file_client_batch fcb
+                SET client_id = %(client_id)s, updated_at = CURRENT_TIMESTAMP
+                WHERE fcb.file_id = ANY(%(file_ids)s)
+                  AND fcb.client_id <> %(client_id)s
+                  AND NOT EXISTS (
+                      SELECT 1 FROM file_client_batch other
+                      WHERE other.file_id = fcb.file_id AND other.client_id = %(client_id)s
+                  )
+            """, {"client_id": client_id, "file_ids": file_ids})
+        self.db_manager.connection.commit()
+        self.db_manager.create_temp_file()
+        self.db_manager.close()
+        return assigned
+
+    def assign_files_client_batch_bulk(self, file_ids, client_id, batch_number, note=""):
+        """Assign many files to a client batch in one statement; returns the number of files."""
+        file_ids = list(file_ids)
+        if not file_ids or not client_id or not batch_number:
+            return 0
+        self.db_manager.connect()
+        cursor = self.db_manager.connection.cursor()
+        # Same update-or-insert as assign_file_client_batch, for all files at once
+        cursor.execute("""
+            WITH targets AS (
+                SELECT DISTINCT f.file_id FROM UNNEST(%(file_ids)s::integer[]) AS f(file_id)
+            ), updated AS (
+                UPDATE file_client_batch fcb
+                SET batch_number = %(batch_number)s, note = %(note)s, updated_at = CURRENT_TIMESTAMP
+                WHERE fcb.client_id = %(client_id)s AND fcb.file_id IN (SELECT file_id FROM targets)
+                RETURNING fcb.file_id
+            ), inserted AS (
+                INSERT INTO file_client_batch (file_id, client_id, batch_number, note, created_at, updated_at)
+                SELECT t.file_id, %(client_id)s, %(batch_number)s, %(note)s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+                FROM targets t
+                WHERE t.file_id NOT IN (SELECT file_id FROM updated)
+                RETURNING file_id
+            )
+            SELECT (SELECT COUNT(DISTINCT file_id) FROM updated) + (SELECT COUNT(*) FROM inserted)
+        """, {"file_ids": file_ids, "client_id": client_id, "batch_number": batch_number, "note": note})
+        assigned = cursor.fetchone()[0]
+        self.db_manager.connection.commit()
+        self.db_manager.create_temp_file()
+        self.db_manager.close()
+        return assigned
+
+    def update_files_status_bulk(self, file_ids, status_id):
+        """Set the status of many files in one statement; returns the number changed."""
+        file_ids = list(file_ids)
+        if not file_ids:
+            return 0
+        self.db_manager.connect()
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("""
+            UPDATE files
+            SET status_id = %s, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ANY(%s) AND status_id IS DISTINCT FROM %s
+        """, (status_id, file_ids, status_id))
+        updated_count = cursor.rowcount
+        self.db_manager.connection.commit()
+        self.db_manager.close()
+        if updated_count:
+            self.db_manager.create_temp_file()
+        return updated_count
+
+    def assign_files_bulk(self, file_ids, price=None, currency=None, note="", client_id=None,
+                          batch_number=None, status_id=None, operational_percentage=None):
+        """Apply price, client, batch and status to many files as one transaction.
+
+        Each part is skipped when its argument is None and costs a constant
+        number of statements whatever the number of files. A new price also
+        recalculates the earnings shares of those files. Returns a dict with
+        the number of rows touched by each part.
+        """
+        file_ids = list(dict.fromkeys(file_ids))
+        result = {"prices": 0, "earnings": 0, "clients": 0, "batches": 0, "statuses": 0}
+        if not file_ids:
+            return result
+        with self.db_manager.transaction():
+            if price is not None:
+                result["prices"] = self.db_manager.assign_prices_bulk(file_ids, price, currency, note)
+                if operational_percentage is None:
+                    operational_percentage = int(self.db_manager.window_config_manager.get("operational_percentage"))
+                result["earnings"] = self.db_manager.recalculate_earnings_shares(operational_percentage, file_ids=file_ids)
+            if client_id is not None:
+                result["clients"] = self.assign_files_client_bulk(file_ids, client_id)
+            if batch_number is not None and client_id is not None:
+                result["batches"] = self.assign_files_client_batch_bulk(file_ids, client_id, batch_number)
+            if status_id is not None:
+                result["statuses"] = self.update_files_status_bulk(file_ids, status_id)
+        return result
+
     # Batch management methods
     def add_batch_number(self, batch_number, note="", client_id=None):
         """Add new batch number."""
@@ -353,10 +473,7 @@ class DatabaseClientsHelper:
         """Get assigned batch number for file-client."""
         self.db_manager.connect(write=False)
         cursor = self.db_manager.connection.cursor()
-        cursor.execute(
-            "SELECT batch_number FROM file_client_batch WHERE file_id = %s AND client_id = %s ORDER BY id DESC LIMIT 1",
-            (file_id, client_id)
-        )
+        self.db_manager.execute_prepared(cursor, "client_batch_by_file_client", (file_id, client_id))
         row = cursor.fetchone()
         self.db_manager.close()
         if row:
@@ -426,10 +543,7 @@ class DatabaseClientsHelper:
         """Get batch number for specific file-client."""
         self.db_manager.connect(write=False)
         cursor = self.db_manager.connection.cursor()
-        cursor.execute(
-            "SELECT batch_number FROM file_client_batch WHERE file_id = %s AND client_id = %s ORDER BY id DESC LIMIT 1",
-            (file_id, client_id)
-        )
+        self.db_manager.execute_prepared(cursor, "client_batch_by_file_client", (file_id, client_id))
         row = cursor.fetchone()
         self.db_manager.close()
         if row:
@@ -583,8 +697,9 @@ class DatabaseClientsHelper:
         """, (status_id, batch_number, client_id))
         
         updated_count = cursor.rowcount
+        if updated_count:
+            self.db_manager.notify_in_transaction(cursor)
         self.db_manager.connection.commit()
-        self.db_manager.create_temp_file()
         self.db_manager.close()
         
         return updated_count
@@ -1,16 +1,178 @@
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 import os
 import time
+import threading
+import collections
+import weakref
+from contextlib import contextmanager
 from PySide6.QtCore import QObject
 
 
+POOL_CONFIG_KEYS = (
+    "read_min_connections",
+    "read_max_connections",
+    "write_min_connections",
+    "write_max_connections",
+    "health_check_interval_seconds",
+    "checkout_timeout_seconds",
+    "connect_timeout_seconds",
+)
+
+
+class DatabaseConnectionPool:
+    """Bounded, blocking pool of psycopg2 connections with idle health checks."""
+
+    def __init__(self, name, minconn, maxconn, health_check_interval, checkout_timeout, dsn):
+        self.name = name
+        self.maxconn = maxconn
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+        self._dsn = dsn
+        self._idle = collections.deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _connect(self):
+        return psycopg2.connect(cursor_factory=psycopg2.extras.DictCursor, **self._dsn)
+
+    def getconn(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise psycopg2.pool.PoolError(f"'{self.name}' pool is closed")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.maxconn:
+                    self._size += 1
+                    conn, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise psycopg2.pool.PoolError(
+                        f"Timed out waiting for a '{self.name}' connection after {self.checkout_timeout}s"
+                    )
+                self._cond.wait(remaining)
+        try:
+            if conn is not None and not self._is_healthy(conn, last_used):
+                self._close_quietly(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+            return conn
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def putconn(self, conn, discard=False):
+        if not discard and not conn.closed:
+            try:
+                status = conn.info.transaction_status
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    discard = True
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception as e:
+                print(f"[DB] Discarding '{self.name}' connection on return: {e}")
+                discard = True
+        discard = discard or bool(conn.closed)
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        if discard or self._closed:
+            self._close_quietly(conn)
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if last_used is not None and time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception as e:
+            print(f"[DB] Discarding unhealthy '{self.name}' connection: {e}")
+            return False
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+
+class _UnitOfWork:
+    """State of one DatabaseManager.transaction() on the calling thread."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.connection = _UnitOfWorkConnection(conn, self)
+        self.nesting = 1
+        self.notify = False
+        self.rolled_back = False
+
+
+class _UnitOfWorkConnection:
+    """The pooled connection as helpers see it inside a transaction() block.
+
+    commit() waits for the end of the block; rollback() rolls back for real
+    and marks the whole unit as failed. Everything else is the connection.
+    """
+
+    def __init__(self, conn, unit):
+        self._conn = conn
+        self._unit = unit
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self._unit.rolled_back = True
+        self._conn.rollback()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
 class DatabaseConnectionHelper(QObject):
 
     def __init__(self, db_manager):
         super().__init__()
         self.db_manager = db_manager
-        self.query_start_time = None
+        self._local = threading.local()
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        self.pool_config = self._load_pool_config()
+        self._statements = {}
+        self._statement_stats = {}
+        self._prepared_on = weakref.WeakKeyDictionary()
+        self._statements_lock = threading.Lock()
 
     def _get_dsn(self, dbname_override=None):
         dsn = {
@@ -25,6 +187,51 @@ class DatabaseConnectionHelper(QObject):
             dsn['sslmode'] = sslmode
         return dsn
 
+    def _load_pool_config(self):
+        pool_conf = self.db_manager.db_config["pool"]
+        config = {}
+        for key in POOL_CONFIG_KEYS:
+            value = pool_conf[key]
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise ValueError(f"Invalid database.pool.{key} in db_config.json: {value!r}")
+            config[key] = value
+        for mode in ("read", "write"):
+            if config[f"{mode}_max_connections"] < 1:
+                raise ValueError(f"database.pool.{mode}_max_connections must be at least 1")
+            if config[f"{mode}_min_connections"] > config[f"{mode}_max_connections"]:
+                raise ValueError(
+                    f"database.pool.{mode}_min_connections exceeds {mode}_max_connections"
+                )
+        return config
+
+    def _get_pool_dsn(self):
+        # Lets the change-notify triggers tag writes with this session
+        dsn = dict(self._get_dsn(), options=f"-c app.session_id={self.db_manager.session_id}")
+        if self.pool_config["connect_timeout_seconds"]:
+            # Fail fast when the server is unreachable instead of waiting on the OS TCP timeout
+            dsn["connect_timeout"] = self.pool_config["connect_timeout_seconds"]
+        return dsn
+
+    def _get_pool(self, write):
+        mode = "write" if write else "read"
+        pool = self._pools.get(mode)
+        if pool is not None:
+            return pool
+        with self._pools_lock:
+            pool = self._pools.get(mode)
+            if pool is None:
+                pool = DatabaseConnectionPool(
+                    mode,
+                    self.pool_config[f"{mode}_min_connections"],
+                    self.pool_config[f"{mode}_max_connections"],
+                    self.pool_config["health_check_interval_seconds"],
+                    self.pool_config["checkout_timeout_seconds"],
+                    self._get_pool_dsn(),
+                )
+                self._pools[mode] = pool
+                print(f"[DB] Created {mode} pool (max {pool.maxconn} connections)")
+        return pool
+
     def ensure_database_exists(self):
         os.makedirs(self.db_manager.temp_dir, exist_ok=True)
 
@@ -58,38 +265,205 @@ class DatabaseConnectionHelper(QObject):
         self.db_manager.connect(write=True)
         self.db_manager.files_helper.initialize_statuses()
         self.db_manager.close()
+        self.db_manager.caching_helper.start()
         self.db_manager.polling_helper.start_listening()
 
+    def current_connection(self):
+        """Return the connection checked out by the calling thread, if any."""
+        unit = getattr(self._local, "unit", None)
+        if unit is not None:
+            return unit.connection
+        return getattr(self._local, "conn", None)
+
     def connect(self, write=True):
-        self.query_start_time = time.time()
-        if self.db_manager.connection is None or self.db_manager.connection.closed:
-            self.db_manager.connection = psycopg2.connect(
-                **self._get_dsn(),
-                cursor_factory=psycopg2.extras.DictCursor
-            )
-        else:
+        state = self._local
+        depth = getattr(state, "depth", 0)
+        conn = getattr(state, "conn", None)
+        unit = getattr(state, "unit", None)
+        if unit is None and (depth == 0 or conn is None or conn.closed):
+            if conn is not None:
+                state.conn = None
+                self._get_pool(state.write).putconn(conn, discard=True)
+            state.write = write
+            state.conn = self._get_pool(write).getconn()
+            state.query_start_time = time.time()
+        elif unit is None:
+            # Nested connect() on the same thread: keep the checked-out
+            # connection but drop any stale transaction like before.
             try:
-                if self.db_manager.connection.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
-                    self.db_manager.connection.rollback()
+                if conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
+                    conn.rollback()
             except Exception:
                 pass
-        return self.db_manager.connection
+        state.depth = depth + 1
+        return self.current_connection()
 
     def close(self):
-        if self.query_start_time:
-            elapsed_ms = (time.time() - self.query_start_time) * 1000
+        state = self._local
+        depth = getattr(state, "depth", 0)
+        if depth <= 0:
+            return
+        state.depth = depth - 1
+        if state.depth > 0:
+            return
+        query_start_time = getattr(state, "query_start_time", None)
+        if query_start_time:
+            elapsed_ms = (time.time() - query_start_time) * 1000
             self.db_manager.status_message.emit(f"Query: {elapsed_ms:.1f}ms", 2000)
-            self.query_start_time = None
+            state.query_start_time = None
+        conn = state.conn
+        state.conn = None
+        if conn is not None:
+            self._get_pool(state.write).putconn(conn)
 
-    def create_temp_file(self):
-        self.db_manager.polling_helper.notify_change()
+    def current_depth(self):
+        """Return how many connect() calls the calling thread has not closed yet."""
+        return getattr(self._local, "depth", 0)
 
-    def shutdown(self):
-        if self.db_manager.connection:
+    def unwind(self, depth):
+        """Close the calling thread's connections down to depth.
+
+        Helpers do not close() when a query raises; callers that recover from
+        the error use this to release what the failed call left checked out.
+        """
+        while self.current_depth() > depth:
+            self.close()
+
+    @contextmanager
+    def checkout(self, write=False):
+        """Check out a pooled connection for the duration of a ``with`` block."""
+        conn = self.connect(write)
+        try:
+            yield conn
+        finally:
+            self.close()
+
+    @contextmanager
+    def transaction(self):
+        """Run the helper calls of a ``with`` block as one unit of work.
+
+        The block and every helper it calls share one write connection and one
+        transaction: the helpers' commit() calls are deferred, their change
+        notifications are folded into a single NOTIFY sent with the commit,
+        and the block's end commits once. An exception rolls everything back;
+        so does a helper that rolls back on its own, in which case the block
+        ends with RuntimeError. Nested blocks join the outer one.
+        """
+        state = self._local
+        unit = getattr(state, "unit", None)
+        if unit is not None:
+            unit.nesting += 1
+            try:
+                yield unit.connection
+            finally:
+                unit.nesting -= 1
+            return
+
+        depth = self.current_depth()
+        conn = self.connect(write=True)
+        if isinstance(conn, _UnitOfWorkConnection):
+            conn = conn._conn
+        if conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
+            conn.rollback()
+        unit = _UnitOfWork(conn)
+        state.unit = unit
+        try:
+            yield unit.connection
+            if unit.rolled_back or conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+                raise RuntimeError("A step of the transaction failed and was rolled back; nothing was committed")
+            if unit.notify:
+                self.db_manager.polling_helper.notify_in_transaction(conn.cursor())
+            conn.commit()
+        except BaseException:
             try:
-                self.db_manager.connection.close()
+                conn.rollback()
             except Exception:
                 pass
-            self.db_manager.connection = None
+            raise
+        finally:
+            state.unit = None
+            self.unwind(depth)
+
+    def in_transaction(self):
+        """Whether the calling thread is inside a transaction() block."""
+        return getattr(self._local, "unit", None) is not None
+
+    @contextmanager
+    def cursor(self, write=False):
+        """Yield a cursor on a pooled connection; commits on success for writes."""
+        conn = self.connect(write)
+        try:
+            cursor = conn.cursor()
+            yield cursor
+            if write:
+                conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            self.close()
+
+    def register_statement(self, name, param_types, sql):
+        """Register a hot statement to be PREPAREd once per pooled connection.
+
+        sql uses $1, $2, ... placeholders matching param_types (SQL type names).
+        """
+        with self._statements_lock:
+            self._statements[name] = (tuple(param_types), sql)
+            self._statement_stats.setdefault(name, {"prepared": 0, "hits": 0})
+
+    def execute_prepared(self, cursor, name, params=()):
+        """Run a registered statement on cursor by name, preparing it on first use.
+
+        A prepared statement belongs to the server session of the connection
+        that ran PREPARE, so the registry records per pooled connection which
+        names it has prepared. A connection the pool replaces starts without
+        them and prepares again. A name is recorded only after its PREPARE
+        succeeded. Register only statements that really run often: one that is
+        served from the lookup cache almost never reaches this path.
+        """
+        param_types, sql = self._statements[name]
+        conn = cursor.connection
+        with self._statements_lock:
+            prepared = self._prepared_on.setdefault(conn, set())
+            needs_prepare = name not in prepared
+        if needs_prepare:
+            types_sql = f" ({', '.join(param_types)})" if param_types else ""
+            cursor.execute(f"PREPARE {name}{types_sql} AS {sql}")
+            with self._statements_lock:
+                prepared.add(name)
+                self._statement_stats[name]["prepared"] += 1
+        else:
+            with self._statements_lock:
+                self._statement_stats[name]["hits"] += 1
+        if params:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+        return cursor
+
+    def get_prepared_statement_stats(self):
+        """Return {name: {"prepared": n, "hits": n}} across all pooled connections."""
+        with self._statements_lock:
+            return {name: dict(stats) for name, stats in self._statement_stats.items()}
+
+    def create_temp_file(self):
+        unit = getattr(self._local, "unit", None)
+        if unit is not None:
+            # Sent once, inside the transaction, when the unit commits
+            unit.notify = True
+            return
+        self.db_manager.polling_helper.notify_change()
+
+    def shutdown(self):
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.closeall()
+        self._local = threading.local()
         self.db_manager.polling_helper.stop()
         print('[DB] All connections closed')
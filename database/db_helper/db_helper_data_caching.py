@@ -1,334 +1,587 @@
-import sqlite3
+import json
 import os
-import shutil
+import sqlite3
 import tempfile
+import threading
 import time
-import random
-from PySide6.QtCore import QObject, QTimer
+from datetime import date, datetime, time as datetime_time
+from decimal import Decimal
+
+import psycopg2
+import psycopg2.pool
+from PySide6.QtCore import QObject
 
 
 class DatabaseCachingHelper(QObject):
-    """Disk cache loaded to memory for ultra-fast reads."""
-    
-    def __init__(self, db_manager, config_manager=None):
+    """Local SQLite read replica of the tables behind the main view and its filters.
+
+    Enabled with system_caching.enable in db_config.json. The replica lives in
+    <temp>/<system_caching.database_cache>/replica_<DB_NAME>.sqlite and is kept
+    current incrementally: every table_changed notification (migration 007)
+    queues the changed ids, and a background sync re-reads just those rows.
+    Notifications without ids (bulk statements) re-pull the table. On startup
+    and after the listener reconnects, a per-table fingerprint is compared with
+    the server so changes made while this client was away are picked up.
+
+    DatabaseManager routes the main table and dropdown reads through read():
+    they go to PostgreSQL as usual, and when that fails with a connection error
+    (server unreachable, pool checkout timed out) the same read is answered
+    from the replica and the app keeps serving from it for OFFLINE_RETRY_SECONDS
+    before trying the server again. A read that succeeds but takes longer than
+    system_caching.slow_read_ms switches to the replica the same way, so a slow
+    but reachable server costs one slow read instead of every read.
+    """
+
+    # table -> column the table_changed ids refer to (see migration 007)
+    REPLICA_TABLES = {
+        "statuses": "id",
+        "categories": "id",
+        "subcategories": "id",
+        "templates": "id",
+        "client": "id",
+        "batch_list": "id",
+        "files": "id",
+        "file_client_price": "file_id",
+        "file_client_batch": "file_id",
+        "file_microstock_status": "file_id",
+    }
+    REPLICA_INDEXES = [
+        "CREATE INDEX IF NOT EXISTS idx_files_date_value_id ON files (date_value, id)",
+        "CREATE INDEX IF NOT EXISTS idx_files_status_id ON files (status_id)",
+        "CREATE INDEX IF NOT EXISTS idx_files_root ON files (root)",
+        "CREATE INDEX IF NOT EXISTS idx_file_client_price_file_id ON file_client_price (file_id)",
+        "CREATE INDEX IF NOT EXISTS idx_file_client_batch_file_id ON file_client_batch (file_id)",
+        "CREATE INDEX IF NOT EXISTS idx_file_client_batch_batch_client ON file_client_batch (batch_number, client_id)",
+        "CREATE INDEX IF NOT EXISTS idx_file_microstock_status_file_id ON file_microstock_status (file_id)",
+        "CREATE INDEX IF NOT EXISTS idx_batch_list_client_id ON batch_list (client_id)",
+    ]
+    CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, psycopg2.pool.PoolError)
+    OFFLINE_RETRY_SECONDS = 30
+    FETCH_BATCH_SIZE = 5000
+    ID_CHUNK_SIZE = 500
+
+    def __init__(self, db_manager, config_manager):
         super().__init__()
         self.db_manager = db_manager
         self.config_manager = config_manager
-        self.cache_connection = None
-        self.memory_connection = None
-        self.cache_db_path = self._get_cache_path()
-        self._cache_signature = None
-
-        self._signature_timer = QTimer()
-        self._signature_timer.setInterval(5000)
-        self._signature_timer.timeout.connect(self._periodic_signature_check)
-        self._signature_timer.start()
-
-        # timing guard to avoid rapid repeated rebuilds
-        self._last_rebuild_time = 0.0
-        self._rebuild_cooldown = 5.0  # seconds
-
-        # lock used to serialize cache builds across processes
-        self.cache_lock_path = self.cache_db_path + ".lock"
-        # increase defaults to tolerate slow NAS / network storage
-        self._lock_stale_seconds = 120       # consider lock stale after 120s
-        self._lock_acquire_timeout = 60     # how long to wait to acquire lock (s)
-
-        # retry/backoff tuning for unstable I/O on network drives
-        self._backup_retry_attempts = 3
-        self._replace_retry_attempts = 6
-        self._io_retry_delay = 0.25
-    
+        self.enabled = bool(config_manager.get("system_caching.enable"))
+        self.slow_read_seconds = config_manager.get("system_caching.slow_read_ms") / 1000
+        self.cache_db_path = None
+        self._write_conn = None
+        self._read_conn = None
+        self._read_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending = {}
+        self._catch_up_requested = False
+        self._synced_tables = set()
+        self._offline_until = 0.0
+        self._last_sync_time = None
+
     def _get_cache_path(self):
-        """Get cache database path from db config."""
-        temp_dir = tempfile.gettempdir()
-        if self.config_manager:
-            cache_subpath = self.config_manager.get("system_caching.database_cache")
-            cache_dir = os.path.join(temp_dir, cache_subpath)
-        else:
-            cache_dir = os.path.join(temp_dir, "RakArsip", "database_cache")
+        """Get the replica database path from db config."""
+        cache_dir = os.path.join(tempfile.gettempdir(), self.config_manager.get("system_caching.database_cache"))
         os.makedirs(cache_dir, exist_ok=True)
-        return os.path.join(cache_dir, "cache_db.sqlite")
-    
-    def create_cache(self):
-        main_db = self.db_manager.db_path
-        if not os.path.exists(main_db):
-            print("[Cache] Main database not found")
-            return
+        return os.path.join(cache_dir, f"replica_{os.environ['DB_NAME']}.sqlite")
 
-        # process will create/remove tmp files at a time
-        acquired = self._acquire_build_lock(timeout=self._lock_acquire_timeout)
-        if not acquired:
-            # another process is building the cache — wait for it to finish and use its result
-            try:
-                self._wait_for_lock_release(timeout=self._lock_acquire_timeout)
-                if os.path.exists(self.cache_db_path):
-                    self._load_to_memory()
-                    return
-            except TimeoutError:
-                print("[Cache] Timeout waiting for existing cache build; attempting to proceed with build")
-
-        # use a unique tmp filename to avoid collisions with stale or concurrently-created files
-        tmp_path = f"{self.cache_db_path}.tmp.{os.getpid()}.{int(time.time() * 1000)}"
-
-        # ensure any stale standard tmp is removed (retry on Windows permission errors)
-        standard_tmp = self.cache_db_path + ".tmp"
-        if os.path.exists(standard_tmp):
-            for attempt in range(6):
-                try:
-                    os.remove(standard_tmp)
-                    break
-                except PermissionError:
-                    time.sleep(0.15)
-                except Exception:
-                    break
+    # ------------------------------------------------------------------ lifecycle
 
-        # perform backup + atomic replace with retries to tolerate transient I/O/lock errors
-        backup_ok = False
-        for b_attempt in range(self._backup_retry_attempts):
-            try:
-                src = sqlite3.connect(main_db)
-                dst = sqlite3.connect(tmp_path)
-                src.backup(dst)
-                dst.close()
-                src.close()
-                backup_ok = True
-                break
-            except Exception as be:
-                print(f"[Cache] Backup attempt {b_attempt+1} failed: {be}")
-                time.sleep(self._io_retry_delay * (2 ** b_attempt) + random.uniform(0, 0.05))
-
-        if not backup_ok:
-            print("[Cache] Backup failed after retries; aborting cache build")
+    def start(self):
+        """Open the replica (no-op when disabled); the listener requests the catch-up once it is up."""
+        if not self.enabled or self._write_conn is not None:
+            return
+        # Outside the try: a missing setting is a configuration error, not a cache failure
+        self.cache_db_path = self._get_cache_path()
+        try:
+            self._write_conn = sqlite3.connect(self.cache_db_path, isolation_level=None, check_same_thread=False)
+            self._write_conn.execute("PRAGMA journal_mode=WAL")
+            self._write_conn.execute("PRAGMA synchronous=NORMAL")
+            self._write_conn.execute(
+                "CREATE TABLE IF NOT EXISTS _replica_meta (table_name TEXT PRIMARY KEY, fingerprint TEXT, synced_at REAL)"
+            )
+            self._read_conn = sqlite3.connect(self.cache_db_path, isolation_level=None, check_same_thread=False)
+            self._read_conn.row_factory = sqlite3.Row
+            rows = self._write_conn.execute("SELECT table_name, synced_at FROM _replica_meta").fetchall()
+            self._synced_tables = {name for name, _ in rows}
+            if rows:
+                self._last_sync_time = max(synced_at or 0 for _, synced_at in rows)
+            print(f"[Cache] Read replica at {self.cache_db_path}")
+        except Exception as e:
+            print(f"[Cache] Could not open read replica: {e}")
+            self.close_cache(store_fingerprints=False)
+
+    def close_cache(self, store_fingerprints=True):
+        """Close the replica; record server fingerprints if it is fully in sync."""
+        if self._write_conn is None:
+            return
+        with self._pending_lock:
+            in_sync = not self._pending and not self._catch_up_requested
+        if store_fingerprints and in_sync and self.is_available():
             try:
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-            except Exception:
-                pass
+                with self._sync_lock:
+                    fingerprints = self._server_fingerprints()
+                    for table, fingerprint in fingerprints.items():
+                        self._store_meta(table, fingerprint)
+            except Exception as e:
+                print(f"[Cache] Could not record replica fingerprints: {e}")
+        for conn in (self._read_conn, self._write_conn):
             try:
-                self._release_build_lock()
+                conn.close()
             except Exception:
                 pass
+        self._read_conn = None
+        self._write_conn = None
+        print("[Cache] Read replica closed")
+
+    def is_available(self):
+        """True when every replicated table has been pulled at least once."""
+        return self._write_conn is not None and self._synced_tables >= set(self.REPLICA_TABLES)
+
+    def get_status(self):
+        return {
+            "enabled": self.enabled,
+            "available": self.is_available(),
+            "offline": self._serving_offline(),
+            "last_sync_time": self._last_sync_time,
+            "path": self.cache_db_path,
+        }
+
+    # ------------------------------------------------------------------ sync
+
+    def request_catch_up(self):
+        """Compare fingerprints with the server and re-pull what differs."""
+        if self._write_conn is None:
             return
+        with self._pending_lock:
+            self._catch_up_requested = True
+        self._schedule_sync()
 
-        # attempt atomic replace with retry (Windows may keep transient handles open)
-        replaced = False
-        for r_attempt in range(self._replace_retry_attempts):
-            try:
-                os.replace(tmp_path, self.cache_db_path)
-                replaced = True
-                break
-            except PermissionError as pe:
-                if r_attempt == self._replace_retry_attempts - 1:
+    def queue_change(self, table, ids):
+        """Queue a table_changed notification; ids None means re-pull the table."""
+        if self._write_conn is None or table not in self.REPLICA_TABLES:
+            return
+        with self._pending_lock:
+            if table in self._pending and self._pending[table] is None:
+                pass
+            elif ids is None or table not in self._synced_tables:
+                self._pending[table] = None
+            else:
+                self._pending.setdefault(table, set()).update(ids)
+        self._schedule_sync()
+
+    def _schedule_sync(self):
+        executor = self.db_manager.query_executor
+        if executor.is_pending("replica_sync"):
+            return
+        self.db_manager.submit_query(
+            "replica_sync", self._run_sync, on_result=self._on_sync_finished, on_error=self._on_sync_failed
+        )
+
+    def _on_sync_finished(self, _result):
+        with self._pending_lock:
+            more = bool(self._pending) or self._catch_up_requested
+        if more:
+            self._schedule_sync()
+
+    def _on_sync_failed(self, error):
+        print(f"[Cache] Replica sync failed: {error}")
+
+    def _run_sync(self):
+        # Runs on a query executor thread holding a read connection
+        with self._sync_lock:
+            if self._write_conn is None:
+                return
+            with self._pending_lock:
+                catch_up = self._catch_up_requested
+                self._catch_up_requested = False
+            if catch_up:
+                try:
+                    self._catch_up()
+                except Exception:
+                    with self._pending_lock:
+                        self._catch_up_requested = True
                     raise
-                time.sleep(self._io_retry_delay * (2 ** r_attempt) + random.uniform(0, 0.1))
-            except OSError as oe:
-                if r_attempt == self._replace_retry_attempts - 1:
+            while True:
+                with self._pending_lock:
+                    pending, self._pending = self._pending, {}
+                if not pending:
+                    break
+                try:
+                    for table, ids in pending.items():
+                        if ids is None:
+                            self._pull_table(table)
+                        elif ids:
+                            self._pull_ids(table, ids)
+                except Exception:
+                    # Put the work back for the next notification or reconnect
+                    with self._pending_lock:
+                        for table in pending:
+                            self._pending[table] = None
                     raise
-                time.sleep(self._io_retry_delay * (2 ** r_attempt) + random.uniform(0, 0.1))
-
-        if not replaced:
-            print("[Cache] Could not replace cache file after retries")
-            try:
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-            except Exception:
-                pass
+            self._last_sync_time = time.time()
+
+    def _catch_up(self):
+        fingerprints = self._server_fingerprints()
+        stored = dict(self._write_conn.execute("SELECT table_name, fingerprint FROM _replica_meta").fetchall())
+        stale = [table for table in self.REPLICA_TABLES if stored.get(table) != fingerprints.get(table)]
+        for table in stale:
+            self._pull_table(table, fingerprints.get(table))
+        if stale:
+            print(f"[Cache] Replica caught up: {', '.join(stale)}")
+
+    def _server_fingerprints(self):
+        self.db_manager.connect(write=False)
+        try:
+            cursor = self.db_manager.connection.cursor()
+            fingerprints = {}
+            for table in self.REPLICA_TABLES:
+                cursor.execute(
+                    f"SELECT count(*), COALESCE(sum(hashtext(t::text)::bigint), 0) FROM {table} t"
+                )
+                count, checksum = cursor.fetchone()
+                fingerprints[table] = f"{count}:{checksum}"
+            self.db_manager.connection.rollback()
+            return fingerprints
+        finally:
+            self.db_manager.close()
+
+    def _pull_table(self, table, fingerprint=None):
+        """Copy a whole table into a staging table, then swap it in."""
+        self.db_manager.connect(write=False)
+        try:
+            cursor = self.db_manager.connection.cursor(name=f"replica_pull_{table}")
+            cursor.itersize = self.FETCH_BATCH_SIZE
+            cursor.execute(f"SELECT * FROM {table}")
+            rows = cursor.fetchmany(self.FETCH_BATCH_SIZE)
+            columns = [d[0] for d in cursor.description]
+            staging = f"{table}__sync"
+            conn = self._write_conn
+            conn.execute(f'DROP TABLE IF EXISTS "{staging}"')
+            conn.execute(f'CREATE TABLE "{staging}" ({", ".join(self._quote(c) for c in columns)})')
+            insert_sql = self._insert_sql(staging, columns)
+            conn.execute("BEGIN")
             try:
-                self._release_build_lock()
+                while rows:
+                    conn.executemany(insert_sql, [self._convert_row(row) for row in rows])
+                    rows = cursor.fetchmany(self.FETCH_BATCH_SIZE)
+                conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+                conn.execute(f'ALTER TABLE "{staging}" RENAME TO "{table}"')
+                for statement in self.REPLICA_INDEXES:
+                    if f" ON {table} (" in statement:
+                        conn.execute(statement)
+                conn.execute(
+                    "INSERT OR REPLACE INTO _replica_meta (table_name, fingerprint, synced_at) VALUES (?, ?, ?)",
+                    (table, fingerprint, time.time()),
+                )
+                conn.execute("COMMIT")
             except Exception:
-                pass
-            return
-
-        # remove WAL/SHM side-files if present
-        for ext in ["-wal", "-shm"]:
-            cache_file = self.cache_db_path + ext
-            if os.path.exists(cache_file):
-                try:
-                    os.remove(cache_file)
-                except Exception as e:
-                    print(f"[Cache] Error removing auxiliary cache file {cache_file}: {e}")
-
-        print(f"[Cache] Created at {self.cache_db_path}")
-        self._last_rebuild_time = time.time()
-
-        # load and compute signature (signature computation is best-effort)
+                conn.execute("ROLLBACK")
+                raise
+            cursor.close()
+            self.db_manager.connection.rollback()
+        finally:
+            self.db_manager.close()
+        self._synced_tables.add(table)
+
+    def _pull_ids(self, table, ids):
+        """Replace the replica rows whose key column is in ids."""
+        key = self.REPLICA_TABLES[table]
+        ids = sorted(ids)
+        self.db_manager.connect(write=False)
         try:
-            self._load_to_memory()
-        except Exception as e:
-            print(f"[Cache] Error loading cache to memory after replace: {e}")
-
+            cursor = self.db_manager.connection.cursor()
+            cursor.execute(f"SELECT * FROM {table} WHERE {key} = ANY(%s)", (ids,))
+            rows = cursor.fetchall()
+            columns = [d[0] for d in cursor.description]
+            self.db_manager.connection.rollback()
+        finally:
+            self.db_manager.close()
+        conn = self._write_conn
+        conn.execute("BEGIN")
         try:
-            self._cache_signature = self.db_manager.connection_helper._compute_db_signature()
-        except Exception as e:
-            print(f"[Cache] Warning: cannot compute cache signature after build: {e}")
-
-        # cleanup: attempt to remove any leftover tmp files (retry for Windows)
+            for start in range(0, len(ids), self.ID_CHUNK_SIZE):
+                chunk = ids[start:start + self.ID_CHUNK_SIZE]
+                conn.execute(
+                    f'DELETE FROM "{table}" WHERE {self._quote(key)} IN ({", ".join("?" * len(chunk))})', chunk
+                )
+            if rows:
+                conn.executemany(self._insert_sql(table, columns), [self._convert_row(row) for row in rows])
+            # The stored fingerprint no longer describes the table
+            conn.execute("UPDATE _replica_meta SET fingerprint = NULL WHERE table_name = ?", (table,))
+            conn.execute("COMMIT")
+        except sqlite3.OperationalError:
+            # Column set changed on the server (migration): take the whole table
+            conn.execute("ROLLBACK")
+            self._pull_table(table)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _store_meta(self, table, fingerprint):
+        self._write_conn.execute(
+            "UPDATE _replica_meta SET fingerprint = ? WHERE table_name = ?", (fingerprint, table)
+        )
+
+    def _quote(self, name):
+        return '"' + name.replace('"', '""') + '"'
+
+    def _insert_sql(self, table, columns):
+        return (
+            f'INSERT INTO "{table}" ({", ".join(self._quote(c) for c in columns)}) '
+            f'VALUES ({", ".join("?" * len(columns))})'
+        )
+
+    def _convert_row(self, row):
+        return [self._convert_value(value) for value in row]
+
+    def _convert_value(self, value):
+        if isinstance(value, (datetime, date, datetime_time)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str)
+        if isinstance(value, memoryview):
+            return bytes(value)
+        return value
+
+    # ------------------------------------------------------------------ reads
+
+    def _serving_offline(self):
+        return time.monotonic() < self._offline_until and self.is_available()
+
+    def _go_offline(self, error):
+        self._offline_until = time.monotonic() + self.OFFLINE_RETRY_SECONDS
+        synced = time.strftime("%H:%M", time.localtime(self._last_sync_time)) if self._last_sync_time else "-"
+        print(f"[Cache] Database unreachable ({str(error).strip()}), serving local replica")
         try:
-            if os.path.exists(tmp_path):
-                for rm_attempt in range(6):
-                    try:
-                        os.remove(tmp_path)
-                        break
-                    except PermissionError:
-                        time.sleep(0.15)
-                    except Exception:
-                        break
+            self.db_manager.status_message.emit(f"Database unreachable - showing local copy (synced {synced})", 5000)
         except Exception:
             pass
 
-        # release lock so other processes can use the newly created cache
-        try:
-            self._release_build_lock()
-        except Exception as e:
-            print(f"[Cache] Error releasing build lock in finally: {e}")
-
-    def _acquire_build_lock(self, timeout=None, stale_seconds=None):
-        timeout = self._lock_acquire_timeout if timeout is None else timeout
-        stale_seconds = self._lock_stale_seconds if stale_seconds is None else stale_seconds
-        start = time.time()
-        attempt = 0
-        while True:
-            try:
-                fd = os.open(self.cache_lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-                with os.fdopen(fd, "w") as f:
-                    f.write(f"{os.getpid()}:{time.time()}")
-                return True
-            except FileExistsError:
-                try:
-                    mtime = os.path.getmtime(self.cache_lock_path)
-                    if time.time() - mtime > stale_seconds:
-                        # lock is stale — attempt to remove it and retry immediately
-                        try:
-                            os.remove(self.cache_lock_path)
-                            print("[Cache] Removed stale build lock")
-                            continue
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-
-                if time.time() - start > timeout:
-                    return False
-                attempt += 1
-                sleep_time = min(0.25 * (2 ** attempt), 1.5) + random.uniform(0, 0.1)
-                time.sleep(sleep_time)
-
-    def _release_build_lock(self):
-        try:
-            if os.path.exists(self.cache_lock_path):
-                os.remove(self.cache_lock_path)
-        except Exception as e:
-            print(f"[Cache] Error releasing build lock: {e}")
-
-    def _wait_for_lock_release(self, timeout=20):
-        start = time.time()
-        while os.path.exists(self.cache_lock_path):
-            if time.time() - start > timeout:
-                raise TimeoutError("Timeout waiting for cache build lock release")
-            time.sleep(0.1)
-    
-    def _load_to_memory(self):
+    def _go_slow(self, elapsed):
+        self._offline_until = time.monotonic() + self.OFFLINE_RETRY_SECONDS
+        synced = time.strftime("%H:%M", time.localtime(self._last_sync_time)) if self._last_sync_time else "-"
+        print(f"[Cache] Database read took {elapsed * 1000:.0f}ms, serving local replica")
         try:
-            old_mem = self.memory_connection
-            if old_mem:
-                try:
-                    old_mem.close()
-                except Exception as e:
-                    print(f"[Cache] Error closing old memory cache: {e}")
-
-            self.memory_connection = sqlite3.connect(':memory:')
-            self.memory_connection.row_factory = sqlite3.Row
-
-            disk_conn = sqlite3.connect(self.cache_db_path)
-            disk_conn.backup(self.memory_connection)
-            disk_conn.close()
-
-            print("[Cache] Loaded to memory")
-
-            try:
-                if getattr(self.db_manager, 'connection', None) is old_mem:
-                    self.db_manager.connection = self.memory_connection
-            except Exception as e:
-                print(f"[Cache] Error updating db_manager.connection to new memory cache: {e}")
-
-            self._cache_signature = self.db_manager.connection_helper._compute_db_signature()
-        except Exception as e:
-            print(f"[Cache] Error loading to memory: {e}")
-    
-    def update_cache(self):
-        self.create_cache()
-
-    def _periodic_signature_check(self):
-        if not os.path.exists(self.db_manager.db_path):
-            return
+            self.db_manager.status_message.emit(f"Database is slow - showing local copy (synced {synced})", 5000)
+        except Exception:
+            pass
 
+    def read(self, name, primary, *args):
+        """Run primary(*args); answer from the replica when the server is unreachable or slow."""
+        if not self.is_available():
+            return primary(*args)
+        if self._serving_offline():
+            return getattr(self, f"_replica_{name}")(*args)
+        connection_helper = self.db_manager.connection_helper
+        depth = connection_helper.current_depth()
+        started = time.monotonic()
         try:
-            current_sig = self.db_manager.connection_helper._compute_db_signature()
-        except Exception as e:
-            print(f"[Cache] Error computing DB signature during periodic check: {e}")
-            return
-
-        if self._cache_signature is None:
-            if not os.path.exists(self.cache_db_path) or self.memory_connection is None:
-                self.create_cache()
-            return
-
-        if current_sig != self._cache_signature:
-            # avoid rebuild storms: skip if we rebuilt very recently
-            if time.time() - self._last_rebuild_time < self._rebuild_cooldown:
-                return
-
-            print("[Cache] Periodic check detected DB change — rebuilding cache")
-            self.create_cache()
-            try:
-                self.db_manager.data_changed.emit()
-            except Exception as e:
-                print(f"[Cache] Error emitting data_changed after periodic rebuild: {e}")
-    
-    def get_cache_connection(self):
-        # if another process is building the cache, wait a short while for it to finish
-        if os.path.exists(self.cache_lock_path):
-            try:
-                self._wait_for_lock_release(timeout=self._lock_acquire_timeout)
-            except TimeoutError:
-                print("[Cache] Timeout waiting for concurrent cache build; continuing")
-
-        if os.path.exists(self.db_manager.db_path):
-            try:
-                current_sig = self.db_manager.connection_helper._compute_db_signature()
-            except Exception as e:
-                print(f"[Cache] Error computing main DB signature: {e}")
-                current_sig = None
-        else:
-            current_sig = None
-
-        if self.memory_connection:
-            if current_sig and self._cache_signature and current_sig != self._cache_signature:
-                print("[Cache] Detected main DB changed since cache build — rebuilding cache")
-                self.create_cache()
+            result = primary(*args)
+        except self.CONNECTION_ERRORS as e:
+            connection_helper.unwind(depth)
+            self._go_offline(e)
+            return getattr(self, f"_replica_{name}")(*args)
+        elapsed = time.monotonic() - started
+        if elapsed >= self.slow_read_seconds:
+            # This answer is already here; the reads that follow use the replica
+            self._go_slow(elapsed)
+        return result
+
+    def _query(self, sql, params=()):
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    def _file_filters(self, search_query, status_value, client_id, batch_number, root_value,
+                      category_value, subcategory_value, microstock_platform_id):
+        where_clauses, join_clauses, params = [], [], []
+        if search_query:
+            pattern = f"%{search_query}%"
+            where_clauses.append(
+                "(f.name LIKE ? OR f.path LIKE ?"
+                " OR f.category_id IN (SELECT id FROM categories WHERE name LIKE ?)"
+                " OR f.subcategory_id IN (SELECT id FROM subcategories WHERE name LIKE ?))"
+            )
+            params.extend([pattern] * 4)
+        if status_value:
+            where_clauses.append("s.name = ?")
+            params.append(status_value)
+        if batch_number and client_id:
+            join_clauses.append("JOIN file_client_batch fcb ON fcb.file_id = f.id")
+            where_clauses.append("fcb.batch_number = ? AND fcb.client_id = ?")
+            params.extend([batch_number, client_id])
+        if root_value:
+            where_clauses.append("f.root = ?")
+            params.append(root_value)
+        if category_value:
+            where_clauses.append("c.name = ?")
+            params.append(category_value)
+        if subcategory_value:
+            where_clauses.append("sc.name = ?")
+            params.append(subcategory_value)
+        if microstock_platform_id:
+            join_clauses.append("JOIN file_microstock_status fms ON fms.file_id = f.id")
+            where_clauses.append("fms.platform_id = ?")
+            params.append(microstock_platform_id)
+        where_sql = ("WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
+        return " ".join(join_clauses), where_sql, params
+
+    def _replica_files_page(self, page=1, page_size=20, search_query=None, sort_field="date", sort_order="desc",
+                            status_value=None, client_id=None, batch_number=None, root_value=None,
+                            category_value=None, subcategory_value=None, microstock_platform_id=None, seek=None):
+        # Keyset cursors are a server-side optimization; the replica reads by page
+        join_sql, where_sql, params = self._file_filters(
+            search_query, status_value, client_id, batch_number, root_value,
+            category_value, subcategory_value, microstock_platform_id
+        )
+        sort_map = {
+            "date": "f.date_value",
+            "name": "f.name",
+            "root": "f.root",
+            "path": "f.path",
+            "status": "s.name",
+            "category": "c.name",
+            "subcategory": "sc.name",
+            "batch_number": "fcb.batch_number",
+            "microstock": "fms_sort.status_name",
+        }
+        sort_sql = sort_map.get(sort_field, "f.date_value")
+        order_sql = "DESC" if sort_order == "desc" else "ASC"
+        if sort_sql == "f.date_value":
+            nulls_sql = "NULLS FIRST" if order_sql == "ASC" else "NULLS LAST"
         else:
-            if os.path.exists(self.cache_db_path):
-                self._load_to_memory()
-            else:
-                self.create_cache()
-
-        return self.memory_connection
-    
-    def close_cache(self):
-        if self.memory_connection:
-            self.memory_connection.close()
-            self.memory_connection = None
-            print("[Cache] Memory cache closed")
-
-        if self.cache_connection:
-            self.cache_connection.close()
-            self.cache_connection = None
-
-        if hasattr(self, '_signature_timer') and self._signature_timer.isActive():
-            try:
-                self._signature_timer.stop()
-            except Exception as e:
-                print(f"[Cache] Error stopping signature timer: {e}")
-
-        self._cache_signature = None
+            nulls_sql = "NULLS FIRST" if order_sql == "DESC" else "NULLS LAST"
+        order_by_sql = f"{sort_sql} {order_sql} {nulls_sql}, f.id {order_sql}"
+        order_params = []
+        if sort_field == "relevance" and search_query:
+            order_by_sql = (
+                "CASE WHEN lower(f.name) = lower(?) THEN 4 WHEN f.name LIKE ? THEN 3"
+                " WHEN f.name LIKE ? THEN 2 WHEN f.path LIKE ? THEN 1 ELSE 0 END DESC,"
+                " f.date_value DESC NULLS LAST, f.id DESC"
+            )
+            order_params = [search_query, f"{search_query}%", f"%{search_query}%", f"%{search_query}%"]
+        microstock_sort_join = ""
+        if sort_field == "microstock" and microstock_platform_id:
+            microstock_sort_join = (
+                "LEFT JOIN (SELECT fms2.file_id, s2.name AS status_name FROM file_microstock_status fms2"
+                " LEFT JOIN statuses s2 ON s2.id = fms2.status_id"
+                f" WHERE fms2.platform_id = {int(microstock_platform_id)}) fms_sort ON fms_sort.file_id = f.id"
+            )
+        rows = self._query(f"""
+            SELECT
+                f.id, f.date, f.name, f.root, f.path, f.status_id, f.category_id, f.subcategory_id, f.template_id,
+                s.name AS status, s.color AS status_color,
+                c.name AS category, sc.name AS subcategory,
+                t.name AS template,
+                f.date_value,
+                {sort_sql} AS sort_key
+            FROM files f
+            LEFT JOIN statuses s ON f.status_id = s.id
+            LEFT JOIN categories c ON f.category_id = c.id
+            LEFT JOIN subcategories sc ON f.subcategory_id = sc.id
+            LEFT JOIN templates t ON f.template_id = t.id
+            {join_sql}
+            {microstock_sort_join}
+            {where_sql}
+            ORDER BY {order_by_sql}
+            LIMIT ? OFFSET ?
+        """, params + order_params + [page_size, (page - 1) * page_size])
+        return [dict(row) for row in rows]
+
+    def _replica_files_page_with_count(self, page=1, page_size=20, search_query=None, sort_field="date",
+                                       sort_order="desc", status_value=None, client_id=None, batch_number=None,
+                                       root_value=None, category_value=None, subcategory_value=None,
+                                       microstock_platform_id=None):
+        rows = self._replica_files_page(
+            page, page_size, search_query, sort_field, sort_order, status_value, client_id, batch_number,
+            root_value, category_value, subcategory_value, microstock_platform_id
+        )
+        total = self._replica_count_files(
+            search_query, status_value, client_id, batch_number, root_value,
+            category_value, subcategory_value, microstock_platform_id
+        )
+        return rows, total
+
+    def _replica_count_files(self, search_query=None, status_value=None, client_id=None, batch_number=None,
+                             root_value=None, category_value=None, subcategory_value=None,
+                             microstock_platform_id=None):
+        join_sql, where_sql, params = self._file_filters(
+            search_query, status_value, client_id, batch_number, root_value,
+            category_value, subcategory_value, microstock_platform_id
+        )
+        return self._query(f"""
+            SELECT COUNT(*) FROM files f
+            LEFT JOIN statuses s ON f.status_id = s.id
+            LEFT JOIN categories c ON f.category_id = c.id
+            LEFT JOIN subcategories sc ON f.subcategory_id = sc.id
+            {join_sql}
+            {where_sql}
+        """, params)[0][0]
+
+    def _replica_file_totals(self):
+        by_status = {}
+        total = 0
+        for name, count in self._query(
+            "SELECT s.name, COUNT(*) FROM files f LEFT JOIN statuses s ON s.id = f.status_id"
+            " WHERE f.status_id IS NOT NULL GROUP BY f.status_id"
+        ):
+            total += count
+            if name is not None:
+                by_status[name] = count
+        return {"total": total, "by_status": by_status}
+
+    def _replica_files_page_details(self, file_ids):
+        # Prices and earnings are not replicated; tooltips show client and batch only
+        if not file_ids:
+            return {}
+        file_ids = list(file_ids)
+        rows = self._query(f"""
+            SELECT f.id AS file_id,
+                   (SELECT c.client_name FROM file_client_price fcp JOIN client c ON c.id = fcp.client_id
+                    WHERE fcp.file_id = f.id LIMIT 1) AS client_name,
+                   (SELECT fcp.client_id FROM file_client_price fcp WHERE fcp.file_id = f.id LIMIT 1) AS client_id,
+                   (SELECT fcb.batch_number FROM file_client_batch fcb WHERE fcb.file_id = f.id
+                    ORDER BY fcb.id DESC LIMIT 1) AS batch_number
+            FROM files f WHERE f.id IN ({", ".join("?" * len(file_ids))})
+        """, file_ids)
+        return {
+            row["file_id"]: {
+                "price": "", "currency": "IDR", "note": "", "earnings": [],
+                "client_id": row["client_id"],
+                "client_name": row["client_name"] or "",
+                "batch_number": row["batch_number"] or "",
+            }
+            for row in rows
+        }
+
+    def _replica_status_id(self, status_name):
+        rows = self._query("SELECT id FROM statuses WHERE name = ?", (status_name,))
+        return rows[0][0] if rows else None
+
+    def _replica_all_categories(self):
+        return [row[0] for row in self._query("SELECT DISTINCT name FROM categories ORDER BY name")]
+
+    def _replica_subcategories_by_category(self, category_name):
+        return [row[0] for row in self._query(
+            "SELECT DISTINCT sc.name FROM subcategories sc JOIN categories c ON sc.category_id = c.id"
+            " WHERE c.name = ? ORDER BY sc.name", (category_name,)
+        )]
+
+    def _replica_all_clients_simple(self):
+        return [
+            {"id": row[0], "client_name": row[1]}
+            for row in self._query("SELECT id, client_name FROM client ORDER BY client_name ASC")
+        ]
+
+    def _replica_all_roots(self):
+        return [row[0] for row in self._query("SELECT DISTINCT root FROM files ORDER BY root ASC") if row[0]]
+
+    def _replica_batch_numbers_by_client(self, client_id):
+        return [
+            (row[0], row[1], datetime.fromisoformat(row[2]) if row[2] else None)
+            for row in self._query(
+                "SELECT batch_number, note, created_at FROM batch_list WHERE client_id = ? ORDER BY batch_number ASC",
+                (client_id,),
+            )
+        ]
@@ -5,6 +5,7 @@ class DatabaseFilesHelper:
     
     def __init__(self, db_manager):
         self.db_manager = db_manager
+        self._search_mode = None
 
     def initialize_statuses(self):
         """Initialize default status values."""
@@ -124,11 +125,94 @@ class DatabaseFilesHelper:
         self.db_manager.connection.commit()
         self.db_manager.close()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("file_microstock_status")
+
+    def get_search_mode(self):
+        """Return "trigram" when pg_trgm is installed, otherwise "basic" (plain ILIKE scans)."""
+        if self._search_mode is None:
+            self.db_manager.connect(write=False)
+            try:
+                cursor = self.db_manager.connection.cursor()
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                self._search_mode = "trigram" if cursor.fetchone() else "basic"
+            finally:
+                self.db_manager.close()
+            print(f"[DB] File search mode: {self._search_mode}")
+        return self._search_mode
+
+    def _build_search_filter(self, search_query):
+        """Build the search box predicate on files.
+
+        Category and subcategory names are resolved to id arrays first so every
+        branch of the OR filters files directly; with pg_trgm the name/path
+        branches are served by the trigram GIN indexes and combined with a
+        BitmapOr instead of scanning the joined rows.
+        """
+        search_pattern = f"%{search_query}%"
+        sql = (
+            "(f.name ILIKE %s OR f.path ILIKE %s"
+            " OR f.category_id = ANY(ARRAY(SELECT id FROM categories WHERE name ILIKE %s))"
+            " OR f.subcategory_id = ANY(ARRAY(SELECT id FROM subcategories WHERE name ILIKE %s)))"
+        )
+        return sql, [search_pattern] * 4
+
+    def _build_search_rank(self, search_query):
+        """Build the relevance expression for a search (higher is better)."""
+        if self.get_search_mode() == "trigram":
+            sql = (
+                "GREATEST(similarity(f.name, %s) + word_similarity(%s, f.name),"
+                " 0.5 * word_similarity(%s, f.path))"
+            )
+            return sql, [search_query] * 3
+        sql = (
+            "CASE"
+            " WHEN lower(f.name) = lower(%s) THEN 4"
+            " WHEN f.name ILIKE %s THEN 3"
+            " WHEN f.name ILIKE %s THEN 2"
+            " WHEN f.path ILIKE %s THEN 1"
+            " ELSE 0 END"
+        )
+        return sql, [search_query, f"{search_query}%", f"%{search_query}%", f"%{search_query}%"]
 
     def get_files_page(self, page=1, page_size=20, search_query=None, sort_field="date", sort_order="desc", 
                        status_value=None, client_id=None, batch_number=None, root_value=None, 
-                       category_value=None, subcategory_value=None, microstock_platform_id=None):
-        """Get paginated files with filtering and sorting."""
+                       category_value=None, subcategory_value=None, microstock_platform_id=None, seek=None):
+        """Get paginated files with filtering and sorting.
+
+        seek: optional ("next" | "prev", sort_key, id) taken from the last / first
+        row of the current page. The adjacent page is then fetched by keyset
+        instead of OFFSET, so sequential paging costs the same at any depth.
+        page is ignored in that case.
+        """
+        rows, _ = self._select_files_page(
+            False, page, page_size, search_query, sort_field, sort_order, status_value, client_id,
+            batch_number, root_value, category_value, subcategory_value, microstock_platform_id, seek
+        )
+        return rows
+
+    def get_files_page_with_count(self, page=1, page_size=20, search_query=None, sort_field="date", sort_order="desc",
+                                  status_value=None, client_id=None, batch_number=None, root_value=None,
+                                  category_value=None, subcategory_value=None, microstock_platform_id=None):
+        """Get a page of files and the filtered total in one query.
+
+        Returns (rows, total). The total comes from COUNT(*) OVER() on the page
+        query; only a page past the end (no rows to carry it) costs an extra count.
+        """
+        rows, total = self._select_files_page(
+            True, page, page_size, search_query, sort_field, sort_order, status_value, client_id,
+            batch_number, root_value, category_value, subcategory_value, microstock_platform_id
+        )
+        if total is None:
+            total = self.count_files(
+                search_query=search_query, status_value=status_value, client_id=client_id,
+                batch_number=batch_number, root_value=root_value, category_value=category_value,
+                subcategory_value=subcategory_value, microstock_platform_id=microstock_platform_id
+            )
+        return rows, total
+
+    def _select_files_page(self, with_count, page, page_size, search_query, sort_field, sort_order,
+                           status_value, client_id, batch_number, root_value,
+                           category_value, subcategory_value, microstock_platform_id, seek=None):
         self.db_manager.connect(write=False)
         cursor = self.db_manager.connection.cursor()
         offset = (page - 1) * page_size
@@ -137,11 +221,9 @@ class DatabaseFilesHelper:
         join_clauses = []
         
         if search_query:
-            search_pattern = f"%{search_query}%"
-            where_clauses.append(
-                "(f.name ILIKE %s OR f.path ILIKE %s OR c.name ILIKE %s OR sc.name ILIKE %s)"
-            )
-            params.extend([search_pattern] * 4)
+            search_sql, search_params = self._build_search_filter(search_query)
+            where_clauses.append(search_sql)
+            params.extend(search_params)
         
         if status_value:
             where_clauses.append("s.name = %s")
@@ -171,16 +253,12 @@ class DatabaseFilesHelper:
             where_clauses.append("fms.platform_id = %s")
             params.append(microstock_platform_id)
 
-        where_sql = ""
-        if where_clauses:
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-        
         join_sql = ""
         if join_clauses:
             join_sql = " ".join(join_clauses)
         
         sort_map = {
-            "date": "parsed_date",
+            "date": "f.date_value",
             "name": "f.name",
             "root": "f.root",
             "path": "f.path",
@@ -190,8 +268,35 @@ class DatabaseFilesHelper:
             "batch_number": "fcb.batch_number",
             "microstock": "fms_sort.status_name",
         }
-        sort_sql = sort_map.get(sort_field, "parsed_date")
+        sort_sql = sort_map.get(sort_field, "f.date_value")
         order_sql = "DESC" if sort_order == "desc" else "ASC"
+        # Unparseable dates are NULL and rank lowest, matching idx_files_date_value_id;
+        # other columns keep PostgreSQL's default where NULL ranks highest
+        if sort_sql == "f.date_value":
+            nulls_first = order_sql == "ASC"
+        else:
+            nulls_first = order_sql == "DESC"
+
+        is_relevance = sort_field == "relevance" and bool(search_query)
+        seek_phases = None
+        reverse_rows = False
+        if seek and not is_relevance:
+            direction, seek_value, seek_id = seek
+            if direction == "prev":
+                # Walk backwards from the first row of the current page, then flip the rows
+                order_sql = "ASC" if order_sql == "DESC" else "DESC"
+                nulls_first = not nulls_first
+                reverse_rows = True
+            seek_phases = self._build_seek_phases(sort_sql, order_sql, nulls_first, seek_value, seek_id)
+            with_count = False
+
+        nulls_sql = " NULLS FIRST" if nulls_first else " NULLS LAST"
+        order_by_sql = f"{sort_sql} {order_sql}{nulls_sql}, f.id {order_sql}"
+        order_params = []
+        # Relevance only means something while searching; best matches first, newest on ties
+        if is_relevance:
+            rank_sql, order_params = self._build_search_rank(search_query)
+            order_by_sql = f"{rank_sql} DESC, f.date_value DESC NULLS LAST, f.id DESC"
 
         # For microstock sort, add a left join to get status name for the chosen platform
         microstock_sort_join = ""
@@ -205,76 +310,46 @@ class DatabaseFilesHelper:
                 f") fms_sort ON fms_sort.file_id = f.id"
             )
         
-        sql = f"""
-            SELECT
-                f.id, f.date, f.name, f.root, f.path, f.status_id, f.category_id, f.subcategory_id, f.template_id,
-                s.name as status, s.color as status_color, 
-                c.name as category, sc.name as subcategory,
-                t.name as template,
-                CASE 
-                    WHEN position(chr(92) in f.date) > 0 THEN 
-                        CASE
-                            WHEN length(split_part(f.date, chr(92), 1)) = 4 THEN
-                                (
-                                    split_part(f.date, chr(92), 1) || '-' ||
-                                    (
-                                        CASE lower(split_part(f.date, chr(92), 2))
-                                            WHEN 'januari' THEN '01' WHEN 'january' THEN '01'
-                                            WHEN 'februari' THEN '02' WHEN 'february' THEN '02'
-                                            WHEN 'maret' THEN '03' WHEN 'march' THEN '03'
-                                            WHEN 'april' THEN '04'
-                                            WHEN 'mei' THEN '05' WHEN 'may' THEN '05'
-                                            WHEN 'juni' THEN '06' WHEN 'june' THEN '06'
-                                            WHEN 'juli' THEN '07' WHEN 'july' THEN '07'
-                                            WHEN 'agustus' THEN '08' WHEN 'august' THEN '08'
-                                            WHEN 'september' THEN '09'
-                                            WHEN 'oktober' THEN '10' WHEN 'october' THEN '10'
-                                            WHEN 'november' THEN '11'
-                                            WHEN 'desember' THEN '12' WHEN 'december' THEN '12'
-                                            ELSE '01'
-                                        END
-                                    ) || '-' ||
-                                    lpad(split_part(f.date, chr(92), 3), 2, '0')
-                                )
-                            ELSE
-                                (
-                                    split_part(f.date, chr(92), 3) || '-' ||
-                                    (
-                                        CASE lower(split_part(f.date, chr(92), 2))
-                                            WHEN 'januari' THEN '01' WHEN 'january' THEN '01'
-                                            WHEN 'februari' THEN '02' WHEN 'february' THEN '02'
-                                            WHEN 'maret' THEN '03' WHEN 'march' THEN '03'
-                                            WHEN 'april' THEN '04'
-                                            WHEN 'mei' THEN '05' WHEN 'may' THEN '05'
-                                            WHEN 'juni' THEN '06' WHEN 'june' THEN '06'
-                                            WHEN 'juli' THEN '07' WHEN 'july' THEN '07'
-                                            WHEN 'agustus' THEN '08' WHEN 'august' THEN '08'
-                                            WHEN 'september' THEN '09'
-                                            WHEN 'oktober' THEN '10' WHEN 'october' THEN '10'
-                                            WHEN 'november' THEN '11'
-                                            WHEN 'desember' THEN '12' WHEN 'december' THEN '12'
-                                            ELSE '01'
-                                        END
-                                    ) || '-' ||
-                                    lpad(split_part(f.date, chr(92), 1), 2, '0')
-                                )
-                        END
-                    ELSE f.date
-                END AS parsed_date
-            FROM files f
-            LEFT JOIN statuses s ON f.status_id = s.id
-            LEFT JOIN categories c ON f.category_id = c.id
-            LEFT JOIN subcategories sc ON f.subcategory_id = sc.id
-            LEFT JOIN templates t ON f.template_id = t.id
-            {join_sql}
-            {microstock_sort_join}
-            {where_sql}
-            ORDER BY {sort_sql} {order_sql}, f.id DESC
-            LIMIT %s OFFSET %s
-        """
-        params.extend([page_size, offset])
-        cursor.execute(sql, params)
-        rows = cursor.fetchall()
+        count_sql = ",\n                COUNT(*) OVER() AS total_count" if with_count else ""
+
+        def select_rows(extra_where, extra_params, limit, offset):
+            clauses = where_clauses + ([extra_where] if extra_where else [])
+            where_sql = ""
+            if clauses:
+                where_sql = "WHERE " + " AND ".join(clauses)
+            sql = f"""
+                SELECT
+                    f.id, f.date, f.name, f.root, f.path, f.status_id, f.category_id, f.subcategory_id, f.template_id,
+                    s.name as status, s.color as status_color, 
+                    c.name as category, sc.name as subcategory,
+                    t.name as template,
+                    f.date_value,
+                    {sort_sql} AS sort_key{count_sql}
+                FROM files f
+                LEFT JOIN statuses s ON f.status_id = s.id
+                LEFT JOIN categories c ON f.category_id = c.id
+                LEFT JOIN subcategories sc ON f.subcategory_id = sc.id
+                LEFT JOIN templates t ON f.template_id = t.id
+                {join_sql}
+                {microstock_sort_join}
+                {where_sql}
+                ORDER BY {order_by_sql}
+                LIMIT %s OFFSET %s
+            """
+            cursor.execute(sql, params + extra_params + order_params + [limit, offset])
+            return cursor.fetchall()
+
+        if seek_phases is None:
+            rows = select_rows(None, [], page_size, offset)
+        else:
+            rows = []
+            for seek_sql, seek_params in seek_phases:
+                if len(rows) >= page_size:
+                    break
+                rows.extend(select_rows(seek_sql, seek_params, page_size - len(rows), 0))
+            if reverse_rows:
+                rows.reverse()
+
         result = []
         for row in rows:
             result.append({
@@ -291,10 +366,32 @@ class DatabaseFilesHelper:
                 "status_color": row["status_color"],
                 "category": row["category"],
                 "subcategory": row["subcategory"],
-                "template": row["template"]
+                "template": row["template"],
+                "date_value": row["date_value"],
+                "sort_key": row["sort_key"]
             })
+        total = rows[0]["total_count"] if with_count and rows else None
         self.db_manager.close()
-        return result
+        return result, total
+
+    def _build_seek_phases(self, sort_sql, order_sql, nulls_first, seek_value, seek_id):
+        """Build keyset predicates for the rows that follow (seek_value, seek_id).
+
+        Those rows form at most two runs in sort order: the rest of the cursor's
+        own NULL / non-NULL block, then the other block. Each run gets its own
+        predicate (a row comparison for non-NULL keys) so the page can be read
+        straight off an index instead of skipping OFFSET rows.
+        """
+        cmp_sql = "<" if order_sql == "DESC" else ">"
+        if seek_value is None:
+            phases = [(f"{sort_sql} IS NULL AND f.id {cmp_sql} %s", [seek_id])]
+            if nulls_first:
+                phases.append((f"{sort_sql} IS NOT NULL", []))
+        else:
+            phases = [(f"({sort_sql}, f.id) {cmp_sql} (%s, %s)", [seek_value, seek_id])]
+            if not nulls_first:
+                phases.append((f"{sort_sql} IS NULL", []))
+        return phases
 
     def count_files(self, search_query=None, status_value=None, client_id=None, batch_number=None, 
                     root_value=None, category_value=None, subcategory_value=None, microstock_platform_id=None):
@@ -306,11 +403,9 @@ class DatabaseFilesHelper:
         join_clauses = []
         
         if search_query:
-            search_pattern = f"%{search_query}%"
-            where_clauses.append(
-                "(f.name ILIKE %s OR f.path ILIKE %s OR c.name ILIKE %s OR sc.name ILIKE %s)"
-            )
-            params.extend([search_pattern] * 4)
+            search_sql, search_params = self._build_search_filter(search_query)
+            where_clauses.append(search_sql)
+            params.extend(search_params)
         
         if status_value:
             where_clauses.append("s.name = %s")
@@ -361,6 +456,105 @@ class DatabaseFilesHelper:
         self.db_manager.close()
         return count
 
+    def get_file_totals(self):
+        """Get the global file totals from the trigger-maintained counters.
+
+        Returns {"total": int, "by_status": {status name: int}}.
+        """
+        self.db_manager.connect(write=False)
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("""
+            SELECT s.name, fsc.file_count
+            FROM file_status_counts fsc
+            LEFT JOIN statuses s ON s.id = fsc.status_id
+        """)
+        by_status = {}
+        total = 0
+        for row in cursor.fetchall():
+            total += row["file_count"]
+            if row["name"] is not None:
+                by_status[row["name"]] = row["file_count"]
+        self.db_manager.close()
+        return {"total": total, "by_status": by_status}
+
+    def refresh_file_totals(self):
+        """Rebuild the columns and counters derived from files (after loads that bypass triggers)."""
+        self.db_manager.connect(write=True)
+        cursor = self.db_manager.connection.cursor()
+        # Restores and imports load files with user triggers off, so trg_files_date_value
+        # never ran; older backups and CSV exports do not even carry date_value
+        cursor.execute("SELECT to_regprocedure('parse_archive_date(text)') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("""
+                UPDATE files SET date_value = parse_archive_date(date)
+                WHERE date_value IS DISTINCT FROM parse_archive_date(date)
+            """)
+        cursor.execute("SELECT to_regprocedure('refresh_file_status_counts()') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("SELECT refresh_file_status_counts()")
+        self.db_manager.connection.commit()
+        self.db_manager.close()
+
+    def get_files_page_details(self, file_ids):
+        """Get price, earnings, client and batch details for a page of files in one query."""
+        if not file_ids:
+            return {}
+        self.db_manager.connect(write=False)
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("""
+            SELECT
+                f.id AS file_id,
+                ip.price, ip.currency, ip.note,
+                acp.client_id AS assigned_client_id,
+                cn.client_name,
+                bn.batch_number,
+                COALESCE(er.earnings, '[]'::json) AS earnings
+            FROM unnest(%s::int[]) AS f(id)
+            LEFT JOIN item_price ip ON ip.file_id = f.id
+            LEFT JOIN LATERAL (
+                SELECT fcp.client_id
+                FROM file_client_price fcp
+                WHERE fcp.file_id = f.id AND fcp.item_price_id = ip.id
+                LIMIT 1
+            ) acp ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT c.client_name
+                FROM file_client_price fcp
+                JOIN client c ON fcp.client_id = c.id
+                WHERE fcp.file_id = f.id
+                LIMIT 1
+            ) cn ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT fcb.batch_number
+                FROM file_client_batch fcb
+                WHERE fcb.file_id = f.id AND fcb.client_id = acp.client_id
+                ORDER BY fcb.id DESC
+                LIMIT 1
+            ) bn ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT json_agg(json_build_object(
+                    'id', e.id, 'username', t.username, 'full_name', t.full_name,
+                    'amount', e.amount, 'note', e.note
+                ) ORDER BY e.id ASC) AS earnings
+                FROM earnings e
+                JOIN teams t ON e.team_id = t.id
+                WHERE e.item_price_id = ip.id
+            ) er ON TRUE
+        """, (list(file_ids),))
+        details = {}
+        for row in cursor.fetchall():
+            details[row["file_id"]] = {
+                "price": str(row["price"]) if row["price"] is not None else "",
+                "currency": row["currency"] or "IDR",
+                "note": row["note"] or "",
+                "earnings": row["earnings"] or [],
+                "client_id": row["assigned_client_id"],
+                "client_name": row["client_name"] or "",
+                "batch_number": row["batch_number"] or ""
+            }
+        self.db_manager.close()
+        return details
+
     def get_all_roots(self):
         """Get all unique root values."""
         self.db_manager.connect(write=False)
@@ -430,11 +624,10 @@ class DatabaseFilesHelper:
                 SET status_id = %s, updated_at = CURRENT_TIMESTAMP 
                 WHERE id IN ({placeholders})
             """, [status_id] + file_ids)
-            
+            self.db_manager.notify_in_transaction(cursor)
             self.db_manager.connection.commit()
         
         self.db_manager.close()
-        self.db_manager.create_temp_file()
         return len(file_ids)
 
     def get_file_related_delete_info(self, file_id):
@@ -0,0 +1,83 @@
+import copy
+import threading
+
+
+class DatabaseLookupCache:
+    """In-process read-through cache for small reference tables.
+
+    DatabaseManager routes its lookup getters (statuses, categories, clients,
+    templates, URL providers, wallet reference tables, ...) through get(),
+    declaring the tables each result was read from. Entries are dropped by
+    invalidate(table): the polling helper calls it for every table_changed
+    notification (other sessions' and our own), and the write helpers call it
+    right after committing so the writing session never reads its own stale
+    data. The cache only serves while the LISTEN connection is up; without it
+    changes from other sessions would go unnoticed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._generations = {}
+        self._epoch = 0
+        self._enabled = False
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "invalidations": 0}
+
+    def enable(self):
+        with self._lock:
+            self._enabled = True
+
+    def disable(self):
+        with self._lock:
+            self._enabled = False
+            self._entries.clear()
+            self._epoch += 1
+
+    def get(self, key, tables, loader, *args):
+        """Return loader(*args), cached under key until one of tables changes."""
+        with self._lock:
+            if not self._enabled:
+                self._stats["bypassed"] += 1
+                entry = None
+            else:
+                entry = self._entries.get(key)
+                self._stats["hits" if entry is not None else "misses"] += 1
+            enabled = self._enabled
+            epoch = self._epoch
+            generations = tuple(self._generations.get(table, 0) for table in tables)
+        # Deep copies: the getters return lists of row dicts, and a caller
+        # editing a row must not change what later reads get from the cache
+        if entry is not None:
+            return copy.deepcopy(entry[1])
+        value = loader(*args)
+        if enabled:
+            with self._lock:
+                # Only store it if nothing it depends on changed while loading
+                if epoch == self._epoch and generations == tuple(
+                    self._generations.get(table, 0) for table in tables
+                ):
+                    self._entries[key] = (frozenset(tables), value)
+        return copy.deepcopy(value)
+
+    def invalidate(self, *tables):
+        """Drop entries read from any of tables; no tables drops everything."""
+        with self._lock:
+            self._stats["invalidations"] += 1
+            if not tables:
+                self._entries.clear()
+                self._epoch += 1
+                return
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            changed = set(tables)
+            for key in [k for k, (deps, _) in self._entries.items() if deps & changed]:
+                del self._entries[key]
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["enabled"] = self._enabled
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
@@ -42,6 +42,7 @@ class DatabaseMicrostockHelper:
         """, (name, url, description, note))
         last_id = cursor.fetchone()[0]
         self.db_manager.connection.commit()
+        self.db_manager.invalidate_lookups("microstock_platforms")
         self.db_manager.close()
         return last_id
 
@@ -55,6 +56,7 @@ class DatabaseMicrostockHelper:
             WHERE id = %s
         """, (name, url, description, note, platform_id))
         self.db_manager.connection.commit()
+        self.db_manager.invalidate_lookups("microstock_platforms")
         self.db_manager.close()
 
     def delete_platform(self, platform_id):
@@ -64,6 +66,7 @@ class DatabaseMicrostockHelper:
         cursor.execute("DELETE FROM file_microstock_status WHERE platform_id = %s", (platform_id,))
         cursor.execute("DELETE FROM microstock_platforms WHERE id = %s", (platform_id,))
         self.db_manager.connection.commit()
+        self.db_manager.invalidate_lookups("file_microstock_status", "microstock_platforms")
         self.db_manager.close()
 
     def get_file_microstock_statuses(self, file_id):
@@ -110,6 +113,7 @@ class DatabaseMicrostockHelper:
                 updated_at = CURRENT_TIMESTAMP
         """, (file_id, platform_id, status_id, note))
         self.db_manager.connection.commit()
+        self.db_manager.invalidate_lookups("file_microstock_status")
         self.db_manager.close()
 
     def delete_file_microstock_status(self, file_id, platform_id):
@@ -121,6 +125,7 @@ class DatabaseMicrostockHelper:
             (file_id, platform_id)
         )
         self.db_manager.connection.commit()
+        self.db_manager.invalidate_lookups("file_microstock_status")
         self.db_manager.close()
 
     def get_all_statuses(self):
@@ -1,7 +1,13 @@
 import os
+import re
 from datetime import datetime
 from pathlib import Path
 
+from .db_helper_sql_script import split_sql_statements
+
+
+NO_TRANSACTION_DIRECTIVE = "-- migration: no-transaction"
+
 
 class DatabaseMigrationHelper:
 
@@ -45,7 +51,10 @@ class DatabaseMigrationHelper:
             with open(migration_file, 'r', encoding='utf-8') as f:
                 sql_content = f.read()
 
-            cursor.execute(sql_content)
+            if self.is_non_transactional(sql_content):
+                self._apply_non_transactional(cursor, sql_content)
+            else:
+                cursor.execute(sql_content)
             cursor.execute(
                 "INSERT INTO schema_migrations (migration_name) VALUES (%s)",
                 (migration_name,)
@@ -69,6 +78,40 @@ class DatabaseMigrationHelper:
                 backup_helper.restore_backup(backup_path)
             return False
 
+    def is_non_transactional(self, sql_content):
+        """Migrations whose first line is the no-transaction directive run statement by statement in autocommit."""
+        for line in sql_content.splitlines():
+            if line.strip():
+                return line.strip().lower() == NO_TRANSACTION_DIRECTIVE
+        return False
+
+    def _apply_non_transactional(self, cursor, sql_content):
+        """Run each statement in autocommit mode (required for CREATE INDEX CONCURRENTLY)."""
+        connection = self.db_manager.connection
+        connection.rollback()
+        connection.autocommit = True
+        try:
+            self._drop_invalid_indexes(cursor, sql_content)
+            for statement in split_sql_statements(sql_content, keep_comments=False):
+                cursor.execute(statement)
+        finally:
+            connection.autocommit = False
+
+    def _drop_invalid_indexes(self, cursor, sql_content):
+        """Drop INVALID leftovers of earlier failed concurrent builds so IF NOT EXISTS rebuilds them."""
+        cursor.execute("""
+            SELECT c.relname
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE NOT i.indisvalid AND n.nspname = current_schema()
+        """)
+        for row in cursor.fetchall():
+            index_name = row[0]
+            if re.search(rf"\b{re.escape(index_name)}\b", sql_content):
+                print(f"[MIGRATION] Dropping invalid index left by a failed build: {index_name}")
+                cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+
     def cleanup_migration_backups(self):
         try:
             retention_days = 30
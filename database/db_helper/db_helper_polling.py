@@ -1,18 +1,47 @@
+import json
 import psycopg2
 import psycopg2.extensions
 import os
-from PySide6.QtCore import QObject, QTimer
+import threading
+from PySide6.QtCore import QObject, QSocketNotifier, QTimer, Signal, Slot
 
 
 class DatabasePollingHelper(QObject):
 
+    # Writes that land within this window are announced with a single NOTIFY
+    NOTIFY_COALESCE_MS = 150
+    RECONNECT_INTERVAL_MS = 5000
+
+    # Tables whose table_changed ids are file ids (earnings carries none)
+    FILE_TABLES = {
+        "files", "item_price", "file_client_price", "file_client_batch",
+        "file_url", "file_microstock_status", "earnings",
+    }
+    ATTENDANCE_TABLES = {"attendance", "teams"}
+
+    _notify_requested = Signal()
+
     def __init__(self, db_manager):
         super().__init__()
         self.db_manager = db_manager
         self._listen_conn = None
-        self._poll_timer = QTimer()
-        self._poll_timer.setInterval(2000)
-        self._poll_timer.timeout.connect(self._poll_notifications)
+        self._socket_notifier = None
+        # Sessions that announce their writes on table_changed; their untyped
+        # data_changed NOTIFY carries nothing new
+        self._typed_sessions = set()
+        self._reconnect_timer = QTimer()
+        self._reconnect_timer.setSingleShot(True)
+        self._reconnect_timer.setInterval(self.RECONNECT_INTERVAL_MS)
+        self._reconnect_timer.timeout.connect(self._reconnect)
+        self._notify_conn = None
+        self._notify_lock = threading.Lock()
+        self._notify_pending = False
+        self._notify_timer = QTimer()
+        self._notify_timer.setSingleShot(True)
+        self._notify_timer.setInterval(self.NOTIFY_COALESCE_MS)
+        self._notify_timer.timeout.connect(self.flush_notifications)
+        # Queued onto the GUI thread when a background query writes
+        self._notify_requested.connect(self._schedule_flush)
 
     def _create_connection(self):
         dsn = {
@@ -35,53 +64,168 @@ class DatabasePollingHelper(QObject):
             )
             cursor = self._listen_conn.cursor()
             cursor.execute("LISTEN data_changed;")
-            self._poll_timer.start()
+            cursor.execute("LISTEN table_changed;")
+            # Wake up as soon as the server writes to the socket instead of polling
+            self._socket_notifier = QSocketNotifier(self._listen_conn.fileno(), QSocketNotifier.Read, self)
+            self._socket_notifier.activated.connect(self._poll_notifications)
+            # Anything cached before (re)connecting may have missed notifications
+            self.db_manager.lookup_cache.invalidate()
+            self.db_manager.lookup_cache.enable()
+            self.db_manager.caching_helper.request_catch_up()
             print("[Polling] Listening for database changes")
         except Exception as e:
             print(f"[Polling] Error starting listener: {e}")
+            self._close_listen_connection()
+            self._reconnect_timer.start()
 
     def _poll_notifications(self):
         if self._listen_conn is None or self._listen_conn.closed:
             return
         try:
             self._listen_conn.poll()
-            while self._listen_conn.notifies:
-                notify = self._listen_conn.notifies.pop(0)
-                if notify.payload != self.db_manager.session_id:
-                    print(f"[Polling] External change detected from session {notify.payload}")
-                    try:
-                        self.db_manager.data_changed.emit()
-                    except Exception as e:
-                        print(f"[Polling] Error emitting data_changed: {e}")
+            notifies = list(self._listen_conn.notifies)
+            self._listen_conn.notifies.clear()
         except Exception as e:
             print(f"[Polling] Error polling: {e}")
             self._reconnect()
+            return
+        if notifies:
+            self._dispatch(notifies)
+
+    def _dispatch(self, notifies):
+        """Fold one batch of notifications into at most one emit per signal."""
+        session_id = self.db_manager.session_id
+        file_ids = set()
+        all_files = False
+        wallet_tables = set()
+        attendance = False
+        untyped = False
+        for notify in notifies:
+            if notify.channel == "table_changed":
+                try:
+                    change = json.loads(notify.payload)
+                except ValueError:
+                    untyped = True
+                    continue
+                session = change.get("session")
+                if session:
+                    self._typed_sessions.add(session)
+                table = change.get("table") or ""
+                # Our own writes too: they may come from a background query
+                self.db_manager.lookup_cache.invalidate(table)
+                self.db_manager.caching_helper.queue_change(table, change.get("ids"))
+                if session == session_id:
+                    continue
+                if table in self.FILE_TABLES:
+                    ids = change.get("ids")
+                    if ids and table != "earnings":
+                        file_ids.update(ids)
+                    else:
+                        all_files = True
+                elif table in self.ATTENDANCE_TABLES:
+                    attendance = True
+                elif table.startswith("wallet_"):
+                    wallet_tables.add(table)
+                else:
+                    untyped = True
+            elif notify.payload != session_id and notify.payload not in self._typed_sessions:
+                print(f"[Polling] External change detected from session {notify.payload}")
+                self.db_manager.lookup_cache.invalidate()
+                self.db_manager.caching_helper.request_catch_up()
+                untyped = True
 
-    def notify_change(self):
         try:
-            conn = self._create_connection()
-            conn.set_isolation_level(
-                psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
-            )
-            cursor = conn.cursor()
-            cursor.execute("NOTIFY data_changed, %s", (self.db_manager.session_id,))
-            conn.close()
+            if untyped:
+                # Unknown scope (older clients, unwatched tables): reload everything
+                self.db_manager.data_changed.emit()
+            if all_files or file_ids:
+                self.db_manager.files_changed.emit([] if all_files else sorted(file_ids))
+            for table in sorted(wallet_tables):
+                self.db_manager.wallet_changed.emit(table)
+            if attendance:
+                self.db_manager.attendance_changed.emit()
         except Exception as e:
-            print(f"[Polling] Error sending notification: {e}")
+            print(f"[Polling] Error emitting change signals: {e}")
+
+    def notify_change(self):
+        """Announce a committed change to other sessions.
+
+        Calls are coalesced: the first one arms a short timer and every write
+        until it fires is covered by the same NOTIFY, sent on a persistent
+        autocommit connection instead of a new connection per write.
+        """
+        with self._notify_lock:
+            if self._notify_pending:
+                return
+            self._notify_pending = True
+        self._notify_requested.emit()
+
+    def notify_in_transaction(self, cursor):
+        """Queue the change notification inside cursor's open transaction.
+
+        PostgreSQL delivers it on commit and drops it on rollback, and repeats
+        of the same payload within one transaction are folded into one.
+        """
+        cursor.execute("SELECT pg_notify('data_changed', %s)", (self.db_manager.session_id,))
+
+    @Slot()
+    def _schedule_flush(self):
+        if not self._notify_timer.isActive():
+            self._notify_timer.start()
+
+    @Slot()
+    def flush_notifications(self):
+        with self._notify_lock:
+            if not self._notify_pending:
+                return
+            self._notify_pending = False
+            # One retry on a fresh connection if the persistent one went away
+            for attempt in range(2):
+                try:
+                    if self._notify_conn is None or self._notify_conn.closed:
+                        self._notify_conn = self._create_connection()
+                        self._notify_conn.set_isolation_level(
+                            psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
+                        )
+                    cursor = self._notify_conn.cursor()
+                    cursor.execute("NOTIFY data_changed, %s", (self.db_manager.session_id,))
+                    cursor.close()
+                    return
+                except Exception as e:
+                    self._close_notify_connection()
+                    if attempt:
+                        print(f"[Polling] Error sending notification: {e}")
+
+    def _close_notify_connection(self):
+        if self._notify_conn is not None and not self._notify_conn.closed:
+            try:
+                self._notify_conn.close()
+            except Exception:
+                pass
+        self._notify_conn = None
 
     def stop(self):
-        self._poll_timer.stop()
+        self._reconnect_timer.stop()
+        self._notify_timer.stop()
+        self.flush_notifications()
+        with self._notify_lock:
+            self._close_notify_connection()
+        self._close_listen_connection()
+        print("[Polling] Stopped listening")
+
+    def _close_listen_connection(self):
+        self.db_manager.lookup_cache.disable()
+        if self._socket_notifier is not None:
+            self._socket_notifier.setEnabled(False)
+            self._socket_notifier.deleteLater()
+            self._socket_notifier = None
         if self._listen_conn and not self._listen_conn.closed:
             try:
                 self._listen_conn.close()
             except Exception:
                 pass
         self._listen_conn = None
-        print("[Polling] Stopped listening")
 
     def _reconnect(self):
-        self.stop()
-        try:
-            self.start_listening()
-        except Exception as e:
-            print(f"[Polling] Failed to reconnect: {e}")
+        self._close_listen_connection()
+        self.start_listening()
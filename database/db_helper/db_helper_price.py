@@ -5,36 +5,27 @@ class DatabasePriceHelper:
     
     def __init__(self, db_manager):
         self.db_manager = db_manager
+        connection_helper = db_manager.connection_helper
+        connection_helper.register_statement(
+            "price_detail_by_file", ("integer",), "SELECT price, currency, note FROM item_price WHERE file_id = $1"
+        )
+        connection_helper.register_statement(
+            "price_id_by_file", ("integer",), "SELECT id FROM item_price WHERE file_id = $1"
+        )
 
     def assign_price(self, file_id, price, currency, note=""):
         """Assign or update price for a file."""
-        self.db_manager.connect(write=False)
+        self.db_manager.connect()
         cursor = self.db_manager.connection.cursor()
-        cursor.execute("SELECT id FROM item_price WHERE file_id = %s", (file_id,))
-        item_price_row = cursor.fetchone()
+        # One statement instead of a lookup on a read connection plus a write
+        cursor.execute("""
+            INSERT INTO item_price (file_id, price, currency, note) VALUES (%s, %s, %s, %s)
+            ON CONFLICT (file_id) DO UPDATE
+            SET price = EXCLUDED.price, currency = EXCLUDED.currency, note = EXCLUDED.note
+        """, (file_id, price, currency, note))
+        self.db_manager.connection.commit()
         self.db_manager.close()
-        
-        if item_price_row:
-            item_price_id = item_price_row["id"]
-            self.db_manager.connect()
-            cursor = self.db_manager.connection.cursor()
-            cursor.execute(
-                "UPDATE item_price SET price = %s, currency = %s, note = %s WHERE id = %s",
-                (price, currency, note, item_price_id)
-            )
-            self.db_manager.connection.commit()
-            self.db_manager.close()
-            self.db_manager.create_temp_file()
-        else:
-            self.db_manager.connect()
-            cursor = self.db_manager.connection.cursor()
-            cursor.execute(
-                "INSERT INTO item_price (file_id, price, currency, note) VALUES (%s, %s, %s, %s)",
-                (file_id, price, currency, note)
-            )
-            self.db_manager.connection.commit()
-            self.db_manager.close()
-            self.db_manager.create_temp_file()
+        self.db_manager.create_temp_file()
 
     def get_item_price(self, file_id):
         """Get price and currency for a file."""
@@ -47,11 +38,30 @@ class DatabasePriceHelper:
             return row["price"], row["currency"]
         return None, None
 
+    def assign_prices_bulk(self, file_ids, price, currency, note=""):
+        """Assign or update the same price for many files in one statement."""
+        file_ids = list(file_ids)
+        if not file_ids:
+            return 0
+        self.db_manager.connect()
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("""
+            INSERT INTO item_price (file_id, price, currency, note)
+            SELECT DISTINCT f.file_id, %s, %s, %s FROM UNNEST(%s::integer[]) AS f(file_id)
+            ON CONFLICT (file_id) DO UPDATE
+            SET price = EXCLUDED.price, currency = EXCLUDED.currency, note = EXCLUDED.note
+        """, (price, currency, note, file_ids))
+        assigned = cursor.rowcount
+        self.db_manager.connection.commit()
+        self.db_manager.close()
+        self.db_manager.create_temp_file()
+        return assigned
+
     def get_item_price_detail(self, file_id):
         """Get detailed price information for a file."""
         self.db_manager.connect(write=False)
         cursor = self.db_manager.connection.cursor()
-        cursor.execute("SELECT price, currency, note FROM item_price WHERE file_id = %s", (file_id,))
+        self.db_manager.execute_prepared(cursor, "price_detail_by_file", (file_id,))
         row = cursor.fetchone()
         self.db_manager.close()
         if row:
@@ -63,11 +73,11 @@ class DatabasePriceHelper:
         if cursor is None:
             self.db_manager.connect(write=False)
             cursor = self.db_manager.connection.cursor()
-            cursor.execute("SELECT id FROM item_price WHERE file_id = %s", (file_id,))
+            self.db_manager.execute_prepared(cursor, "price_id_by_file", (file_id,))
             row = cursor.fetchone()
             self.db_manager.close()
         else:
-            cursor.execute("SELECT id FROM item_price WHERE file_id = %s", (file_id,))
+            self.db_manager.execute_prepared(cursor, "price_id_by_file", (file_id,))
             row = cursor.fetchone()
         if row:
             return row["id"]
@@ -99,87 +109,93 @@ class DatabasePriceHelper:
 
     def assign_earning_with_percentage(self, file_id, username, note, operational_percentage):
         """Assign earning to team member with percentage calculation."""
-        # Read-only check
-        self.db_manager.connect(write=False)
-        cursor = self.db_manager.connection.cursor()
-        cursor.execute("SELECT id FROM teams WHERE username = %s", (username,))
-        team_row = cursor.fetchone()
-        if not team_row:
-            self.db_manager.close()
-            return False
-        
-        team_id = team_row[0]
-        cursor.execute("SELECT id, price FROM item_price WHERE file_id = %s", (file_id,))
-        price_row = cursor.fetchone()
-        if not price_row:
-            self.db_manager.close()
-            return False
-        
-        item_price_id = price_row[0]
-        price = price_row[1]
-        cursor.execute("SELECT COUNT(*) FROM earnings WHERE item_price_id = %s", (item_price_id,))
-        count = cursor.fetchone()[0]
-        cursor.execute("SELECT id FROM earnings WHERE item_price_id = %s AND team_id = %s", (item_price_id, team_id))
-        exists = cursor.fetchone()
-        self.db_manager.close()
-        
-        if exists:
-            return False
-        
-        # Insert (write)
-        self.db_manager.connect()
-        cursor = self.db_manager.connection.cursor()
-        cursor.execute(
-            "INSERT INTO earnings (team_id, item_price_id, amount, note) VALUES (%s, %s, %s, %s)",
-            (team_id, item_price_id, 0, note)
-        )
-        self.db_manager.connection.commit()
-        self.db_manager.close()
-        self.update_earnings_shares_with_percentage(file_id, operational_percentage)
-        self.db_manager.create_temp_file()
+        # The new earning and the recalculated shares commit together
+        with self.db_manager.transaction():
+            cursor = self.db_manager.connection.cursor()
+            cursor.execute("SELECT id FROM teams WHERE username = %s", (username,))
+            team_row = cursor.fetchone()
+            if not team_row:
+                return False
+
+            team_id = team_row[0]
+            cursor.execute("SELECT id FROM item_price WHERE file_id = %s", (file_id,))
+            price_row = cursor.fetchone()
+            if not price_row:
+                return False
+
+            item_price_id = price_row[0]
+            cursor.execute("SELECT id FROM earnings WHERE item_price_id = %s AND team_id = %s", (item_price_id, team_id))
+            if cursor.fetchone():
+                return False
+
+            cursor.execute(
+                "INSERT INTO earnings (team_id, item_price_id, amount, note) VALUES (%s, %s, %s, %s)",
+                (team_id, item_price_id, 0, note)
+            )
+            self.update_earnings_shares_with_percentage(file_id, operational_percentage)
+            self.db_manager.create_temp_file()
         return True
 
     def update_earnings_shares_with_percentage(self, file_id, operational_percentage):
         """Update earnings shares based on operational percentage."""
+        self.recalculate_earnings_shares(operational_percentage, file_ids=[file_id])
+
+    def recalculate_earnings_shares(self, operational_percentage, file_ids=None, client_id=None, batch_number=None):
+        """Recompute the earnings shares of many files in one statement.
+
+        Every earning of a file gets (price - operational share) / number of
+        earnings. The files are the given file_ids, the files assigned to
+        client_id and/or batch_number, or every priced file when no filter is
+        given. Returns the number of earnings whose amount changed.
+        """
+        filters = []
+        params = {"percentage": operational_percentage}
+        if file_ids is not None:
+            filters.append("ip.file_id = ANY(%(file_ids)s)")
+            params["file_ids"] = list(file_ids)
+        if batch_number is not None:
+            batch_filter = "SELECT fcb.file_id FROM file_client_batch fcb WHERE fcb.batch_number = %(batch_number)s"
+            if client_id is not None:
+                batch_filter += " AND fcb.client_id = %(client_id)s"
+            filters.append(f"ip.file_id IN ({batch_filter})")
+            params["batch_number"] = batch_number
+        elif client_id is not None:
+            filters.append("ip.file_id IN (SELECT fcp.file_id FROM file_client_price fcp WHERE fcp.client_id = %(client_id)s)")
+        if client_id is not None:
+            params["client_id"] = client_id
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
         self.db_manager.connect()
         cursor = self.db_manager.connection.cursor()
-        cursor.execute("SELECT id, price FROM item_price WHERE file_id = %s", (file_id,))
-        price_row = cursor.fetchone()
-        if not price_row:
-            self.db_manager.close()
-            return
-        
-        item_price_id = price_row[0]
-        price = price_row[1]
-        cursor.execute("SELECT id FROM earnings WHERE item_price_id = %s", (item_price_id,))
-        earning_rows = cursor.fetchall()
-        n = len(earning_rows)
-        if n == 0:
-            self.db_manager.close()
-            return
-        
-        opr_amount = float(price) * (operational_percentage / 100)
-        share_total = float(price) - opr_amount
-        share = share_total / n if n > 0 else 0
-        
-        for row in earning_rows:
-            earning_id = row[0]
-            cursor.execute("UPDATE earnings SET amount = %s WHERE id = %s", (share, earning_id))
-        
+        # Same arithmetic as before in float8, stored as real; unchanged rows are skipped
+        cursor.execute(f"""
+            UPDATE earnings e
+            SET amount = s.share
+            FROM (
+                SELECT e2.id,
+                       ((ip.price::float8 - ip.price::float8 * (%(percentage)s::float8 / 100))
+                        / COUNT(*) OVER (PARTITION BY e2.item_price_id))::real AS share
+                FROM earnings e2
+                JOIN item_price ip ON ip.id = e2.item_price_id
+                {where}
+            ) s
+            WHERE e.id = s.id AND e.amount IS DISTINCT FROM s.share
+        """, params)
+        updated = cursor.rowcount
         self.db_manager.connection.commit()
         self.db_manager.close()
-        self.db_manager.create_temp_file()
+        if updated:
+            self.db_manager.create_temp_file()
+        return updated
 
     def remove_earning(self, earning_id, file_id):
         """Remove earning and recalculate shares."""
-        self.db_manager.connect()
-        cursor = self.db_manager.connection.cursor()
-        cursor.execute("DELETE FROM earnings WHERE id = %s", (earning_id,))
-        self.db_manager.connection.commit()
-        self.db_manager.close()
         operational_percentage = int(self.db_manager.window_config_manager.get("operational_percentage"))
-        self.update_earnings_shares_with_percentage(file_id, operational_percentage)
-        self.db_manager.create_temp_file()
+        with self.db_manager.transaction():
+            cursor = self.db_manager.connection.cursor()
+            cursor.execute("DELETE FROM earnings WHERE id = %s", (earning_id,))
+            self.update_earnings_shares_with_percentage(file_id, operational_percentage)
+            self.db_manager.create_temp_file()
 
     def update_earning_note(self, earning_id, note):
         """Update earning note."""
@@ -0,0 +1,164 @@
+import itertools
+import threading
+
+import psycopg2
+import psycopg2.pool
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class _QueryTask(QRunnable):
+    """Runs one submitted callable on a worker thread with its own pooled connection."""
+
+    def __init__(self, executor, key, request_id, fn, args, kwargs, write):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.executor = executor
+        self.key = key
+        self.request_id = request_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.write = write
+        self.cancelled = False
+        self.connection = None
+
+    def run(self):
+        executor = self.executor
+        db_manager = executor.db_manager
+        if self.cancelled:
+            executor._task_done.emit(self.key, self.request_id, "cancelled", None)
+            return
+        status, payload = "ok", None
+        connection_helper = db_manager.connection_helper
+        depth = connection_helper.current_depth()
+        try:
+            # Hold one connection for the whole task: the helpers' own
+            # connect()/close() calls nest on it and cancel() can target it
+            try:
+                db_manager.connect(write=self.write)
+            except executor.CONNECTION_ERRORS:
+                # Run fn anyway: reads routed through the local replica can
+                # still be answered, everything else raises the same error
+                pass
+            with executor._lock:
+                self.connection = db_manager.connection
+                cancelled = self.cancelled
+            if not cancelled:
+                payload = self.fn(*self.args, **self.kwargs)
+            else:
+                status = "cancelled"
+        except psycopg2.extensions.QueryCanceledError:
+            status = "cancelled"
+        except Exception as e:
+            status, payload = ("cancelled", None) if self.cancelled else ("error", e)
+        finally:
+            with executor._lock:
+                self.connection = None
+            # Helpers do not close() when their query raises (a cancel always
+            # does); unwind so the pool thread never keeps a connection
+            connection_helper.unwind(depth)
+        executor._task_done.emit(self.key, self.request_id, status, payload)
+
+
+class DatabaseQueryExecutor(QObject):
+    """Runs database work off the GUI thread.
+
+    submit(key, fn, ...) queues fn on a thread pool one smaller than the read
+    connection pool and delivers the result on the GUI thread through on_result/on_error
+    and the query_finished/query_failed signals. A request supersedes any
+    earlier request with the same key: the earlier one is dropped if still
+    queued, cancelled on the server (connection.cancel()) if running, and its
+    result is never delivered.
+    """
+
+    CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, psycopg2.pool.PoolError)
+
+    query_finished = Signal(str, object)
+    query_failed = Signal(str, str)
+    _task_done = Signal(str, int, str, object)
+
+    def __init__(self, db_manager):
+        super().__init__()
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._latest = {}
+        self._tasks = {}
+        self._callbacks = {}
+        self._pool = QThreadPool(self)
+        # Leave one read connection free so a GUI-thread connect() never waits
+        # behind a pool filled by slow background loads
+        max_threads = db_manager.connection_helper.pool_config["read_max_connections"] - 1
+        self._pool.setMaxThreadCount(max(1, max_threads))
+        self._task_done.connect(self._on_task_done)
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, write=False, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread; returns the request id."""
+        request_id = next(self._request_ids)
+        task = _QueryTask(self, key, request_id, fn, args, kwargs, write)
+        with self._lock:
+            previous = self._latest.get(key)
+            self._latest[key] = request_id
+            self._tasks[request_id] = task
+        self._callbacks[request_id] = (on_result, on_error)
+        if previous is not None:
+            self._cancel_request(previous)
+        self._pool.start(task)
+        return request_id
+
+    def cancel(self, key):
+        """Cancel the pending request for key, if any; nothing will be delivered for it."""
+        with self._lock:
+            request_id = self._latest.pop(key, None)
+        if request_id is not None:
+            self._cancel_request(request_id)
+
+    def is_pending(self, key):
+        with self._lock:
+            return key in self._latest
+
+    def shutdown(self, timeout_ms=5000):
+        """Cancel everything and wait for running tasks to return their connections."""
+        with self._lock:
+            request_ids = list(self._tasks)
+            self._latest.clear()
+        for request_id in request_ids:
+            self._cancel_request(request_id)
+        self._pool.waitForDone(timeout_ms)
+
+    def _cancel_request(self, request_id):
+        with self._lock:
+            task = self._tasks.get(request_id)
+            if task is None:
+                return
+            task.cancelled = True
+            # Cancel under the lock: run() clears task.connection under it
+            # before the connection can go back to the pool and another query
+            if task.connection is not None:
+                try:
+                    task.connection.cancel()
+                except Exception as e:
+                    print(f"[DB] Could not cancel query '{task.key}': {e}")
+                return
+        if self._pool.tryTake(task):
+            # Never started; finish it here so its bookkeeping is released
+            self._task_done.emit(task.key, request_id, "cancelled", None)
+
+    @Slot(str, int, str, object)
+    def _on_task_done(self, key, request_id, status, payload):
+        with self._lock:
+            self._tasks.pop(request_id, None)
+            is_current = self._latest.get(key) == request_id
+            if is_current:
+                del self._latest[key]
+        on_result, on_error = self._callbacks.pop(request_id, (None, None))
+        if not is_current or status == "cancelled":
+            return
+        if status == "ok":
+            if on_result is not None:
+                on_result(payload)
+            self.query_finished.emit(key, payload)
+        else:
+            if on_error is not None:
+                on_error(payload)
+            self.query_failed.emit(key, str(payload))
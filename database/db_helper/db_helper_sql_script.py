@@ -0,0 +1,110 @@
+def split_sql_statements(sql, keep_comments=True):
+    """Split a SQL script into individual statements, respecting string literals and dollar-quoted blocks.
+
+    Comments stay in the statement they precede unless keep_comments is False.
+    """
+    statements = []
+    current = []
+    i = 0
+    n = len(sql)
+    in_single_quote = False
+    in_dollar_quote = False
+    dollar_tag = ''
+    in_line_comment = False
+    in_block_comment = False
+    while i < n:
+        c = sql[i]
+        nxt = sql[i + 1] if i + 1 < n else ''
+
+        if in_line_comment:
+            if c == '\n':
+                in_line_comment = False
+                current.append(c)
+            elif keep_comments:
+                current.append(c)
+            i += 1
+            continue
+
+        if in_block_comment:
+            if c == '*' and nxt == '/':
+                in_block_comment = False
+                if keep_comments:
+                    current.append('*/')
+                else:
+                    current.append(' ')
+                i += 2
+                continue
+            if keep_comments:
+                current.append(c)
+            i += 1
+            continue
+
+        if in_single_quote:
+            current.append(c)
+            if c == "'":
+                if nxt == "'":
+                    current.append("'")
+                    i += 2
+                    continue
+                in_single_quote = False
+            i += 1
+            continue
+
+        if in_dollar_quote:
+            # check for closing tag
+            if c == '$' and sql[i:i + len(dollar_tag)] == dollar_tag:
+                current.append(dollar_tag)
+                i += len(dollar_tag)
+                in_dollar_quote = False
+                dollar_tag = ''
+                continue
+            current.append(c)
+            i += 1
+            continue
+
+        # not in any string/comment
+        if c == '-' and nxt == '-':
+            in_line_comment = True
+            if keep_comments:
+                current.append('--')
+            i += 2
+            continue
+        if c == '/' and nxt == '*':
+            in_block_comment = True
+            if keep_comments:
+                current.append('/*')
+            i += 2
+            continue
+        if c == "'":
+            in_single_quote = True
+            current.append(c)
+            i += 1
+            continue
+        if c == '$':
+            # possible dollar quote tag, e.g. $$ or $tag$
+            j = i + 1
+            while j < n and (sql[j].isalnum() or sql[j] == '_'):
+                j += 1
+            if j < n and sql[j] == '$':
+                dollar_tag = sql[i:j + 1]
+                in_dollar_quote = True
+                current.append(dollar_tag)
+                i = j + 1
+                continue
+            current.append(c)
+            i += 1
+            continue
+        if c == ';':
+            stmt = ''.join(current).strip()
+            if stmt:
+                statements.append(stmt)
+            current = []
+            i += 1
+            continue
+        current.append(c)
+        i += 1
+
+    remaining = ''.join(current).strip()
+    if remaining:
+        statements.append(remaining)
+    return statements
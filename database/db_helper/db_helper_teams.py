@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 
 
 class DatabaseTeamsHelper:
@@ -69,13 +69,50 @@ class DatabaseTeamsHelper:
                 bank = %s,
                 account_number = %s,
                 account_holder = %s,
-                profile_image = %s
+                profile_image = %s,
+                updated_at = CURRENT_TIMESTAMP
             WHERE username = %s
         """, (new_username, full_name, contact, address, email, phone, attendance_pin, started_at, bank, account_number, account_holder, profile_image, old_username))
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
         self.db_manager.close()
 
+    def get_present_teams(self):
+        """Get the team members currently checked in, without profile images.
+
+        updated_at versions the profile image, so callers can cache decoded
+        avatars and fetch images only for teams whose version they lack.
+        """
+        self.db_manager.connect(write=False)
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("""
+            SELECT t.id, t.username, t.full_name, t.updated_at, t.profile_image IS NOT NULL AS has_image
+            FROM teams t
+            WHERE EXISTS (
+                SELECT 1 FROM attendance a
+                WHERE a.team_id = t.id AND a.check_in IS NOT NULL AND a.check_out IS NULL
+            )
+            ORDER BY t.username ASC
+        """)
+        teams = [
+            {"id": row[0], "username": row[1], "full_name": row[2], "updated_at": row[3], "has_image": row[4]}
+            for row in cursor.fetchall()
+        ]
+        self.db_manager.close()
+        return teams
+
+    def get_team_profile_images(self, team_ids):
+        """Get {team_id: (updated_at, base64 profile_image)} for the given teams."""
+        team_ids = list(team_ids)
+        if not team_ids:
+            return {}
+        self.db_manager.connect(write=False)
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("SELECT id, updated_at, profile_image FROM teams WHERE id = ANY(%s)", (team_ids,))
+        images = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        self.db_manager.close()
+        return images
+
     def get_team_profile_data(self, username=None):
         """Get detailed team profile data including attendance and earnings."""
         self.db_manager.connect(write=False)
@@ -252,7 +289,7 @@ class DatabaseTeamsHelper:
             self.db_manager.connection.commit()
             self.db_manager.close()
             self.db_manager.create_temp_file()
-            self.db_manager.data_changed.emit()
+            self.db_manager.attendance_changed.emit()
             return True, "Checked in."
         elif mode == "checkout":
             self.db_manager.connect(write=False)
@@ -275,7 +312,7 @@ class DatabaseTeamsHelper:
                 self.db_manager.connection.commit()
                 self.db_manager.close()
                 self.db_manager.create_temp_file()
-                self.db_manager.data_changed.emit()
+                self.db_manager.attendance_changed.emit()
                 return True, "Checked out."
             else:
                 return False, "No open attendance to check out."
@@ -329,53 +366,72 @@ class DatabaseTeamsHelper:
         self.db_manager.close()
         return records
 
-    def get_attendance_by_team_id_paged(self, team_id, search_text=None, day_filter=None, month_filter=None, year_filter=None, sort_field="date", sort_order="desc", offset=0, limit=20):
-        """Get paginated attendance records for team."""
-        self.db_manager.connect(write=False)
-        cursor = self.db_manager.connection.cursor()
+    ATTENDANCE_DAY_NAMES = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+    ATTENDANCE_MONTH_NAMES = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
+    ATTENDANCE_SORT_MAP = {
+        "Date": "date",
+        "Check In": "check_in",
+        "Check Out": "check_out",
+        "Note": "note"
+    }
+
+    def _attendance_filter_sql(self, team_id, search_text=None, day_filter=None, month_filter=None, year_filter=None):
+        """Build the WHERE clause shared by the attendance tab queries.
+
+        Year and month filters become date ranges so idx_attendance_team_date
+        can serve them; a month without a year matches that month in every
+        year and can only narrow the team's rows. The day filter uses the
+        generated date_dow column (0 = Sunday).
+        """
         where_clauses = ["team_id = %s"]
         params = [team_id]
-        
-        hari_map = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
-        bulan_map = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
-        
+
         if search_text:
             search_pattern = f"%{search_text}%"
-            where_clauses.append("(note LIKE %s OR date LIKE %s OR check_in LIKE %s OR check_out LIKE %s)")
+            where_clauses.append("(note LIKE %s OR date::text LIKE %s OR check_in::text LIKE %s OR check_out::text LIKE %s)")
             params.extend([search_pattern] * 4)
-        
-        if day_filter and day_filter != "All Days":
-            where_clauses.append("EXTRACT(DOW FROM date::date)::integer = %s")
-            idx = hari_map.index(day_filter) if day_filter in hari_map else None
-            if idx is not None:
-                params.append(str((idx + 1) % 7))  # SQLite: Sunday=0, Python: Monday=0
-        
-        if month_filter and month_filter != "All Months":
-            idx = bulan_map.index(month_filter) + 1 if month_filter in bulan_map else None
-            if idx:
-                where_clauses.append("EXTRACT(MONTH FROM date::date)::integer = %s")
-                params.append(idx)
-        
+
+        if day_filter and day_filter in self.ATTENDANCE_DAY_NAMES:
+            where_clauses.append("date_dow = %s")
+            params.append((self.ATTENDANCE_DAY_NAMES.index(day_filter) + 1) % 7)  # Python: Monday=0, PostgreSQL: Sunday=0
+
+        month = None
+        if month_filter and month_filter in self.ATTENDANCE_MONTH_NAMES:
+            month = self.ATTENDANCE_MONTH_NAMES.index(month_filter) + 1
+        year = None
         if year_filter and year_filter != "All Years":
-            where_clauses.append("EXTRACT(YEAR FROM date::date)::integer::text = %s")
-            params.append(year_filter)
-        
-        where_sql = "WHERE " + " AND ".join(where_clauses)
-        
-        sort_map = {
-            "Date": "date",
-            "Check In": "check_in",
-            "Check Out": "check_out",
-            "Note": "note"
-        }
-        sort_sql = sort_map.get(sort_field, "date")
+            year = int(year_filter) if str(year_filter).isdigit() else -1
+
+        if year is not None and year <= 0:
+            where_clauses.append("FALSE")
+        elif year is not None and month is not None:
+            where_clauses.append("date >= %s AND date < %s")
+            params.append(date(year, month, 1))
+            params.append(date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1))
+        elif year is not None:
+            where_clauses.append("date >= %s AND date < %s")
+            params.extend([date(year, 1, 1), date(year + 1, 1, 1)])
+        elif month is not None:
+            where_clauses.append("EXTRACT(MONTH FROM date)::integer = %s")
+            params.append(month)
+
+        return "WHERE " + " AND ".join(where_clauses), params
+
+    def _attendance_order_sql(self, sort_field, sort_order, prefix=""):
+        sort_sql = self.ATTENDANCE_SORT_MAP.get(sort_field, "date")
         order_sql = "DESC" if sort_order.lower() in ("desc", "descending") else "ASC"
-        
+        return f"{prefix}{sort_sql} {order_sql}, {prefix}id DESC"
+
+    def get_attendance_by_team_id_paged(self, team_id, search_text=None, day_filter=None, month_filter=None, year_filter=None, sort_field="date", sort_order="desc", offset=0, limit=20):
+        """Get paginated attendance records for team."""
+        where_sql, params = self._attendance_filter_sql(team_id, search_text, day_filter, month_filter, year_filter)
+        self.db_manager.connect(write=False)
+        cursor = self.db_manager.connection.cursor()
         sql = f"""
             SELECT date, check_in, check_out, note, id
             FROM attendance
             {where_sql}
-            ORDER BY {sort_sql} {order_sql}, id DESC
+            ORDER BY {self._attendance_order_sql(sort_field, sort_order)}
             LIMIT %s OFFSET %s
         """
         params.extend([limit, offset])
@@ -386,111 +442,91 @@ class DatabaseTeamsHelper:
 
     def count_attendance_by_team_id_filtered(self, team_id, search_text=None, day_filter=None, month_filter=None, year_filter=None):
         """Count attendance records with filters."""
+        where_sql, params = self._attendance_filter_sql(team_id, search_text, day_filter, month_filter, year_filter)
         self.db_manager.connect(write=False)
         cursor = self.db_manager.connection.cursor()
-        where_clauses = ["team_id = %s"]
-        params = [team_id]
-        
-        hari_map = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
-        bulan_map = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
-        
-        if search_text:
-            search_pattern = f"%{search_text}%"
-            where_clauses.append("(note LIKE %s OR date LIKE %s OR check_in LIKE %s OR check_out LIKE %s)")
-            params.extend([search_pattern] * 4)
-        
-        if day_filter and day_filter != "All Days":
-            idx = hari_map.index(day_filter) if day_filter in hari_map else None
-            if idx is not None:
-                where_clauses.append("EXTRACT(DOW FROM date::date)::integer = %s")
-                params.append(str((idx + 1) % 7))
-        
-        if month_filter and month_filter != "All Months":
-            idx = bulan_map.index(month_filter) + 1 if month_filter in bulan_map else None
-            if idx:
-                where_clauses.append("EXTRACT(MONTH FROM date::date)::integer = %s")
-                params.append(idx)
-        
-        if year_filter and year_filter != "All Years":
-            where_clauses.append("EXTRACT(YEAR FROM date::date)::integer::text = %s")
-            params.append(year_filter)
-        
-        where_sql = "WHERE " + " AND ".join(where_clauses)
-        sql = f"SELECT COUNT(*) FROM attendance {where_sql}"
-        cursor.execute(sql, params)
+        cursor.execute(f"SELECT COUNT(*) FROM attendance {where_sql}", params)
         count = cursor.fetchone()[0]
         self.db_manager.close()
         return count
 
     def attendance_summary_by_team_id_filtered(self, team_id, search_text=None, day_filter=None, month_filter=None, year_filter=None):
         """Get attendance summary with filters."""
+        return self.get_attendance_page_by_team_id(
+            team_id, search_text, day_filter, month_filter, year_filter, limit=0
+        )["summary"]
+
+    def get_attendance_page_by_team_id(self, team_id, search_text=None, day_filter=None, month_filter=None, year_filter=None, sort_field="date", sort_order="desc", offset=0, limit=20):
+        """Get one page of attendance records with the filtered count and summary.
+
+        Replaces a paged query, a COUNT and a summary scan with one statement.
+        Returns {"records": [...], "total": int, "summary": {...}}.
+        """
+        where_sql, params = self._attendance_filter_sql(team_id, search_text, day_filter, month_filter, year_filter)
+        order_sql = self._attendance_order_sql(sort_field, sort_order)
         self.db_manager.connect(write=False)
         cursor = self.db_manager.connection.cursor()
-        where_clauses = ["team_id = %s"]
-        params = [team_id]
-        
-        hari_map = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
-        bulan_map = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
-        
-        if search_text:
-            search_pattern = f"%{search_text}%"
-            where_clauses.append("(note LIKE %s OR date LIKE %s OR check_in LIKE %s OR check_out LIKE %s)")
-            params.extend([search_pattern] * 4)
-        
-        if day_filter and day_filter != "All Days":
-            idx = hari_map.index(day_filter) if day_filter in hari_map else None
-            if idx is not None:
-                where_clauses.append("EXTRACT(DOW FROM date::date)::integer = %s")
-                params.append(str((idx + 1) % 7))
-        
-        if month_filter and month_filter != "All Months":
-            idx = bulan_map.index(month_filter) + 1 if month_filter in bulan_map else None
-            if idx:
-                where_clauses.append("EXTRACT(MONTH FROM date::date)::integer = %s")
-                params.append(idx)
-        
-        if year_filter and year_filter != "All Years":
-            where_clauses.append("EXTRACT(YEAR FROM date::date)::integer::text = %s")
-            params.append(year_filter)
-        
-        where_sql = "WHERE " + " AND ".join(where_clauses)
-        sql = f"""
-            SELECT date, check_in, check_out, note
-            FROM attendance
-            {where_sql}
-        """
-        cursor.execute(sql, params)
+        cursor.execute(f"""
+            WITH filtered AS (
+                SELECT date, check_in, check_out, note, id
+                FROM attendance
+                {where_sql}
+            ), page AS (
+                SELECT date, check_in, check_out, note, id, ROW_NUMBER() OVER (ORDER BY {order_sql}) AS position
+                FROM filtered
+                ORDER BY {order_sql}
+                LIMIT %s OFFSET %s
+            ), summary AS (
+                SELECT
+                    COUNT(*) AS total_records,
+                    COUNT(DISTINCT date) AS total_days,
+                    COALESCE(SUM(TRUNC(EXTRACT(EPOCH FROM check_out - check_in)))
+                        FILTER (WHERE check_in IS NOT NULL AND check_out IS NOT NULL), 0)::bigint AS total_seconds,
+                    (ARRAY_AGG(check_out ORDER BY id DESC) FILTER (WHERE check_out IS NOT NULL))[1] AS last_checkout
+                FROM filtered
+            )
+            SELECT s.total_records, s.total_days, s.total_seconds, s.last_checkout,
+                   p.date, p.check_in, p.check_out, p.note, p.id
+            FROM summary s
+            LEFT JOIN page p ON TRUE
+            ORDER BY p.position
+        """, params + [limit, offset])
         rows = cursor.fetchall()
-        
-        total_days = set()
-        total_records = 0
-        total_seconds = 0
-        last_checkout = "-"
-        
-        for row in rows:
-            date, check_in, check_out, note = row
-            if date:
-                total_days.add(date)
-            if check_in and check_out:
-                try:
-                    dt_in = datetime.strptime(str(check_in)[:19], "%Y-%m-%d %H:%M:%S") if not isinstance(check_in, datetime) else check_in
-                    dt_out = datetime.strptime(str(check_out)[:19], "%Y-%m-%d %H:%M:%S") if not isinstance(check_out, datetime) else check_out
-                    total_seconds += int((dt_out - dt_in).total_seconds())
-                    last_checkout = check_out
-                except Exception:
-                    pass
-            elif check_out:
-                last_checkout = check_out
-            total_records += 1
-        
         self.db_manager.close()
+
+        first = rows[0]
         return {
-            "total_days": len(total_days),
-            "total_records": total_records,
-            "total_seconds": total_seconds,
-            "last_checkout": last_checkout
+            "records": [tuple(row[4:]) for row in rows if row[8] is not None],
+            "total": first[0],
+            "summary": {
+                "total_days": first[1],
+                "total_records": first[0],
+                "total_seconds": int(first[2]),
+                "last_checkout": first[3] or "-"
+            }
         }
 
+    def get_attendance_years_by_team_id(self, team_id):
+        """Get the distinct years of a team's attendance, ascending."""
+        self.db_manager.connect(write=False)
+        cursor = self.db_manager.connection.cursor()
+        # Walk idx_attendance_team_date one year at a time instead of reading every row
+        cursor.execute("""
+            WITH RECURSIVE years AS (
+                SELECT MIN(date) AS first_date FROM attendance WHERE team_id = %(team_id)s
+                UNION ALL
+                SELECT (SELECT MIN(a.date) FROM attendance a
+                        WHERE a.team_id = %(team_id)s
+                          AND a.date >= make_date(EXTRACT(YEAR FROM y.first_date)::integer + 1, 1, 1))
+                FROM years y
+                WHERE y.first_date IS NOT NULL
+            )
+            SELECT EXTRACT(YEAR FROM first_date)::integer FROM years WHERE first_date IS NOT NULL
+        """, {"team_id": team_id})
+        years = [row[0] for row in cursor.fetchall()]
+        self.db_manager.close()
+        return years
+
     def get_earnings_by_team_id_paged(self, team_id, search_text=None, batch_filter=None, sort_field="File Name", sort_order="desc", offset=0, limit=20):
         """Get paginated earnings for team."""
         self.db_manager.connect(write=False)
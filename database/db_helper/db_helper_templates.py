@@ -13,6 +13,7 @@ class DatabaseTemplatesHelper:
         )
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("templates")
         self.db_manager.close()
 
     def get_template_by_name(self, name):
@@ -58,6 +59,7 @@ class DatabaseTemplatesHelper:
         )
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("templates")
         last_id = cursor.fetchone()[0]
         self.db_manager.close()
         return last_id
@@ -79,6 +81,7 @@ class DatabaseTemplatesHelper:
         cursor.execute("DELETE FROM templates WHERE id = %s", (template_id,))
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("templates")
         self.db_manager.close()
 
     def create_unique_path(self, base_path):
@@ -49,6 +49,7 @@ class DatabaseUrlsHelper:
         provider_id = cursor.fetchone()[0]
         self.db_manager.close()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("url_provider")
         return provider_id
 
     def update_url_provider(self, provider_id, name, description, status, email, password):
@@ -65,6 +66,7 @@ class DatabaseUrlsHelper:
         self.db_manager.connection.commit()
         self.db_manager.close()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("url_provider")
 
     def delete_url_provider(self, provider_id):
         """Delete URL provider from database"""
@@ -76,6 +78,7 @@ class DatabaseUrlsHelper:
         self.db_manager.connection.commit()
         self.db_manager.close()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("url_provider")
 
     def get_url_provider_by_id(self, provider_id):
         """Get specific URL provider by ID"""
@@ -334,6 +334,7 @@ class DatabaseWalletHelper:
         category_id = cursor.fetchone()[0]
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_categories")
         self.db_manager.close()
         return category_id
     
@@ -347,6 +348,7 @@ class DatabaseWalletHelper:
         )
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_categories")
         self.db_manager.close()
     
     def delete_category(self, category_id):
@@ -356,6 +358,7 @@ class DatabaseWalletHelper:
         cursor.execute("DELETE FROM wallet_categories WHERE id = %s", (category_id,))
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_categories")
         self.db_manager.close()
     
     def add_currency(self, code, name, symbol, note=""):
@@ -369,6 +372,7 @@ class DatabaseWalletHelper:
         currency_id = cursor.fetchone()[0]
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_currency")
         self.db_manager.close()
         return currency_id
     
@@ -382,6 +386,7 @@ class DatabaseWalletHelper:
         )
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_currency")
         self.db_manager.close()
     
     def delete_currency(self, currency_id):
@@ -391,6 +396,7 @@ class DatabaseWalletHelper:
         cursor.execute("DELETE FROM wallet_currency WHERE id = %s", (currency_id,))
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_currency")
         self.db_manager.close()
     
     def add_transaction_status(self, name, note=""):
@@ -404,6 +410,7 @@ class DatabaseWalletHelper:
         status_id = cursor.fetchone()[0]
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_transaction_statuses")
         self.db_manager.close()
         return status_id
     
@@ -417,6 +424,7 @@ class DatabaseWalletHelper:
         )
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_transaction_statuses")
         self.db_manager.close()
     
     def delete_transaction_status(self, status_id):
@@ -426,6 +434,7 @@ class DatabaseWalletHelper:
         cursor.execute("DELETE FROM wallet_transaction_statuses WHERE id = %s", (status_id,))
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_transaction_statuses")
         self.db_manager.close()
     
     def add_pocket(self, name, pocket_type="", icon="", color="", image="", settings="", note=""):
@@ -439,6 +448,7 @@ class DatabaseWalletHelper:
         pocket_id = cursor.fetchone()[0]
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_pockets")
         self.db_manager.close()
         return pocket_id
 
@@ -462,6 +472,7 @@ class DatabaseWalletHelper:
             location_id = cursor.fetchone()[0]
             self.db_manager.connection.commit()
             self.db_manager.create_temp_file()
+            self.db_manager.invalidate_lookups("wallet_transaction_locations")
 
             # If an image source was provided, save it into managed folder using location_id
             if image_src_path and basedir:
@@ -476,6 +487,7 @@ class DatabaseWalletHelper:
                         cursor.execute("UPDATE wallet_transaction_locations SET image = %s WHERE id = %s", (rel, location_id))
                         self.db_manager.connection.commit()
                         self.db_manager.create_temp_file()
+                        self.db_manager.invalidate_lookups("wallet_transaction_locations")
                         try:
                             src_abs = image_src_path if os.path.isabs(image_src_path) else os.path.join(basedir, image_src_path)
                             tmp_root = os.path.abspath(os.path.join(basedir, "images", "locations", "tmp"))
@@ -532,6 +544,7 @@ class DatabaseWalletHelper:
             """, (name, location_type, address, city, country, postal_code, online_url, contact, phone, email, status, description, rating, note, new_rel, location_id))
             self.db_manager.connection.commit()
             self.db_manager.create_temp_file()
+            self.db_manager.invalidate_lookups("wallet_transaction_locations")
 
             # If we saved a new image, try to remove old image file to prevent orphan
             if image_src_path and basedir and existing_image and existing_image != new_rel:
@@ -581,6 +594,7 @@ class DatabaseWalletHelper:
             cursor.execute("DELETE FROM wallet_transaction_locations WHERE id = %s", (location_id,))
             self.db_manager.connection.commit()
             self.db_manager.create_temp_file()
+            self.db_manager.invalidate_lookups("wallet_transaction_locations")
 
             
             try:
@@ -609,6 +623,7 @@ class DatabaseWalletHelper:
         )
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_pockets")
         self.db_manager.close()
     
     def delete_pocket(self, pocket_id):
@@ -618,6 +633,7 @@ class DatabaseWalletHelper:
         cursor.execute("DELETE FROM wallet_pockets WHERE id = %s", (pocket_id,))
         self.db_manager.connection.commit()
         self.db_manager.create_temp_file()
+        self.db_manager.invalidate_lookups("wallet_pockets")
         self.db_manager.close()
     
     def add_card(self, pocket_id, card_name, card_number, card_type="", vendor="", issuer="", 
@@ -19,6 +19,9 @@ from .db_helper.db_helper_wallet import DatabaseWalletHelper
 from .db_helper.db_helper_migration import DatabaseMigrationHelper
 from .db_helper.db_helper_polling import DatabasePollingHelper
 from .db_helper.db_helper_microstock import DatabaseMicrostockHelper
+from .db_helper.db_helper_query_executor import DatabaseQueryExecutor
+from .db_helper.db_helper_lookup_cache import DatabaseLookupCache
+from .db_helper.db_helper_data_caching import DatabaseCachingHelper
 
 
 class DatabaseManager(QObject):
@@ -26,6 +29,9 @@ class DatabaseManager(QObject):
     """Optimized Database Manager using helper classes for modular organization."""
     
     data_changed = Signal()
+    files_changed = Signal(list)  # changed file ids; empty means any file may have changed
+    wallet_changed = Signal(str)  # wallet table name
+    attendance_changed = Signal()
     status_message = Signal(str, int)
     
     def __init__(self, config_manager, window_config_manager, parent_widget=None, first_launch=False, auto_initialize=True):
@@ -37,12 +43,13 @@ class DatabaseManager(QObject):
         
         self.db_dir = "database"
         
-        self.connection = None
         self.session_id = str(int(time.time() * 1000))
         self.temp_dir = os.path.join(self.db_dir, "temp")
         self._parent_widget = parent_widget
 
+        self.lookup_cache = DatabaseLookupCache()
         self.connection_helper = DatabaseConnectionHelper(self)
+        self.query_executor = DatabaseQueryExecutor(self)
         self.migration_helper = DatabaseMigrationHelper(self)
         self.backup_helper = DatabaseBackupHelper(self)
         self.polling_helper = DatabasePollingHelper(self)
@@ -56,6 +63,7 @@ class DatabaseManager(QObject):
         self.batch_manager_helper = DatabaseBatchManagerHelper(self)
         self.wallet_helper = DatabaseWalletHelper(self)
         self.microstock_helper = DatabaseMicrostockHelper(self)
+        self.caching_helper = DatabaseCachingHelper(self, config_manager)
 
         if auto_initialize:
             self.connection_helper.ensure_database_exists()
@@ -64,38 +72,101 @@ class DatabaseManager(QObject):
             self.backup_helper.setup_auto_backup_timer()
 
     # Core connection methods - delegate to connection helper
+    @property
+    def connection(self):
+        """Pooled connection checked out by the calling thread (None when not connected)."""
+        return self.connection_helper.current_connection()
+
     def connect(self, write=True):
-        """Connect to database."""
+        """Check out a pooled connection for the calling thread."""
         return self.connection_helper.connect(write)
 
     def close(self):
-        """Close database connection."""
+        """Return the calling thread's connection to its pool."""
         return self.connection_helper.close()
 
+    def checkout(self, write=False):
+        """Context manager yielding a pooled connection."""
+        return self.connection_helper.checkout(write)
+
+    def cursor(self, write=False):
+        """Context manager yielding a cursor on a pooled connection."""
+        return self.connection_helper.cursor(write)
+
+    def transaction(self):
+        """Context manager grouping helper calls into one transaction with a single commit and notify."""
+        return self.connection_helper.transaction()
+
+    def shutdown(self):
+        """Cancel background queries and close all pooled and listener connections."""
+        self.query_executor.shutdown()
+        self.caching_helper.close_cache()
+        return self.connection_helper.shutdown()
+
+    def execute_prepared(self, cursor, name, params=()):
+        """Execute a registered prepared statement on cursor."""
+        return self.connection_helper.execute_prepared(cursor, name, params)
+
+    def get_prepared_statement_stats(self):
+        """Get prepare/hit counters of the prepared statement registry."""
+        return self.connection_helper.get_prepared_statement_stats()
+
+    def submit_query(self, key, fn, *args, on_result=None, on_error=None, write=False, **kwargs):
+        """Run fn off the GUI thread; a newer request with the same key supersedes this one."""
+        return self.query_executor.submit(key, fn, *args, on_result=on_result, on_error=on_error,
+                                          write=write, **kwargs)
+
+    def cancel_query(self, key):
+        """Cancel the pending background query for key."""
+        return self.query_executor.cancel(key)
+
     def create_temp_file(self):
         """Create temporary file to signal changes."""
         return self.connection_helper.create_temp_file()
 
+    def notify_in_transaction(self, cursor):
+        """Signal changes from inside cursor's transaction; sent on commit."""
+        return self.polling_helper.notify_in_transaction(cursor)
+
+    def invalidate_lookups(self, *tables):
+        """Drop cached lookups read from tables (all lookups when none given)."""
+        return self.lookup_cache.invalidate(*tables)
+
+    def get_lookup_cache_stats(self):
+        """Get hit/miss counters of the lookup table cache."""
+        return self.lookup_cache.get_stats()
+
+    def get_replica_status(self):
+        """Get the state of the local read replica (enabled, available, offline, last sync)."""
+        return self.caching_helper.get_status()
+
     def get_status_id(self, status_name):
         """Get status ID by name."""
-        return self.files_helper.get_status_id(status_name)
+        return self.lookup_cache.get(("status_id", status_name), ("statuses",),
+                                     self.caching_helper.read, "status_id",
+                                     self.files_helper.get_status_id, status_name)
 
     def get_status_id_by_name(self, status_name):
         """Get status ID by name (alias for compatibility)."""
-        return self.files_helper.get_status_id(status_name)
+        return self.get_status_id(status_name)
 
     def get_status_name_by_id(self, status_id):
         """Get status name by ID."""
-        return self.files_helper.get_status_name_by_id(status_id)
+        return self.lookup_cache.get(("status_name", status_id), ("statuses",),
+                                     self.files_helper.get_status_name_by_id, status_id)
 
     # Categories methods - delegate to categories helper
     def get_all_categories(self):
         """Get all categories."""
-        return self.categories_helper.get_all_categories()
+        return self.lookup_cache.get(("categories",), ("categories",),
+                                     self.caching_helper.read, "all_categories",
+                                     self.categories_helper.get_all_categories)
 
     def get_subcategories_by_category(self, category_name):
         """Get subcategories by category."""
-        return self.categories_helper.get_subcategories_by_category(category_name)
+        return self.lookup_cache.get(("subcategories", category_name), ("categories", "subcategories"),
+                                     self.caching_helper.read, "subcategories_by_category",
+                                     self.categories_helper.get_subcategories_by_category, category_name)
 
     def get_or_create_category(self, category_name):
         """Get or create category."""
@@ -116,11 +187,12 @@ class DatabaseManager(QObject):
     # Templates methods - delegate to templates helper
     def get_all_templates(self):
         """Get all templates."""
-        return self.templates_helper.get_all_templates()
+        return self.lookup_cache.get(("templates",), ("templates",), self.templates_helper.get_all_templates)
 
     def get_template_by_id(self, template_id):
         """Get template by ID."""
-        return self.templates_helper.get_template_by_id(template_id)
+        return self.lookup_cache.get(("template_by_id", template_id), ("templates",),
+                                     self.templates_helper.get_template_by_id, template_id)
 
     def insert_template(self, name, content):
         """Insert template."""
@@ -157,21 +229,50 @@ class DatabaseManager(QObject):
 
     def get_files_page(self, page=1, page_size=20, search_query=None, sort_field="date", sort_order="desc", 
                        status_value=None, client_id=None, batch_number=None, root_value=None, 
-                       category_value=None, subcategory_value=None, microstock_platform_id=None):
+                       category_value=None, subcategory_value=None, microstock_platform_id=None, seek=None):
         """Get files page."""
-        return self.files_helper.get_files_page(page, page_size, search_query, sort_field, sort_order,
-                                                status_value, client_id, batch_number, root_value, 
-                                                category_value, subcategory_value, microstock_platform_id)
+        return self.caching_helper.read("files_page", self.files_helper.get_files_page,
+                                        page, page_size, search_query, sort_field, sort_order,
+                                        status_value, client_id, batch_number, root_value,
+                                        category_value, subcategory_value, microstock_platform_id, seek)
 
     def count_files(self, search_query=None, status_value=None, client_id=None, batch_number=None, 
                     root_value=None, category_value=None, subcategory_value=None, microstock_platform_id=None):
         """Count files."""
-        return self.files_helper.count_files(search_query, status_value, client_id, batch_number,
-                                             root_value, category_value, subcategory_value, microstock_platform_id)
+        return self.caching_helper.read("count_files", self.files_helper.count_files,
+                                        search_query, status_value, client_id, batch_number,
+                                        root_value, category_value, subcategory_value, microstock_platform_id)
+
+    def get_files_page_with_count(self, page=1, page_size=20, search_query=None, sort_field="date", sort_order="desc",
+                                  status_value=None, client_id=None, batch_number=None, root_value=None,
+                                  category_value=None, subcategory_value=None, microstock_platform_id=None):
+        """Get a files page and the filtered total as (rows, total)."""
+        return self.caching_helper.read(
+            "files_page_with_count", self.files_helper.get_files_page_with_count,
+            page, page_size, search_query, sort_field, sort_order, status_value, client_id, batch_number,
+            root_value, category_value, subcategory_value, microstock_platform_id
+        )
+
+    def get_file_totals(self):
+        """Get global file totals: {"total": int, "by_status": {name: int}}."""
+        return self.caching_helper.read("file_totals", self.files_helper.get_file_totals)
+
+    def refresh_file_totals(self):
+        """Rebuild files.date_value and the global file counters."""
+        return self.files_helper.refresh_file_totals()
+
+    def get_files_page_details(self, file_ids):
+        """Get price, earnings, client and batch details for a page of files."""
+        return self.caching_helper.read("files_page_details", self.files_helper.get_files_page_details, file_ids)
+
+    def get_search_mode(self):
+        """Get the file search mode ("trigram" or "basic")."""
+        return self.files_helper.get_search_mode()
 
     def get_all_roots(self):
         """Get all roots."""
-        return self.files_helper.get_all_roots()
+        return self.lookup_cache.get(("roots",), ("files",), self.caching_helper.read,
+                                     "all_roots", self.files_helper.get_all_roots)
 
     def get_file_related_delete_info(self, file_id):
         """Get file related delete info."""
@@ -188,11 +289,12 @@ class DatabaseManager(QObject):
     # Clients methods - delegate to clients helper
     def get_all_clients(self):
         """Get all clients."""
-        return self.clients_helper.get_all_clients()
+        return self.lookup_cache.get(("clients",), ("client",), self.clients_helper.get_all_clients)
 
     def get_all_clients_simple(self):
         """Get simple clients list."""
-        return self.clients_helper.get_all_clients_simple()
+        return self.lookup_cache.get(("clients_simple",), ("client",), self.caching_helper.read,
+                                     "all_clients_simple", self.clients_helper.get_all_clients_simple)
 
     def add_client(self, client_name, contact, links, status, note):
         """Add client."""
@@ -248,6 +350,25 @@ class DatabaseManager(QObject):
         """Update file client batch client."""
         return self.clients_helper.update_file_client_batch_client(file_id, old_client_id, new_client_id)
 
+    def assign_files_client_bulk(self, file_ids, client_id):
+        """Assign many files to a client in set-based statements."""
+        return self.clients_helper.assign_files_client_bulk(file_ids, client_id)
+
+    def assign_files_client_batch_bulk(self, file_ids, client_id, batch_number, note=""):
+        """Assign many files to a client batch in one statement."""
+        return self.clients_helper.assign_files_client_batch_bulk(file_ids, client_id, batch_number, note)
+
+    def update_files_status_bulk(self, file_ids, status_id):
+        """Update the status of many files in one statement."""
+        return self.clients_helper.update_files_status_bulk(file_ids, status_id)
+
+    def assign_files_bulk(self, file_ids, price=None, currency=None, note="", client_id=None,
+                          batch_number=None, status_id=None, operational_percentage=None):
+        """Apply price, client, batch and status to many files in one transaction."""
+        return self.clients_helper.assign_files_bulk(
+            file_ids, price, currency, note, client_id, batch_number, status_id, operational_percentage
+        )
+
     # Batch methods - delegate to clients helper
     def add_batch_number(self, batch_number, note="", client_id=None):
         """Add batch number."""
@@ -291,7 +412,8 @@ class DatabaseManager(QObject):
 
     def get_batch_numbers_by_client(self, client_id):
         """Get batch numbers by client (with note, created_at)."""
-        return self.clients_helper.get_batch_numbers_by_client(client_id)
+        return self.caching_helper.read("batch_numbers_by_client", self.clients_helper.get_batch_numbers_by_client,
+                                        client_id)
 
     def get_batch_creation_date(self, batch_number, client_id):
         """Get batch creation date."""
@@ -310,6 +432,14 @@ class DatabaseManager(QObject):
         """Update team."""
         return self.teams_helper.update_team(old_username, new_username, full_name, contact, address, email, phone, attendance_pin, started_at, bank, account_number, account_holder, profile_image)
 
+    def get_present_teams(self):
+        """Get team members currently checked in, without profile images."""
+        return self.teams_helper.get_present_teams()
+
+    def get_team_profile_images(self, team_ids):
+        """Get profile images with their updated_at for the given teams."""
+        return self.teams_helper.get_team_profile_images(team_ids)
+
     def get_team_profile_data(self, username=None):
         """Get team profile data."""
         return self.teams_helper.get_team_profile_data(username)
@@ -343,6 +473,14 @@ class DatabaseManager(QObject):
         """Attendance summary by team ID filtered."""
         return self.teams_helper.attendance_summary_by_team_id_filtered(team_id, search_text, day_filter, month_filter, year_filter)
 
+    def get_attendance_page_by_team_id(self, team_id, search_text=None, day_filter=None, month_filter=None, year_filter=None, sort_field="date", sort_order="desc", offset=0, limit=20):
+        """Get an attendance page with its filtered count and summary in one query."""
+        return self.teams_helper.get_attendance_page_by_team_id(team_id, search_text, day_filter, month_filter, year_filter, sort_field, sort_order, offset, limit)
+
+    def get_attendance_years_by_team_id(self, team_id):
+        """Get the distinct years of a team's attendance."""
+        return self.teams_helper.get_attendance_years_by_team_id(team_id)
+
     def get_earnings_by_team_id_paged(self, team_id, search_text=None, batch_filter=None, sort_field="File Name", sort_order="desc", offset=0, limit=20):
         """Get earnings by team ID paged."""
         return self.teams_helper.get_earnings_by_team_id_paged(team_id, search_text, batch_filter, sort_field, sort_order, offset, limit)
@@ -384,6 +522,14 @@ class DatabaseManager(QObject):
         """Update earnings shares with percentage."""
         return self.price_helper.update_earnings_shares_with_percentage(file_id, operational_percentage)
 
+    def assign_prices_bulk(self, file_ids, price, currency, note=""):
+        """Assign the same price to many files in one statement."""
+        return self.price_helper.assign_prices_bulk(file_ids, price, currency, note)
+
+    def recalculate_earnings_shares(self, operational_percentage, file_ids=None, client_id=None, batch_number=None):
+        """Recalculate earnings shares for many files in one statement."""
+        return self.price_helper.recalculate_earnings_shares(operational_percentage, file_ids, client_id, batch_number)
+
     def remove_earning(self, earning_id, file_id):
         """Remove earning."""
         return self.price_helper.remove_earning(earning_id, file_id)
@@ -397,6 +543,10 @@ class DatabaseManager(QObject):
         """Auto backup database hourly."""
         return self.backup_helper.auto_backup_database_hourly()
 
+    def get_change_fingerprint(self, tables=None):
+        """Get a token that changes whenever rows of tables (default: all) are written."""
+        return self.backup_helper.get_change_fingerprint(tables)
+
     def manual_backup_database(self):
         """Manual backup database."""
         return self.backup_helper.manual_backup_database()
@@ -420,7 +570,7 @@ class DatabaseManager(QObject):
     # URL Provider methods - delegate to urls helper
     def get_all_url_providers(self):
         """Get all URL providers."""
-        return self.urls_helper.get_all_url_providers()
+        return self.lookup_cache.get(("url_providers",), ("url_provider",), self.urls_helper.get_all_url_providers)
 
     def add_url_provider(self, name, description, status, email, password):
         """Add URL provider."""
@@ -436,7 +586,8 @@ class DatabaseManager(QObject):
 
     def get_url_provider_by_id(self, provider_id):
         """Get URL provider by ID."""
-        return self.urls_helper.get_url_provider_by_id(provider_id)
+        return self.lookup_cache.get(("url_provider", provider_id), ("url_provider",),
+                                     self.urls_helper.get_url_provider_by_id, provider_id)
 
     # File URL methods - delegate to urls helper
     def add_file_url(self, file_id, provider_id, url_value, note=""):
@@ -481,7 +632,8 @@ class DatabaseManager(QObject):
     
     def get_template_by_name(self, name):
         """Get template by name (delegasi ke templates_helper)"""
-        return self.templates_helper.get_template_by_name(name)
+        return self.lookup_cache.get(("template_by_name", name), ("templates",),
+                                     self.templates_helper.get_template_by_name, name)
     
     def update_template(self, template_id, name, content):
         """Update template by id (delegasi ke templates_helper)"""
@@ -527,22 +679,26 @@ class DatabaseManager(QObject):
         return self.batch_manager_helper.get_all_batches_with_status_counts()
     
     def get_all_wallet_pockets(self):
-        return self.wallet_helper.get_all_pockets()
+        return self.lookup_cache.get(("wallet_pockets",), ("wallet_pockets",), self.wallet_helper.get_all_pockets)
     
     def get_all_wallet_cards(self, pocket_id=None):
         return self.wallet_helper.get_all_cards(pocket_id)
     
     def get_all_wallet_categories(self):
-        return self.wallet_helper.get_all_categories()
+        return self.lookup_cache.get(("wallet_categories",), ("wallet_categories",),
+                                     self.wallet_helper.get_all_categories)
     
     def get_all_wallet_currencies(self):
-        return self.wallet_helper.get_all_currencies()
+        return self.lookup_cache.get(("wallet_currencies",), ("wallet_currency",),
+                                     self.wallet_helper.get_all_currencies)
     
     def get_all_wallet_transaction_statuses(self):
-        return self.wallet_helper.get_all_transaction_statuses()
+        return self.lookup_cache.get(("wallet_transaction_statuses",), ("wallet_transaction_statuses",),
+                                     self.wallet_helper.get_all_transaction_statuses)
     
     def get_all_wallet_locations(self):
-        return self.wallet_helper.get_all_locations()
+        return self.lookup_cache.get(("wallet_locations",), ("wallet_transaction_locations",),
+                                     self.wallet_helper.get_all_locations)
     
     def get_wallet_transactions(self, pocket_id=None, limit=100, offset=0):
         return self.wallet_helper.get_transactions(pocket_id, limit, offset)
@@ -551,7 +707,8 @@ class DatabaseManager(QObject):
         return self.wallet_helper.get_transaction_items(transaction_id)
     # Microstock methods - delegate to microstock helper
     def get_all_microstock_platforms(self):
-        return self.microstock_helper.get_all_platforms()
+        return self.lookup_cache.get(("microstock_platforms",), ("microstock_platforms", "file_microstock_status"),
+                                     self.microstock_helper.get_all_platforms)
 
     def add_microstock_platform(self, name, url, description, note):
         return self.microstock_helper.add_platform(name, url, description, note)
@@ -572,4 +729,4 @@ class DatabaseManager(QObject):
         return self.microstock_helper.delete_file_microstock_status(file_id, platform_id)
 
     def get_all_microstock_statuses(self):
-        return self.microstock_helper.get_all_statuses()
\ No newline at end of file
+        return self.lookup_cache.get(("microstock_statuses",), ("statuses",), self.microstock_helper.get_all_statuses)
\ No newline at end of file
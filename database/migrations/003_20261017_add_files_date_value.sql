@@ -0,0 +1,95 @@
+-- Migration: 003_20261017_add_files_date_value.sql
+-- Date: 2026-10-17
+-- Purpose: Persist the parsed project date so date sorting can use an index.
+-- Description: files.date stores folder-style text such as "2025\Januari\05"
+--              (or "05\January\2025"). The main table used to parse it with a
+--              nested CASE expression on every row of every query, forcing a
+--              full scan and sort. This migration adds files.date_value (DATE),
+--              backfills it, keeps it in sync with a trigger on INSERT/UPDATE
+--              and indexes it together with id for date-ordered pagination.
+-- DDL Summary:
+--   CREATE FUNCTION parse_archive_date(TEXT) RETURNS DATE
+--   ALTER TABLE files ADD COLUMN date_value DATE
+--   CREATE FUNCTION files_set_date_value() + TRIGGER trg_files_date_value
+--   CREATE INDEX idx_files_date_value_id ON files (date_value DESC NULLS LAST, id DESC)
+-- Data Migration: UPDATE files SET date_value = parse_archive_date(date)
+-- Rollback Steps: DROP TRIGGER trg_files_date_value ON files;
+--                 DROP FUNCTION files_set_date_value(); DROP FUNCTION parse_archive_date(TEXT);
+--                 ALTER TABLE files DROP COLUMN date_value;
+-- Prerequisites: Migration 001_* must be applied first.
+-- Notes: Unparseable dates are stored as NULL and sort as the lowest value
+--        (last when descending, first when ascending) so both directions can
+--        scan the index.
+
+CREATE OR REPLACE FUNCTION parse_archive_date(raw TEXT) RETURNS DATE AS $$
+DECLARE
+    parts TEXT[];
+    year_part TEXT;
+    day_part TEXT;
+    month_num INTEGER;
+    month_start DATE;
+BEGIN
+    IF raw IS NULL OR btrim(raw) = '' THEN
+        RETURN NULL;
+    END IF;
+
+    IF position(chr(92) in raw) = 0 THEN
+        IF raw ~ '^\d{4}-\d{1,2}-\d{1,2}' THEN
+            RETURN substring(raw from '^\d{4}-\d{1,2}-\d{1,2}')::DATE;
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    parts := string_to_array(raw, chr(92));
+    IF length(parts[1]) = 4 THEN
+        year_part := parts[1];
+        day_part := parts[3];
+    ELSE
+        year_part := parts[3];
+        day_part := parts[1];
+    END IF;
+
+    month_num := CASE lower(btrim(parts[2]))
+        WHEN 'januari' THEN 1 WHEN 'january' THEN 1
+        WHEN 'februari' THEN 2 WHEN 'february' THEN 2
+        WHEN 'maret' THEN 3 WHEN 'march' THEN 3
+        WHEN 'april' THEN 4
+        WHEN 'mei' THEN 5 WHEN 'may' THEN 5
+        WHEN 'juni' THEN 6 WHEN 'june' THEN 6
+        WHEN 'juli' THEN 7 WHEN 'july' THEN 7
+        WHEN 'agustus' THEN 8 WHEN 'august' THEN 8
+        WHEN 'september' THEN 9
+        WHEN 'oktober' THEN 10 WHEN 'october' THEN 10
+        WHEN 'november' THEN 11
+        WHEN 'desember' THEN 12 WHEN 'december' THEN 12
+        ELSE 1
+    END;
+
+    -- Clamp out-of-range days (e.g. "31" in February) to the month end
+    month_start := make_date(year_part::INTEGER, month_num, 1);
+    RETURN LEAST(
+        month_start + (GREATEST(day_part::INTEGER, 1) - 1),
+        (month_start + INTERVAL '1 month' - INTERVAL '1 day')::DATE
+    );
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+ALTER TABLE files ADD COLUMN IF NOT EXISTS date_value DATE;
+
+UPDATE files SET date_value = parse_archive_date(date);
+
+CREATE OR REPLACE FUNCTION files_set_date_value() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.date_value := parse_archive_date(NEW.date);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_files_date_value ON files;
+CREATE TRIGGER trg_files_date_value
+    BEFORE INSERT OR UPDATE OF date ON files
+    FOR EACH ROW EXECUTE FUNCTION files_set_date_value();
+
+CREATE INDEX IF NOT EXISTS idx_files_date_value_id ON files (date_value DESC NULLS LAST, id DESC);
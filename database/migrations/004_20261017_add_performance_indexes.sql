@@ -0,0 +1,66 @@
+-- migration: no-transaction
+-- Migration: 004_20261017_add_performance_indexes.sql
+-- Date: 2026-10-17
+-- Purpose: Index the foreign keys and filter columns used by the hot helper queries.
+-- Description: Until now the only indexes came from primary keys and UNIQUE
+--              constraints, so every per-file lookup in the clients, price,
+--              URL, teams and wallet helpers was a sequential scan. The indexes
+--              below match the WHERE/ORDER BY clauses those helpers issue.
+--              They are built with CREATE INDEX CONCURRENTLY so an existing
+--              archive stays writable while they build; the
+--              "migration: no-transaction" directive on the first line makes
+--              DatabaseMigrationHelper run each statement in autocommit mode.
+-- DDL Summary:
+--   files: (status_id), (root), (category_id, subcategory_id), (subcategory_id)
+--   subcategories: (category_id)
+--   file_client_batch: (file_id, client_id), (batch_number, client_id)
+--   file_client_price: (file_id), (client_id)
+--   batch_list: (client_id)
+--   earnings: (item_price_id), (team_id)
+--   attendance: (team_id, date)
+--   file_url: (file_id), (provider_id)
+--   file_microstock_status: (platform_id)
+--   wallet_transactions: (pocket_id, transaction_date DESC), (card_id), (destination_pocket_id)
+--   wallet_transaction_items: (wallet_transaction_id)
+--   wallet_transactions_invoice_prove: (wallet_transaction_id)
+-- Data Migration: None.
+-- Rollback Steps: DROP INDEX CONCURRENTLY IF EXISTS <index name>; for each index below.
+-- Prerequisites: Migrations 001_* and 002_* must be applied first.
+-- Testing: python -m database.benchmarks.index_query_plans prints the plans of
+--          the affected queries with and without these indexes.
+-- Notes: A failed concurrent build leaves an INVALID index behind; the
+--        migration helper drops invalid indexes named in this file before
+--        retrying, so re-running the migration is safe.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_files_status_id ON files (status_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_files_root ON files (root);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_files_category_subcategory ON files (category_id, subcategory_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_files_subcategory_id ON files (subcategory_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subcategories_category_id ON subcategories (category_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_client_batch_file_client ON file_client_batch (file_id, client_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_client_batch_batch_client ON file_client_batch (batch_number, client_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_client_price_file_id ON file_client_price (file_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_client_price_client_id ON file_client_price (client_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_batch_list_client_id ON batch_list (client_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_earnings_item_price_id ON earnings (item_price_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_earnings_team_id ON earnings (team_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_attendance_team_date ON attendance (team_id, date);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_url_file_id ON file_url (file_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_url_provider_id ON file_url (provider_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_microstock_status_platform_id ON file_microstock_status (platform_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_wallet_transactions_pocket_date ON wallet_transactions (pocket_id, transaction_date DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_wallet_transactions_card_id ON wallet_transactions (card_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_wallet_transactions_destination_pocket_id ON wallet_transactions (destination_pocket_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_wallet_transaction_items_transaction_id ON wallet_transaction_items (wallet_transaction_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_wallet_invoice_prove_transaction_id ON wallet_transactions_invoice_prove (wallet_transaction_id);
@@ -0,0 +1,37 @@
+-- Migration: 005_20261017_add_files_trigram_search.sql
+-- Date: 2026-10-17
+-- Purpose: Make the main search box use an index instead of a full scan.
+-- Description: The search box filters files with f.name/f.path ILIKE '%text%'.
+--              A leading wildcard cannot use a B-tree, so every search scanned
+--              the whole archive for the count and again for the page. pg_trgm
+--              GIN indexes serve ILIKE '%text%' directly and provide
+--              similarity() for relevance ranking. The extension is optional:
+--              when it cannot be installed (not shipped with the server or no
+--              permission) this migration only logs a notice and
+--              DatabaseFilesHelper keeps using plain ILIKE.
+-- DDL Summary:
+--   CREATE EXTENSION IF NOT EXISTS pg_trgm (best effort)
+--   CREATE INDEX idx_files_name_trgm ON files USING gin (name gin_trgm_ops)
+--   CREATE INDEX idx_files_path_trgm ON files USING gin (path gin_trgm_ops)
+-- Data Migration: None.
+-- Rollback Steps: DROP INDEX IF EXISTS idx_files_name_trgm;
+--                 DROP INDEX IF EXISTS idx_files_path_trgm;
+--                 DROP EXTENSION IF EXISTS pg_trgm;
+-- Prerequisites: Migration 004_* must be applied first.
+-- Notes: Installing pg_trgm later and re-running the DO block below enables
+--        the indexed search mode without any code change.
+
+DO $$
+BEGIN
+    BEGIN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    EXCEPTION WHEN others THEN
+        RAISE NOTICE 'pg_trgm is not available (%), search falls back to ILIKE scans', SQLERRM;
+    END;
+
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_files_name_trgm ON files USING gin (name gin_trgm_ops)';
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_files_path_trgm ON files USING gin (path gin_trgm_ops)';
+    END IF;
+END;
+$$;
@@ -0,0 +1,85 @@
+-- Migration: 006_20261017_add_file_status_counts.sql
+-- Date: 2026-10-17
+-- Purpose: Keep the global file totals (all files, per status) as counters.
+-- Description: The main window showed "total" and "Draft" counts by running
+--              COUNT(*) over files on every page load. file_status_counts holds
+--              one row per status and is kept current by statement-level
+--              triggers on files, so reading the totals touches a handful of
+--              rows no matter how large the archive is. Bulk inserts/updates
+--              adjust the counters once per statement via transition tables.
+-- DDL Summary:
+--   CREATE TABLE file_status_counts (status_id PK, file_count)
+--   CREATE FUNCTION refresh_file_status_counts()
+--   CREATE FUNCTION files_track_status_counts() + triggers trg_files_status_counts_{ins,upd,del,trunc}
+-- Data Migration: SELECT refresh_file_status_counts() (initial backfill)
+-- Rollback Steps: DROP TRIGGER trg_files_status_counts_ins ON files; (and _upd, _del, _trunc)
+--                 DROP FUNCTION files_track_status_counts(); DROP FUNCTION refresh_file_status_counts();
+--                 DROP TABLE file_status_counts;
+-- Prerequisites: Migration 005_* must be applied first.
+-- Notes: Restores and CSV imports load data with triggers disabled; the backup
+--        helper calls refresh_file_status_counts() afterwards to rebuild the
+--        counters from files.
+
+CREATE TABLE IF NOT EXISTS file_status_counts (
+    status_id INTEGER PRIMARY KEY,
+    file_count BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION refresh_file_status_counts() RETURNS VOID AS $$
+BEGIN
+    DELETE FROM file_status_counts;
+    INSERT INTO file_status_counts (status_id, file_count)
+    SELECT status_id, COUNT(*) FROM files WHERE status_id IS NOT NULL GROUP BY status_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION files_track_status_counts() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM file_status_counts;
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO file_status_counts AS fsc (status_id, file_count)
+        SELECT status_id, COUNT(*) FROM new_rows WHERE status_id IS NOT NULL GROUP BY status_id
+        ON CONFLICT (status_id) DO UPDATE SET file_count = fsc.file_count + EXCLUDED.file_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO file_status_counts AS fsc (status_id, file_count)
+        SELECT status_id, -COUNT(*) FROM old_rows WHERE status_id IS NOT NULL GROUP BY status_id
+        ON CONFLICT (status_id) DO UPDATE SET file_count = fsc.file_count + EXCLUDED.file_count;
+    ELSE
+        -- Only touch counters whose status actually changed, so plain
+        -- name/path edits do not lock the counter rows
+        INSERT INTO file_status_counts AS fsc (status_id, file_count)
+        SELECT status_id, SUM(delta) FROM (
+            SELECT status_id, 1 AS delta FROM new_rows WHERE status_id IS NOT NULL
+            UNION ALL
+            SELECT status_id, -1 AS delta FROM old_rows WHERE status_id IS NOT NULL
+        ) changes
+        GROUP BY status_id
+        HAVING SUM(delta) <> 0
+        ON CONFLICT (status_id) DO UPDATE SET file_count = fsc.file_count + EXCLUDED.file_count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_files_status_counts_ins ON files;
+CREATE TRIGGER trg_files_status_counts_ins
+    AFTER INSERT ON files REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION files_track_status_counts();
+
+DROP TRIGGER IF EXISTS trg_files_status_counts_upd ON files;
+CREATE TRIGGER trg_files_status_counts_upd
+    AFTER UPDATE ON files REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION files_track_status_counts();
+
+DROP TRIGGER IF EXISTS trg_files_status_counts_del ON files;
+CREATE TRIGGER trg_files_status_counts_del
+    AFTER DELETE ON files REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION files_track_status_counts();
+
+DROP TRIGGER IF EXISTS trg_files_status_counts_trunc ON files;
+CREATE TRIGGER trg_files_status_counts_trunc
+    AFTER TRUNCATE ON files
+    FOR EACH STATEMENT EXECUTE FUNCTION files_track_status_counts();
+
+SELECT refresh_file_status_counts();
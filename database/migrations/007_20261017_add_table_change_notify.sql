@@ -0,0 +1,140 @@
+-- Migration: 007_20261017_add_table_change_notify.sql
+-- Date: 2026-10-17
+-- Purpose: Announce data changes per table so clients refresh only what changed.
+-- Description: Clients used to learn about other sessions' writes from an
+--              untyped "NOTIFY data_changed" and reloaded every view. Each
+--              watched table now sends a JSON payload on channel
+--              table_changed when a statement touches it:
+--                {"table": "files", "op": "UPDATE", "ids": [1, 2], "session": "..."}
+--              ids are taken from the column passed as the trigger argument
+--              (file_id for the per-file tables, so they are file ids), are
+--              null for tables without one and when a statement touches more
+--              than 500 rows. session is the app.session_id setting the client
+--              passes when it connects, so a client can skip its own writes.
+--              The triggers are statement-level with transition tables: a bulk
+--              update sends one notification, and identical payloads within a
+--              transaction are folded by PostgreSQL.
+-- DDL Summary:
+--   CREATE FUNCTION notify_table_change()
+--   CREATE TRIGGER trg_<table>_notify_{ins,upd,del,trunc} on the watched tables
+-- Data Migration: None.
+-- Rollback Steps: DROP TRIGGER trg_<table>_notify_ins ON <table>; (and _upd, _del, _trunc, per table)
+--                 DROP FUNCTION notify_table_change();
+-- Prerequisites: Migration 006_* must be applied first.
+-- Notes: file_status_counts and schema_migrations are not watched; the former
+--        only changes together with files.
+
+CREATE OR REPLACE FUNCTION notify_table_change() RETURNS TRIGGER AS $$
+DECLARE
+    id_column TEXT := CASE WHEN TG_NARGS > 0 THEN TG_ARGV[0] END;
+    changed_rows TEXT;
+    row_count BIGINT;
+    changed_ids BIGINT[];
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        row_count := 1;
+    ELSE
+        changed_rows := CASE TG_OP
+            WHEN 'INSERT' THEN 'SELECT * FROM new_rows'
+            WHEN 'DELETE' THEN 'SELECT * FROM old_rows'
+            ELSE 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows'
+        END;
+        IF id_column IS NULL THEN
+            EXECUTE format('SELECT count(*), NULL::bigint[] FROM (%s) changed', changed_rows)
+                INTO row_count, changed_ids;
+        ELSE
+            EXECUTE format(
+                'SELECT count(*), array_agg(DISTINCT %1$I) FILTER (WHERE %1$I IS NOT NULL) FROM (%2$s) changed',
+                id_column, changed_rows
+            ) INTO row_count, changed_ids;
+        END IF;
+    END IF;
+
+    IF row_count = 0 THEN
+        RETURN NULL;
+    END IF;
+    -- NOTIFY payloads are limited to 8000 bytes; past that ids means "many"
+    IF cardinality(changed_ids) > 500 THEN
+        changed_ids := NULL;
+    END IF;
+
+    PERFORM pg_notify('table_changed', json_build_object(
+        'table', TG_TABLE_NAME,
+        'op', TG_OP,
+        'ids', changed_ids,
+        'session', current_setting('app.session_id', true)
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    target RECORD;
+    trigger_args TEXT;
+BEGIN
+    FOR target IN
+        SELECT * FROM (VALUES
+            ('files', 'id'),
+            ('item_price', 'file_id'),
+            ('file_client_price', 'file_id'),
+            ('file_client_batch', 'file_id'),
+            ('file_url', 'file_id'),
+            ('file_microstock_status', 'file_id'),
+            ('earnings', NULL),
+            ('categories', 'id'),
+            ('subcategories', 'id'),
+            ('statuses', 'id'),
+            ('templates', 'id'),
+            ('client', 'id'),
+            ('batch_list', 'id'),
+            ('url_provider', 'id'),
+            ('microstock_platforms', 'id'),
+            ('teams', 'id'),
+            ('attendance', 'id'),
+            ('wallet_pockets', 'id'),
+            ('wallet_cards', 'id'),
+            ('wallet_categories', 'id'),
+            ('wallet_currency', 'id'),
+            ('wallet_transaction_statuses', 'id'),
+            ('wallet_transaction_locations', 'id'),
+            ('wallet_transactions', 'id'),
+            ('wallet_transaction_items', 'id'),
+            ('wallet_transactions_invoice_prove', 'id')
+        ) AS t(table_name, id_column)
+    LOOP
+        IF to_regclass(target.table_name) IS NULL THEN
+            CONTINUE;
+        END IF;
+        trigger_args := COALESCE(quote_literal(target.id_column), '');
+
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || target.table_name || '_notify_ins', target.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change(%s)',
+            'trg_' || target.table_name || '_notify_ins', target.table_name, trigger_args
+        );
+
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || target.table_name || '_notify_upd', target.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change(%s)',
+            'trg_' || target.table_name || '_notify_upd', target.table_name, trigger_args
+        );
+
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || target.table_name || '_notify_del', target.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change(%s)',
+            'trg_' || target.table_name || '_notify_del', target.table_name, trigger_args
+        );
+
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || target.table_name || '_notify_trunc', target.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change(%s)',
+            'trg_' || target.table_name || '_notify_trunc', target.table_name, trigger_args
+        );
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,100 @@
+-- Migration: 008_20261017_add_backup_change_log.sql
+-- Date: 2026-10-17
+-- Purpose: Record which rows changed so hourly backups can write only the delta.
+-- Description: The hourly backup rewrote the whole database every run. Each
+--              backed-up table now logs the ids touched by every statement
+--              into backup_change_log (statement-level triggers with
+--              transition tables, so a bulk statement adds one INSERT ... SELECT).
+--              Deletes are logged too and act as tombstones. Every entry carries
+--              the id of the writing transaction; the backup helper stores the
+--              txid_current_snapshot() of each backup and reads the entries of
+--              transactions that snapshot could not see, which is exact even for
+--              transactions that commit out of order. updated_at/created_at are
+--              not used: several tables have neither and not every UPDATE sets it.
+-- DDL Summary:
+--   CREATE TABLE backup_change_log (id, table_name, row_id, op, txid, changed_at)
+--   CREATE INDEX idx_backup_change_log_txid
+--   CREATE FUNCTION log_backup_change()
+--   CREATE TRIGGER trg_<table>_backup_log_{ins,upd,del,trunc} on every table with an id column
+-- Data Migration: None (the first backup after this migration is a full one).
+-- Rollback Steps: DROP TRIGGER trg_<table>_backup_log_ins ON <table>; (and _upd, _del, _trunc, per table)
+--                 DROP FUNCTION log_backup_change(); DROP TABLE backup_change_log;
+-- Prerequisites: Migration 007_* must be applied first.
+-- Notes: file_status_counts is derived from files and rebuilt after restores, so it
+--        is not logged. The backup helper trims entries older than two days when it
+--        writes a daily full backup. Restores run with triggers off and do not log.
+
+CREATE TABLE IF NOT EXISTS backup_change_log (
+    id BIGSERIAL PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    row_id BIGINT,
+    op CHAR(1) NOT NULL,
+    txid BIGINT NOT NULL DEFAULT txid_current(),
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_backup_change_log_txid ON backup_change_log (txid);
+
+CREATE OR REPLACE FUNCTION log_backup_change() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        INSERT INTO backup_change_log (table_name, row_id, op) VALUES (TG_TABLE_NAME, NULL, 'T');
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO backup_change_log (table_name, row_id, op)
+        SELECT TG_TABLE_NAME, id, 'I' FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO backup_change_log (table_name, row_id, op)
+        SELECT TG_TABLE_NAME, id, 'D' FROM old_rows;
+    ELSE
+        -- An UPDATE that changes an id removes the old one
+        INSERT INTO backup_change_log (table_name, row_id, op)
+        SELECT TG_TABLE_NAME, id, 'U' FROM new_rows
+        UNION ALL
+        SELECT TG_TABLE_NAME, id, 'D' FROM (SELECT id FROM old_rows EXCEPT SELECT id FROM new_rows) moved;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    target RECORD;
+BEGIN
+    FOR target IN
+        SELECT t.tablename AS table_name
+        FROM pg_tables t
+        JOIN information_schema.columns c
+            ON c.table_schema = t.schemaname AND c.table_name = t.tablename AND c.column_name = 'id'
+        WHERE t.schemaname = 'public'
+          AND t.tablename NOT IN ('schema_migrations', 'file_status_counts', 'backup_change_log')
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || target.table_name || '_backup_log_ins', target.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION log_backup_change()',
+            'trg_' || target.table_name || '_backup_log_ins', target.table_name
+        );
+
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || target.table_name || '_backup_log_upd', target.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION log_backup_change()',
+            'trg_' || target.table_name || '_backup_log_upd', target.table_name
+        );
+
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || target.table_name || '_backup_log_del', target.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION log_backup_change()',
+            'trg_' || target.table_name || '_backup_log_del', target.table_name
+        );
+
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || target.table_name || '_backup_log_trunc', target.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION log_backup_change()',
+            'trg_' || target.table_name || '_backup_log_trunc', target.table_name
+        );
+    END LOOP;
+END;
+$$;
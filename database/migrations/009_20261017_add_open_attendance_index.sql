@@ -0,0 +1,19 @@
+-- migration: no-transaction
+-- Migration: 009_20261017_add_open_attendance_index.sql
+-- Date: 2026-10-17
+-- Purpose: Serve the "who is checked in right now" lookup from a tiny index.
+-- Description: The attendance bar refreshes on every data_changed signal and
+--              only needs the team members with an open attendance row
+--              (checked in, not yet checked out). A partial index on exactly
+--              those rows stays a handful of entries however long the
+--              attendance history grows, so DatabaseTeamsHelper.get_present_teams()
+--              no longer scans attendance at all.
+-- DDL Summary:
+--   CREATE INDEX idx_attendance_open ON attendance (team_id)
+--       WHERE check_in IS NOT NULL AND check_out IS NULL
+-- Data Migration: None.
+-- Rollback Steps: DROP INDEX CONCURRENTLY IF EXISTS idx_attendance_open;
+-- Prerequisites: Migration 001_* must be applied first.
+-- Notes: Built CONCURRENTLY like 004_*, so the attendance table stays writable.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_attendance_open ON attendance (team_id) WHERE check_in IS NOT NULL AND check_out IS NULL;
@@ -0,0 +1,22 @@
+-- Migration: 010_20261017_add_attendance_date_dow.sql
+-- Date: 2026-10-17
+-- Purpose: Let the attendance day-of-week filter use an index.
+-- Description: The team profile's attendance tab filters by weekday with
+--              EXTRACT(DOW FROM date), which no index can answer. attendance
+--              now carries the weekday as a stored generated column (0 = Sunday,
+--              the EXTRACT convention), indexed together with team_id and date
+--              so "every Monday of this member" reads only those rows, already
+--              in date order. Month and year filters need no column: the helper
+--              turns them into date ranges on idx_attendance_team_date.
+-- DDL Summary:
+--   ALTER TABLE attendance ADD COLUMN date_dow SMALLINT GENERATED ALWAYS AS (EXTRACT(DOW FROM date)) STORED
+--   CREATE INDEX idx_attendance_team_dow_date ON attendance (team_id, date_dow, date)
+-- Data Migration: None (the generated column is filled by the table rewrite).
+-- Rollback Steps: DROP INDEX IF EXISTS idx_attendance_team_dow_date;
+--                 ALTER TABLE attendance DROP COLUMN date_dow;
+-- Prerequisites: Migration 004_* must be applied first.
+-- Notes: Backups and CSV exports skip generated columns; restores recompute it.
+
+ALTER TABLE attendance ADD COLUMN IF NOT EXISTS date_dow SMALLINT GENERATED ALWAYS AS (EXTRACT(DOW FROM date)::smallint) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_attendance_team_dow_date ON attendance (team_id, date_dow, date);
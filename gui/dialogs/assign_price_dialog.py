@@ -414,8 +414,9 @@ class AssignPriceDialog(QDialog):
         if price:
             if not self._verify_operational_percentage():
                 return
-            self.db_manager.assign_price(file_id, price, currency, note)
-            self.db_manager.update_earnings_shares_with_percentage(file_id, operational_percentage)
+            with self.db_manager.transaction():
+                self.db_manager.assign_price(file_id, price, currency, note)
+                self.db_manager.update_earnings_shares_with_percentage(file_id, operational_percentage)
             self.refresh_earnings_table()
 
     def _on_note_changed(self):
@@ -428,11 +429,12 @@ class AssignPriceDialog(QDialog):
     def _on_client_changed(self):
         client_id = self.client_combo.currentData()
         file_id = self.file_record["id"]
-        item_price_id = self.db_manager.get_item_price_id(file_id)
-        self.db_manager.update_file_client_relation(file_id, item_price_id, client_id)
         old_client_id = self._last_client_id
-        if old_client_id and client_id and old_client_id != client_id:
-            self.db_manager.update_file_client_batch_client(file_id, old_client_id, client_id)
+        with self.db_manager.transaction():
+            item_price_id = self.db_manager.get_item_price_id(file_id)
+            self.db_manager.update_file_client_relation(file_id, item_price_id, client_id)
+            if old_client_id and client_id and old_client_id != client_id:
+                self.db_manager.update_file_client_batch_client(file_id, old_client_id, client_id)
         self._last_client_id = client_id
         # Enable/disable batch combo and buttons based on client selection
         enable_batch = bool(client_id)
@@ -453,17 +455,19 @@ class AssignPriceDialog(QDialog):
         currency = self.currency_combo.currentText()
         note = self.note_edit.text().strip()
         file_id = self.file_record["id"]
-        self.db_manager.assign_price(file_id, price, currency, note)
         client_id = self.client_combo.currentData()
-        item_price_id = self.db_manager.get_item_price_id(file_id)
         old_client_id = self._last_client_id
-        self.db_manager.update_file_client_relation(file_id, item_price_id, client_id)
-        if old_client_id and client_id and old_client_id != client_id:
-            self.db_manager.update_file_client_batch_client(file_id, old_client_id, client_id)
-        self._last_client_id = client_id
         batch_number = self.batch_combo.currentText().strip()
         batch_list = [self.batch_combo.itemText(i) for i in range(self.batch_combo.count())]
-        if batch_number and client_id and batch_number in batch_list and batch_number != "":
-            self.db_manager.assign_file_client_batch(file_id, client_id, batch_number)
+        # Price, client and batch are saved as one transaction with one change notification
+        with self.db_manager.transaction():
+            self.db_manager.assign_price(file_id, price, currency, note)
+            item_price_id = self.db_manager.get_item_price_id(file_id)
+            self.db_manager.update_file_client_relation(file_id, item_price_id, client_id)
+            if old_client_id and client_id and old_client_id != client_id:
+                self.db_manager.update_file_client_batch_client(file_id, old_client_id, client_id)
+            if batch_number and client_id and batch_number in batch_list and batch_number != "":
+                self.db_manager.assign_file_client_batch(file_id, client_id, batch_number)
+        self._last_client_id = client_id
         self._parent.refresh_table()
         self.accept()
\ No newline at end of file
@@ -610,6 +610,28 @@ class BatchManagementDialog(QDialog):
         except Exception as e:
             QMessageBox.warning(self, "Error", str(e))
 
+    def on_batch_recalculate_earnings(self):
+        row = self.batch_table.currentRow()
+        if row < 0:
+            QMessageBox.warning(self, "No Batch Selected", "Please select a batch to recalculate.")
+            return
+        client_name, batch_number, note, file_count, created_at, client_id = self.get_selected_row_data()
+        operational_percentage = int(self.db_manager.window_config_manager.get("operational_percentage"))
+        msg = (
+            f"Apply the current operational percentage ({operational_percentage}%) to the earnings of "
+            f"all files in batch '{batch_number}'?"
+        )
+        reply = QMessageBox.question(self, "Recalculate Earnings", msg, QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        try:
+            updated = self.db_manager.recalculate_earnings_shares(
+                operational_percentage, client_id=client_id, batch_number=batch_number
+            )
+            QMessageBox.information(self, "Success", f"{updated} earning(s) updated.")
+        except Exception as e:
+            QMessageBox.warning(self, "Error", str(e))
+
     def show_batch_context_menu(self, pos):
         index = self.batch_table.indexAt(pos)
         if not index.isValid():
@@ -619,22 +641,29 @@ class BatchManagementDialog(QDialog):
         icon_edit = qta.icon("fa6s.pen-to-square")
         icon_delete = qta.icon("fa6s.trash")
         icon_refresh = qta.icon("fa6s.arrows-rotate")
+        icon_recalculate = qta.icon("fa6s.calculator")
         action_edit = QAction(icon_edit, "Edit Batch", self)
         action_delete = QAction(icon_delete, "Delete Batch", self)
         action_refresh = QAction(icon_refresh, "Refresh", self)
+        action_recalculate = QAction(icon_recalculate, "Recalculate Earnings", self)
         def do_edit():
             self.batch_table.selectRow(row)
             self.on_batch_edit()
         def do_delete():
             self.batch_table.selectRow(row)
             self.on_batch_delete()
+        def do_recalculate():
+            self.batch_table.selectRow(row)
+            self.on_batch_recalculate_earnings()
         def do_refresh():
             self.load_batch_data()
         action_edit.triggered.connect(do_edit)
         action_delete.triggered.connect(do_delete)
         action_refresh.triggered.connect(do_refresh)
+        action_recalculate.triggered.connect(do_recalculate)
         menu.addAction(action_edit)
         menu.addAction(action_delete)
+        menu.addAction(action_recalculate)
         menu.addSeparator()
         menu.addAction(action_refresh)
         menu.exec(self.batch_table.viewport().mapToGlobal(pos))
@@ -109,8 +109,9 @@ def find_main_window(widget):
 class ClientDataDialog(QDialog):
     """Optimized Client Data Dialog using helper classes"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db_manager=None):
         super().__init__(parent)
+        self.db_manager = db_manager
         self.setWindowTitle("Client Data")
         self.setMinimumSize(800, 500)
         
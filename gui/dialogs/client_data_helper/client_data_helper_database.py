@@ -1,5 +1,4 @@
 from pathlib import Path
-from database.db_manager import DatabaseManager
 from manager.config_manager import ConfigManager
 
 class ClientDataDatabaseHelper:
@@ -8,15 +7,16 @@ class ClientDataDatabaseHelper:
     def __init__(self, parent_dialog):
         self.parent = parent_dialog
         self._db_manager = None
-        self._config_manager = None
     
     def get_db_manager(self):
-        """Get database manager instance"""
+        """Get the application's database manager (shared, never created here)"""
         if self._db_manager is None:
-            basedir = Path(__file__).resolve().parents[3]
-            db_config_path = basedir / "configs" / "db_config.json"
-            self._config_manager = ConfigManager(str(db_config_path))
-            self._db_manager = DatabaseManager(self._config_manager, self._config_manager)
+            widget = self.parent
+            while widget is not None:
+                if getattr(widget, "db_manager", None) is not None:
+                    self._db_manager = widget.db_manager
+                    break
+                widget = widget.parent() if hasattr(widget, "parent") else None
         return self._db_manager
     
     def get_config_manager(self, config_type="db"):
@@ -40,6 +40,7 @@ class SortDialog(QDialog):
             ("Category", "category"),
             ("Batch Number", "batch_number"),
             ("Microstock", "microstock"),
+            ("Relevance (search)", "relevance"),
         ]
         for label, _ in self.sort_fields:
             self.field_combo.addItem(label)
@@ -2,9 +2,6 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetIt
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap, QPainter, QPainterPath
 import qtawesome as qta
-from database.db_manager import DatabaseManager
-from manager.config_manager import ConfigManager
-from pathlib import Path
 from datetime import datetime
 import base64
 
@@ -176,33 +173,18 @@ class AttendanceHelper:
             default_icon = qta.icon('fa5s.user-circle', color='#888')
             self.dialog.attendance_profile_image.setPixmap(default_icon.pixmap(100, 100))
         
-        basedir = Path(__file__).resolve().parents[3]
-        db_config_path = basedir / "configs" / "db_config.json"
-        config_manager = ConfigManager(str(db_config_path))
-        db_manager = DatabaseManager(config_manager, config_manager)
+        db_manager = self.dialog.db_manager
         team_id = self._attendance_team_id
-        all_records = db_manager.get_attendance_by_team_id_paged(
-            team_id, None, None, None, None, "Date", "Descending", 0, 10000
-        )
-        self.attendance_records_all = all_records
-        self.refresh_attendance_year_filter()
+        self.refresh_attendance_year_filter(db_manager.get_attendance_years_by_team_id(team_id))
         self.update_attendance_table(self._attendance_full_name)
 
-    def refresh_attendance_year_filter(self):
-        years = set()
-        for r in self.attendance_records_all:
-            date_str = r[0]
-            try:
-                dt = datetime.strptime(date_str, "%Y-%m-%d")
-                years.add(str(dt.year))
-            except Exception:
-                continue
+    def refresh_attendance_year_filter(self, years):
         current = self.dialog.attendance_year_filter_combo.currentText() if hasattr(self.dialog, "attendance_year_filter_combo") else "All Years"
         self.dialog.attendance_year_filter_combo.blockSignals(True)
         self.dialog.attendance_year_filter_combo.clear()
         self.dialog.attendance_year_filter_combo.addItem("All Years")
         for y in sorted(years):
-            self.dialog.attendance_year_filter_combo.addItem(y)
+            self.dialog.attendance_year_filter_combo.addItem(str(y))
         idx = self.dialog.attendance_year_filter_combo.findText(current)
         if idx >= 0:
             self.dialog.attendance_year_filter_combo.setCurrentIndex(idx)
@@ -237,10 +219,7 @@ class AttendanceHelper:
         if not hasattr(self, "_attendance_team_id") or self._attendance_team_id is None:
             self.dialog.attendance_table.setRowCount(0)
             return
-        basedir = Path(__file__).resolve().parents[3]
-        db_config_path = basedir / "configs" / "db_config.json"
-        config_manager = ConfigManager(str(db_config_path))
-        db_manager = DatabaseManager(config_manager, config_manager)
+        db_manager = self.dialog.db_manager
         team_id = self._attendance_team_id
         search_text = self.dialog.attendance_search_edit.text().strip()
         day_filter = self.dialog.attendance_day_filter_combo.currentText() if hasattr(self.dialog, "attendance_day_filter_combo") else "All Days"
@@ -253,22 +232,15 @@ class AttendanceHelper:
 
         current_language = getattr(self, 'attendance_language', 'id')
 
-        total_rows = db_manager.count_attendance_by_team_id_filtered(
-            team_id, search_text, day_filter, month_filter, year_filter
-        )
-        self._attendance_total_pages = max(1, (total_rows + page_size - 1) // page_size)
-        all_records = db_manager.get_attendance_by_team_id_paged(
-            team_id, None, None, None, None, "Date", "Descending", 0, 10000
-        )
-        self.attendance_records_all = all_records
-        records = db_manager.get_attendance_by_team_id_paged(
+        page = db_manager.get_attendance_page_by_team_id(
             team_id, search_text, day_filter, month_filter, year_filter,
             sort_field, sort_order, offset, page_size
         )
+        total_rows = page["total"]
+        self._attendance_total_pages = max(1, (total_rows + page_size - 1) // page_size)
+        records = page["records"]
         self.attendance_records_filtered = records
-        summary = db_manager.attendance_summary_by_team_id_filtered(
-            team_id, search_text, day_filter, month_filter, year_filter
-        )
+        summary = page["summary"]
         self.dialog.attendance_table.setRowCount(len(records))
         for row_idx, record in enumerate(records):
             date, check_in, check_out, note, _ = record
@@ -2,9 +2,6 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetIt
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QAction, QCursor, QKeySequence, QShortcut, QPixmap, QPainter, QPainterPath
 import qtawesome as qta
-from database.db_manager import DatabaseManager
-from manager.config_manager import ConfigManager
-from pathlib import Path
 import sys
 import os
 import subprocess
@@ -334,10 +331,7 @@ class EarningsHelper:
         if not hasattr(self, "_earnings_team_id") or self._earnings_team_id is None:
             self.dialog.earnings_table.setRowCount(0)
             return
-        basedir = Path(__file__).resolve().parents[3]
-        db_config_path = basedir / "configs" / "db_config.json"
-        config_manager = ConfigManager(str(db_config_path))
-        db_manager = DatabaseManager(config_manager, config_manager)
+        db_manager = self.dialog.db_manager
         team_id = self._earnings_team_id
         search_text = self.dialog.earnings_search_edit.text().strip()
         batch_filter = self._earnings_batch_filter_value
@@ -408,9 +402,7 @@ class EarningsHelper:
             'total_paid': total_paid
         }
         self.dialog.earnings_table.setRowCount(len(records))
-        window_config_path = basedir / "configs" / "window_config.json"
-        config_manager2 = ConfigManager(str(window_config_path))
-        status_options = config_manager2.get("status_options")
+        status_options = db_manager.window_config_manager.get("status_options")
         currency_label = "IDR"
         for row_idx, record in enumerate(records):
             file_name, file_date, amount, note, status, client_name, batch, file_path = record
@@ -563,10 +555,7 @@ class EarningsHelper:
 
     def _add_detailed_status_breakdown(self, parent_layout, team_id, search_text, batch_filter, status_filter):
         """Add detailed status breakdown like client data files"""
-        basedir = Path(__file__).resolve().parents[3]
-        db_config_path = basedir / "configs" / "db_config.json"
-        config_manager = ConfigManager(str(db_config_path))
-        db_manager = DatabaseManager(config_manager, config_manager)
+        db_manager = self.dialog.db_manager
         
         # Get all records for detailed breakdown (without status filter for complete stats)
         all_records_for_stats = db_manager.get_earnings_by_team_id_paged(
@@ -593,9 +582,7 @@ class EarningsHelper:
             status_stats[status]["total_amount"] += amount
         
         # Get status colors from config
-        window_config_path = basedir / "configs" / "window_config.json"
-        config_manager2 = ConfigManager(str(window_config_path))
-        status_options = config_manager2.get("status_options")
+        status_options = db_manager.window_config_manager.get("status_options")
         if not status_options:
             return
         
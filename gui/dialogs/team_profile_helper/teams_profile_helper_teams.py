@@ -2,9 +2,6 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetIt
 from PySide6.QtCore import Qt, QDate, QBuffer, QIODevice
 from PySide6.QtGui import QColor, QPixmap, QImage, QPainter, QPainterPath
 import qtawesome as qta
-from database.db_manager import DatabaseManager
-from manager.config_manager import ConfigManager
-from pathlib import Path
 import base64
 
 class TeamsHelper:
@@ -325,10 +322,7 @@ class TeamsHelper:
         self.current_profile_image_base64 = None
 
     def fetch_team_data(self):
-        basedir = Path(__file__).resolve().parents[3]
-        db_config_path = basedir / "configs" / "db_config.json"
-        config_manager = ConfigManager(str(db_config_path))
-        db_manager = DatabaseManager(config_manager, config_manager)
+        db_manager = self.dialog.db_manager
         self._team_profile_data = db_manager.get_team_profile_data()
         self._teams_data = self._team_profile_data["teams"]
         self._attendance_map = self._team_profile_data["attendance_map"]
@@ -444,10 +438,7 @@ class TeamsHelper:
         self.dialog.earnings_helper.clear_earnings_data()
 
     def save_team_details(self):
-        basedir = Path(__file__).resolve().parents[3]
-        db_config_path = basedir / "configs" / "db_config.json"
-        config_manager = ConfigManager(str(db_config_path))
-        db_manager = DatabaseManager(config_manager, config_manager)
+        db_manager = self.dialog.db_manager
         updated_data = {}
         for key, widget in self.dialog.details_widgets.items():
             if key == "started_at":
@@ -4,9 +4,6 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, Q
 from PySide6.QtGui import QFont, QPixmap, QIcon, QPainter, QPainterPath
 from PySide6.QtCore import Qt, Signal
 import qtawesome as qta
-from database.db_manager import DatabaseManager
-from manager.config_manager import ConfigManager
-from pathlib import Path
 from datetime import datetime
 import base64
 
@@ -44,7 +41,7 @@ def format_date_indonesian(date_input, with_time=False):
 class TeamsAttendanceDialog(QDialog):
     def __init__(self, parent=None, db_manager=None):
         super().__init__(parent)
-        self.db_manager = db_manager
+        self.db_manager = db_manager or self._get_db_manager()
         self.setWindowTitle("Teams Attendance")
         self.setMinimumSize(700, 500)
         
@@ -166,15 +163,16 @@ class TeamsAttendanceDialog(QDialog):
         layout.addStretch()
         return panel
 
+    def _get_db_manager(self):
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, "db_manager"):
+                return parent.db_manager
+            parent = parent.parent() if hasattr(parent, "parent") else None
+        return None
+
     def _populate_users(self):
-        if self.db_manager:
-            teams = self.db_manager.get_team_profile_data()
-        else:
-            basedir = Path(__file__).parent.parent.parent
-            db_config_path = basedir / "configs" / "db_config.json"
-            config_manager = ConfigManager(str(db_config_path))
-            db_manager = DatabaseManager(config_manager, config_manager)
-            teams = db_manager.get_team_profile_data()
+        teams = self.db_manager.get_team_profile_data()
         
         self._teams_data = teams["teams"]
         self._attendance_map = teams.get("attendance_map", {})
@@ -393,14 +391,7 @@ class TeamsAttendanceDialog(QDialog):
             self._update_toggle_button_style(enabled=False)
             return
         
-        if self.db_manager:
-            open_attendance = self.db_manager.get_latest_open_attendance(username, pin)
-        else:
-            basedir = Path(__file__).parent.parent.parent
-            db_config_path = basedir / "configs" / "db_config.json"
-            config_manager = ConfigManager(str(db_config_path))
-            db_manager = DatabaseManager(config_manager, config_manager)
-            open_attendance = db_manager.get_latest_open_attendance(username, pin)
+        open_attendance = self.db_manager.get_latest_open_attendance(username, pin)
         
         if open_attendance:
             self.status_label.setText(
@@ -415,10 +406,7 @@ class TeamsAttendanceDialog(QDialog):
             self.current_mode = "checkout"
             self._update_toggle_button_style(enabled=True if pin_valid else False)
         else:
-            if self.db_manager:
-                latest_attendance = self.db_manager.get_attendance_by_username_pin(username, pin)
-            else:
-                latest_attendance = db_manager.get_attendance_by_username_pin(username, pin)
+            latest_attendance = self.db_manager.get_attendance_by_username_pin(username, pin)
             
             if latest_attendance:
                 if latest_attendance["check_out"]:
@@ -457,24 +445,12 @@ class TeamsAttendanceDialog(QDialog):
         pin = self.pin_edit.text().strip()
         note = self.note_edit.toPlainText().strip()
         
-        if self.db_manager:
-            if self.current_mode == "checkin":
-                success, msg = self.db_manager.add_attendance_record(username, pin, note, mode="checkin")
-                self.status_label.setText(msg)
-            elif self.current_mode == "checkout":
-                success, msg = self.db_manager.add_attendance_record(username, pin, note, mode="checkout")
-                self.status_label.setText(msg)
-        else:
-            basedir = Path(__file__).parent.parent.parent
-            db_config_path = basedir / "configs" / "db_config.json"
-            config_manager = ConfigManager(str(db_config_path))
-            db_manager = DatabaseManager(config_manager, config_manager)
-            if self.current_mode == "checkin":
-                success, msg = db_manager.add_attendance_record(username, pin, note, mode="checkin")
-                self.status_label.setText(msg)
-            elif self.current_mode == "checkout":
-                success, msg = db_manager.add_attendance_record(username, pin, note, mode="checkout")
-                self.status_label.setText(msg)
+        if self.current_mode == "checkin":
+            success, msg = self.db_manager.add_attendance_record(username, pin, note, mode="checkin")
+            self.status_label.setText(msg)
+        elif self.current_mode == "checkout":
+            success, msg = self.db_manager.add_attendance_record(username, pin, note, mode="checkout")
+            self.status_label.setText(msg)
         
         self.pin_edit.clear()
         self.pin_edit.clearFocus()
@@ -5,8 +5,9 @@ from .team_profile_helper.teams_profile_helper_earnings import EarningsHelper
 from .team_profile_helper.teams_profile_helper_ui import UIHelper
 
 class TeamsProfileDialog(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db_manager=None):
         super().__init__(parent)
+        self.db_manager = db_manager or self._get_db_manager()
         self.setWindowTitle("Teams Profile")
         self.setMinimumSize(800, 500)
         
@@ -32,6 +33,14 @@ class TeamsProfileDialog(QDialog):
         # Connect tab change event untuk maintain selection
         self.tab_widget.currentChanged.connect(self._on_tab_changed)
 
+    def _get_db_manager(self):
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, "db_manager"):
+                return parent.db_manager
+            parent = parent.parent() if hasattr(parent, "parent") else None
+        return None
+
     # Property getters for backward compatibility
     @property
     def _teams_data(self):
@@ -2,9 +2,23 @@ from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout
 from PySide6.QtCore import Qt
 from gui.dialogs.wallet_management_helper.wallet_management_helper_sidebar import WalletSidebar
 from gui.dialogs.wallet_management_helper.wallet_management_helper_central import WalletCentral
+from gui.dialogs.wallet_management_helper.wallet_signal_manager import WalletSignalManager
 
 
 class WalletManagementDialog(QDialog):
+    # Wallet table changed by another session -> WalletSignalManager emitter
+    EXTERNAL_CHANGE_EMITTERS = {
+        "wallet_pockets": "emit_pocket_changed",
+        "wallet_cards": "emit_card_changed",
+        "wallet_categories": "emit_category_changed",
+        "wallet_currency": "emit_currency_changed",
+        "wallet_transaction_locations": "emit_location_changed",
+        "wallet_transaction_statuses": "emit_status_changed",
+        "wallet_transactions": "emit_transaction_changed",
+        "wallet_transaction_items": "emit_transaction_changed",
+        "wallet_transactions_invoice_prove": "emit_transaction_changed",
+    }
+
     def __init__(self, parent=None, db_manager=None, basedir=None):
         super().__init__(parent)
         self.db_manager = db_manager
@@ -14,6 +28,10 @@ class WalletManagementDialog(QDialog):
         self.setMinimumSize(900, 400)
         
         self.init_ui()
+
+        if self.db_manager is not None:
+            self.db_manager.wallet_changed.connect(self.on_external_wallet_change)
+            self.finished.connect(self._disconnect_external_changes)
     
     def init_ui(self):
         main_layout = QVBoxLayout()
@@ -41,3 +59,14 @@ class WalletManagementDialog(QDialog):
     
     def on_section_changed(self, section_name):
         self.central.load_section(section_name)
+
+    def on_external_wallet_change(self, table):
+        emitter = self.EXTERNAL_CHANGE_EMITTERS.get(table)
+        if emitter:
+            getattr(WalletSignalManager.get_instance(), emitter)()
+
+    def _disconnect_external_changes(self):
+        try:
+            self.db_manager.wallet_changed.disconnect(self.on_external_wallet_change)
+        except Exception:
+            pass
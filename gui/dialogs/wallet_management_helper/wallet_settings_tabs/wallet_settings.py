@@ -240,7 +240,7 @@ class WalletSettingsTab(QWidget):
 			return
 		
 		try:
-			categories = self.db_manager.wallet_helper.get_all_categories()
+			categories = self.db_manager.get_all_wallet_categories()
 			self.category_table.setRowCount(0)
 			
 			for category in categories:
@@ -489,7 +489,7 @@ class WalletSettingsTab(QWidget):
 			return
 		
 		try:
-			currencies = self.db_manager.wallet_helper.get_all_currencies()
+			currencies = self.db_manager.get_all_wallet_currencies()
 			self.currency_table.setRowCount(0)
 			
 			for currency in currencies:
@@ -727,7 +727,7 @@ class WalletSettingsTab(QWidget):
 			return
 		
 		try:
-			statuses = self.db_manager.wallet_helper.get_all_transaction_statuses()
+			statuses = self.db_manager.get_all_wallet_transaction_statuses()
 			self.status_table.setRowCount(0)
 			
 			for status in statuses:
@@ -1031,7 +1031,7 @@ class WalletSettingsTab(QWidget):
 			return
 		
 		try:
-			locations = self.db_manager.wallet_helper.get_all_locations()
+			locations = self.db_manager.get_all_wallet_locations()
 			self.location_table.setRowCount(0)
 			
 			for location in locations:
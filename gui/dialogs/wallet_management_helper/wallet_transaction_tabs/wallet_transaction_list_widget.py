@@ -412,7 +412,7 @@ class WalletTransactionListWidget(QWidget):
                     self.filter_category.lineEdit().setText(prev_cat_text)
             
             
-            locations = self.db_manager.wallet_helper.get_all_locations()
+            locations = self.db_manager.get_all_wallet_locations()
             self.filter_location.clear() if hasattr(self, 'filter_location') else None
             
             statuses = self.db_manager.get_all_wallet_transaction_statuses()
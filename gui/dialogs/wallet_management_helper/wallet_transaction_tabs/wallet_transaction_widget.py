@@ -1083,11 +1083,11 @@ class WalletTransactionWidget(QWidget):
             if self.db_manager and hasattr(self.db_manager, 'wallet_helper'):
                 try:
                     print("DEBUG: Pre-fetching database context for thread safety...")
-                    pockets = self.db_manager.wallet_helper.get_all_pockets()
-                    categories = self.db_manager.wallet_helper.get_all_categories()
-                    currencies = self.db_manager.wallet_helper.get_all_currencies()
-                    locations = self.db_manager.wallet_helper.get_all_locations()
-                    statuses = self.db_manager.wallet_helper.get_all_transaction_statuses()
+                    pockets = self.db_manager.get_all_wallet_pockets()
+                    categories = self.db_manager.get_all_wallet_categories()
+                    currencies = self.db_manager.get_all_wallet_currencies()
+                    locations = self.db_manager.get_all_wallet_locations()
+                    statuses = self.db_manager.get_all_wallet_transaction_statuses()
                     
                     db_context = {
                         "pockets": pockets,
@@ -2,9 +2,6 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScroll
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap, QPainter, QPainterPath, QBrush, QPen, QCursor
 import qtawesome as qta
-from database.db_manager import DatabaseManager
-from manager.config_manager import ConfigManager
-from pathlib import Path
 import base64
 
 
@@ -36,9 +33,12 @@ class AttendanceBar(QWidget):
         layout.addWidget(scroll, 1)
         
         self.profile_labels = []
+        # Decoded circular avatars keyed by (team id, teams.updated_at)
+        self._avatar_cache = {}
         
         if self.db_manager:
             self.db_manager.data_changed.connect(self.refresh_attendance)
+            self.db_manager.attendance_changed.connect(self.refresh_attendance)
         
         self.refresh_attendance()
     
@@ -62,6 +62,31 @@ class AttendanceBar(QWidget):
         painter.end()
         return circular
     
+    def _get_avatars(self, db_manager, teams):
+        """Return {team_id: circular pixmap or None}, decoding only new or changed images."""
+        missing = [
+            team["id"] for team in teams
+            if team.get("has_image") and (team["id"], team.get("updated_at")) not in self._avatar_cache
+        ]
+        if missing:
+            for team_id, (updated_at, profile_image) in db_manager.get_team_profile_images(missing).items():
+                circular_pixmap = None
+                if profile_image:
+                    try:
+                        pixmap = QPixmap()
+                        pixmap.loadFromData(base64.b64decode(profile_image))
+                        if not pixmap.isNull():
+                            circular_pixmap = self.create_circular_pixmap(pixmap, 40)
+                    except Exception:
+                        pass
+                for key in [key for key in self._avatar_cache if key[0] == team_id]:
+                    del self._avatar_cache[key]
+                self._avatar_cache[(team_id, updated_at)] = circular_pixmap
+        return {
+            team["id"]: self._avatar_cache.get((team["id"], team.get("updated_at")))
+            for team in teams if team.get("has_image")
+        }
+
     def open_attendance_dialog(self, username):
         """Open attendance dialog and select the specified user."""
         from gui.dialogs.teams_attendance_dialog import TeamsAttendanceDialog
@@ -89,27 +114,10 @@ class AttendanceBar(QWidget):
             label.deleteLater()
         self.profile_labels.clear()
         
-        if self.db_manager:
-            team_data = self.db_manager.get_team_profile_data()
-        else:
-            basedir = Path(__file__).parent.parent.parent
-            db_config_path = basedir / "configs" / "db_config.json"
-            config_manager = ConfigManager(str(db_config_path))
-            db_manager = DatabaseManager(config_manager, config_manager)
-            team_data = db_manager.get_team_profile_data()
-        
-        teams = team_data.get("teams", [])
-        attendance_map = team_data.get("attendance_map", {})
-        
-        present_teams = []
-        for team in teams:
-            team_id = team.get("id")
-            if team_id in attendance_map:
-                for att in attendance_map[team_id]:
-                    if att[1] and not att[2]:
-                        present_teams.append(team)
-                        break
-        
+        db_manager = self.db_manager
+        present_teams = db_manager.get_present_teams() if db_manager else []
+        avatars = self._get_avatars(db_manager, present_teams)
+
         for team in present_teams:
             profile_label = QLabel()
             profile_label.setFixedSize(40, 40)
@@ -119,22 +127,10 @@ class AttendanceBar(QWidget):
             profile_label.setProperty("username", team.get("username"))
             profile_label.mousePressEvent = lambda event, username=team.get("username"): self.open_attendance_dialog(username)
             
-            has_photo = False
-            if team.get("profile_image"):
-                try:
-                    image_data = base64.b64decode(team["profile_image"])
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(image_data)
-                    if not pixmap.isNull():
-                        circular_pixmap = self.create_circular_pixmap(pixmap, 40)
-                        profile_label.setPixmap(circular_pixmap)
-                        has_photo = True
-                    else:
-                        icon = qta.icon('fa5s.user', color='#4CAF50')
-                        profile_label.setPixmap(icon.pixmap(24, 24))
-                except Exception:
-                    icon = qta.icon('fa5s.user', color='#4CAF50')
-                    profile_label.setPixmap(icon.pixmap(24, 24))
+            circular_pixmap = avatars.get(team["id"])
+            has_photo = circular_pixmap is not None
+            if has_photo:
+                profile_label.setPixmap(circular_pixmap)
             else:
                 icon = qta.icon('fa5s.user', color='#4CAF50')
                 profile_label.setPixmap(icon.pixmap(24, 24))
@@ -167,12 +163,14 @@ class AttendanceBar(QWidget):
         if getattr(self, "db_manager", None) is not None:
             try:
                 self.db_manager.data_changed.disconnect(self.refresh_attendance)
+                self.db_manager.attendance_changed.disconnect(self.refresh_attendance)
             except Exception:
                 pass
         self.db_manager = db_manager
         if self.db_manager is not None:
             try:
                 self.db_manager.data_changed.connect(self.refresh_attendance)
+                self.db_manager.attendance_changed.connect(self.refresh_attendance)
             except Exception:
                 pass
         self.refresh_attendance()
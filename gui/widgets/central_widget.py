@@ -1,9 +1,9 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView,
+    QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QTableView, QAbstractItemView, QHeaderView,
     QHBoxLayout, QLineEdit, QPushButton, QLabel, QSpacerItem, QSizePolicy, QComboBox,
     QMenu, QApplication, QMessageBox, QDialog, QVBoxLayout as QVBoxLayout2, QRadioButton, QButtonGroup, QDialogButtonBox, QStyledItemDelegate, QStyle, QSpinBox, QFormLayout, QToolTip
 )
-from PySide6.QtGui import QColor, QAction, QFontMetrics, QCursor, QKeySequence, QShortcut
+from PySide6.QtGui import QColor, QAction, QCursor, QKeySequence, QShortcut, QPalette
 from PySide6.QtCore import Signal, Qt, QTimer
 import qtawesome as qta
 import time
@@ -21,6 +21,7 @@ from gui.dialogs.edit_record_dialog import EditRecordDialog
 from gui.dialogs.assign_price_dialog import AssignPriceDialog
 from gui.dialogs.assign_file_url_dialog import AssignFileUrlDialog
 from gui.dialogs.microstock_dialog import MicrostockDialog
+from gui.widgets.file_table_model import FileTableModel
 
 class DeleteRecordConfirmDialog(QDialog):
     """Dialog to show record details before deletion"""
@@ -118,6 +119,44 @@ class NoHoverDelegate(QStyledItemDelegate):
         option.state &= ~QStyle.State_MouseOver
         super().paint(painter, option, index)
 
+class StatusDelegate(NoHoverDelegate):
+    """Paints the status in its configured color and edits it with a combo box."""
+
+    def __init__(self, status_config, parent=None):
+        super().__init__(parent)
+        self.status_config = status_config
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        config = self.status_config.get(index.data())
+        if config:
+            color = QColor(config.get("color", ""))
+            if color.isValid():
+                option.palette.setColor(QPalette.Text, color)
+                option.palette.setColor(QPalette.HighlightedText, color)
+            if config.get("font_weight", "normal") == "bold":
+                option.font.setBold(True)
+
+    def createEditor(self, parent, option, index):
+        combo = NoWheelComboBox(parent)
+        combo.addItems(list(self.status_config.keys()))
+        combo.activated.connect(lambda _: self._commit_and_close(combo))
+        QTimer.singleShot(0, combo.showPopup)
+        return combo
+
+    def _commit_and_close(self, combo):
+        self.commitData.emit(combo)
+        self.closeEditor.emit(combo)
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data() or "")
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
 class CentralWidget(QWidget):
     row_selected = Signal(dict)
     
@@ -134,10 +173,12 @@ class CentralWidget(QWidget):
         self._selected_row_index = None
         self.markdown_generator = MarkdownGenerator()
         self._select_after_refresh = None
+        self._select_first_after_load = False
 
         self.db_manager = db_manager
         
         self.db_manager.data_changed.connect(self.auto_refresh_table)
+        self.db_manager.files_changed.connect(self._on_files_changed)
         
         layout = QVBoxLayout(self)
 
@@ -182,29 +223,16 @@ class CentralWidget(QWidget):
         top_row.addSpacerItem(QSpacerItem(20, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
         layout.addLayout(top_row)
 
-        self.table = QTableWidget(self)
-        self.table.setColumnCount(5)
+        self.table = QTableView(self)
         self.table.setStyleSheet(
-            "QTableWidget::item:selected { background-color: rgba(13, 125, 201, 0.89); }"
-            "QTableWidget::item:focus { outline: none; border: none; }"
+            "QTableView::item:selected { background-color: rgba(13, 125, 201, 0.89); }"
+            "QTableView::item:focus { outline: none; border: none; }"
             "QTableView::focus { border: none; outline: none; }"
-            "QTableWidget::item { outline: none; border: none; }"
+            "QTableView::item { outline: none; border: none; }"
         )
-        date_header = QTableWidgetItem("Date")
-        date_header.setIcon(qta.icon("fa6s.calendar"))
-        name_header = QTableWidgetItem("Name")
-        name_header.setIcon(qta.icon("fa6s.file"))
-        root_header = QTableWidgetItem("Root")
-        root_header.setIcon(qta.icon("fa6s.folder"))
-        path_header = QTableWidgetItem("Path")
-        path_header.setIcon(qta.icon("fa6s.folder-tree"))
-        status_header = QTableWidgetItem("Status")
-        status_header.setIcon(qta.icon("fa6s.circle-info"))
-        self.table.setHorizontalHeaderItem(0, date_header)
-        self.table.setHorizontalHeaderItem(1, name_header)
-        self.table.setHorizontalHeaderItem(2, root_header)
-        self.table.setHorizontalHeaderItem(3, path_header)
-        self.table.setHorizontalHeaderItem(4, status_header)
+        self.table_model = FileTableModel(db_manager, parent=self.table)
+        self.table_model.status_change_requested.connect(self._on_status_changed)
+        self.table.setModel(self.table_model)
         self.page_size = 20
         self.current_page = 1
         self.filtered_data = []
@@ -222,16 +250,23 @@ class CentralWidget(QWidget):
         header.resizeSection(1, 200)
         header.resizeSection(2, 100)
         header.resizeSection(4, 120)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.setTextElideMode(Qt.ElideRight)
         layout.addWidget(self.table)
 
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.cellDoubleClicked.connect(self._on_table_double_click)
-        self.table.cellClicked.connect(self._on_table_cell_clicked)
-        self.table.itemSelectionChanged.connect(self.on_row_selected)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.doubleClicked.connect(self._on_table_double_click)
+        self.table.clicked.connect(self._on_table_cell_clicked)
+        self.table.selectionModel().selectionChanged.connect(self.on_row_selected)
+        self.table.verticalScrollBar().valueChanged.connect(self._update_page_position)
 
         self.table.setMouseTracking(False)
         self.table.setItemDelegate(NoHoverDelegate(self.table))
+        self.table.setItemDelegateForColumn(
+            FileTableModel.STATUS_COLUMN, StatusDelegate(self.status_config, self.table)
+        )
 
         pagination_row = QHBoxLayout()
         pagination_icon = QLabel()
@@ -311,11 +346,6 @@ class CentralWidget(QWidget):
         self._empty_table_timer.setInterval(2000)
         self._empty_table_timer.timeout.connect(self._on_empty_table_timeout)
 
-        self._path_update_timer = QTimer(self)
-        self._path_update_timer.setSingleShot(True)
-        self._path_update_timer.setInterval(100)
-        self._path_update_timer.timeout.connect(self._update_path_truncation)
-
         self._selection_debounce_timer = QTimer(self)
         self._selection_debounce_timer.setSingleShot(True)
         self._selection_debounce_timer.setInterval(250)
@@ -336,12 +366,15 @@ class CentralWidget(QWidget):
         if getattr(self, "db_manager", None) is not None:
             try:
                 self.db_manager.data_changed.disconnect(self.auto_refresh_table)
+                self.db_manager.files_changed.disconnect(self._on_files_changed)
             except Exception:
                 pass
         self.db_manager = db_manager
+        self.table_model.set_db_manager(db_manager)
         if self.db_manager is not None:
             try:
                 self.db_manager.data_changed.connect(self.auto_refresh_table)
+                self.db_manager.files_changed.connect(self._on_files_changed)
             except Exception:
                 pass
 
@@ -367,22 +400,57 @@ class CentralWidget(QWidget):
         text = clipboard.text()
         if text:
             self.search_edit.setText(text)
+            self._select_first_after_load = True
             self.apply_search()
             show_statusbar_message(self, f"Pasted to search: {text}")
-            if self.table.rowCount() > 0:
-                self.table.selectRow(0)
-                item = self.table.item(0, 0)
-                if item:
-                    row_data = item.data(256)
-                    if row_data:
-                        self.selected_row_data = row_data
-                        self._selected_row_index = 0
-                        self._pending_row_data = row_data
-                        self._selection_debounce_timer.start()
+
+    def _select_first_row(self):
+        if self.table_model.rowCount() > 0:
+            self.table.selectRow(0)
+            row_data = self.table_model.row_data(0)
+            if row_data:
+                self.selected_row_data = row_data
+                self._selected_row_index = 0
+                self._pending_row_data = row_data
+                self._selection_debounce_timer.start()
 
     def auto_refresh_table(self):
         self.load_data_from_database()
 
+    def _on_files_changed(self, file_ids):
+        # Another session changed files (or their price/client/batch rows);
+        # wallet and attendance changes no longer reload the table
+        if not file_ids or not self.table_model.has_file_ids(file_ids):
+            # Unknown scope, or files not on screen (inserts among them): reload
+            self.auto_refresh_table()
+            return
+        # Updates of cached rows: re-fetch their blocks, then check the counts
+        # so a delete or a row leaving the filter still reloads the table
+        self.table_model.refresh_file_ids(file_ids)
+        filters = dict(getattr(self, "_query_filters", {}))
+        filters.pop("sort_field", None)
+        filters.pop("sort_order", None)
+        self.db_manager.submit_query(
+            "central_counts",
+            self._fetch_table_counts,
+            self.db_manager,
+            filters,
+            on_result=self._on_table_counts_loaded
+        )
+
+    @staticmethod
+    def _fetch_table_counts(db_manager, filters):
+        # Runs on a query executor thread: no widget access here
+        return {"totals": db_manager.get_file_totals(), "found": db_manager.count_files(**filters)}
+
+    def _on_table_counts_loaded(self, result):
+        if result["found"] != self.found_records:
+            self.auto_refresh_table()
+            return
+        self.total_records = result["totals"]["total"]
+        self.total_draft = result["totals"]["by_status"].get("Draft", 0)
+        self.update_stats_label()
+
     def copy_name(self):
         if self.selected_row_data:
             name = str(self.selected_row_data['name'])
@@ -494,97 +562,100 @@ class CentralWidget(QWidget):
         dialog = MicrostockDialog(self.selected_row_data, self.db_manager, self.status_config, self)
         dialog.exec()
 
-    def _on_table_double_click(self, row, column):
+    def _on_table_double_click(self, index):
+        if index.column() == FileTableModel.STATUS_COLUMN:
+            return
         self._selection_debounce_timer.stop()
-        item = self.table.item(row, 0)
-        if item:
-            row_data = item.data(256)
-            if row_data:
-                self.selected_row_data = row_data
-                self._selected_row_index = row
-                self._pending_row_data = None
-                self.open_explorer()
-                show_statusbar_message(self, f"Double-clicked: Opened {row_data['path']}")
+        row = index.row()
+        row_data = self.table_model.row_data(row)
+        if row_data:
+            self.selected_row_data = row_data
+            self._selected_row_index = row
+            self._pending_row_data = None
+            self.open_explorer()
+            show_statusbar_message(self, f"Double-clicked: Opened {row_data['path']}")
 
-    def _on_table_cell_clicked(self, row, column):
+    def _on_table_cell_clicked(self, index):
+        row = index.row()
         self.table.selectRow(row)
-        item = self.table.item(row, 0)
-        if item:
-            row_data = item.data(256)
-            if row_data:
-                self.selected_row_data = row_data
-                self._selected_row_index = row
-                show_statusbar_message(self, f"Selected row: {row_data['name']}")
-                self._pending_row_data = row_data
-                self._selection_debounce_timer.start()
+        row_data = self.table_model.row_data(row)
+        if row_data:
+            self.selected_row_data = row_data
+            self._selected_row_index = row
+            show_statusbar_message(self, f"Selected row: {row_data['name']}")
+            self._pending_row_data = row_data
+            self._selection_debounce_timer.start()
+        if index.column() == FileTableModel.STATUS_COLUMN:
+            self.table.edit(index)
 
     def load_data_from_database(self, keep_search=False):
-        try:
-            # Start timing
-            start_time = time.time()
-            
-            self.db_manager.connect()
-            self._search_query = self.search_edit.text().strip()
-            self._status_filter = self.sort_status_value
-            self._sort_field = self.sort_field
-            self._sort_order = self.sort_order
-            client_id = getattr(self, "sort_client_id", None)
-            batch_number = getattr(self, "sort_batch_number", None)
-            root_value = getattr(self, "sort_root_value", None)
-            category_value = getattr(self, "sort_category_value", None)
-            subcategory_value = getattr(self, "sort_subcategory_value", None)
-            microstock_platform_id = getattr(self, "sort_microstock_platform_id", None)
-            
-            # Time count queries
-            count_start = time.time()
-            self.total_records = self.db_manager.count_files()
-            self.total_draft = self.db_manager.count_files(status_value="Draft")
-            self.found_records = self.db_manager.count_files(
-                search_query=self._search_query,
-                status_value=self._status_filter,
-                client_id=client_id,
-                batch_number=batch_number,
-                root_value=root_value,
-                category_value=category_value,
-                subcategory_value=subcategory_value,
-                microstock_platform_id=microstock_platform_id
-            )
-            count_end = time.time()
-            
-            # Time data query
-            data_start = time.time()
-            self.filtered_data = self.db_manager.get_files_page(
-                page=self.current_page,
-                page_size=self.page_size,
-                search_query=self._search_query,
-                sort_field=self._sort_field,
-                sort_order=self._sort_order,
-                status_value=self._status_filter,
-                client_id=client_id,
-                batch_number=batch_number,
-                root_value=root_value,
-                category_value=category_value,
-                subcategory_value=subcategory_value,
-                microstock_platform_id=microstock_platform_id
-            )
-            data_end = time.time()
-            
-            self.update_table()
-            
-            # Calculate total time
-            total_time = time.time() - start_time
-            count_time = (count_end - count_start) * 1000  # Convert to ms
-            data_time = (data_end - data_start) * 1000  # Convert to ms
-            total_time_ms = total_time * 1000  # Convert to ms
-            
-            show_statusbar_message(self, f"Data loaded in {total_time_ms:.1f}ms (count: {count_time:.1f}ms, data: {data_time:.1f}ms) | Records fetched: {len(self.filtered_data)} / {self.found_records}")
-        except Exception as e:
-            print(f"Error loading data from database: {e}")
-            self.filtered_data = []
-            self.update_table()
-            show_statusbar_message(self, f"Error loading data: {e}")
-        finally:
-            self.db_manager.close()
+        """Reload the table in the background; a newer load supersedes one still running."""
+        self._search_query = self.search_edit.text().strip()
+        self._status_filter = self.sort_status_value
+        self._sort_field = self.sort_field
+        self._sort_order = self.sort_order
+        self._query_filters = dict(
+            search_query=self._search_query,
+            sort_field=self._sort_field,
+            sort_order=self._sort_order,
+            status_value=self._status_filter,
+            client_id=getattr(self, "sort_client_id", None),
+            batch_number=getattr(self, "sort_batch_number", None),
+            root_value=getattr(self, "sort_root_value", None),
+            category_value=getattr(self, "sort_category_value", None),
+            subcategory_value=getattr(self, "sort_subcategory_value", None),
+            microstock_platform_id=getattr(self, "sort_microstock_platform_id", None)
+        )
+        self._load_start_time = time.time()
+        self.db_manager.submit_query(
+            "central_table",
+            self._fetch_table_data,
+            self.db_manager,
+            self._query_filters,
+            self.table_model.block_size,
+            on_result=self._on_table_data_loaded,
+            on_error=self._on_table_data_failed
+        )
+
+    @staticmethod
+    def _fetch_table_data(db_manager, filters, block_size):
+        # Runs on a query executor thread: no widget access here
+        count_start = time.time()
+        totals = db_manager.get_file_totals()
+        count_end = time.time()
+        rows, found = db_manager.get_files_page_with_count(page=1, page_size=block_size, **filters)
+        data_end = time.time()
+        return {
+            "totals": totals,
+            "rows": rows,
+            "found": found,
+            "count_ms": (count_end - count_start) * 1000,
+            "data_ms": (data_end - count_end) * 1000,
+        }
+
+    def _on_table_data_loaded(self, result):
+        # Global totals come from trigger-maintained counters
+        self.total_records = result["totals"]["total"]
+        self.total_draft = result["totals"]["by_status"].get("Draft", 0)
+        self.filtered_data = result["rows"]
+        self.found_records = result["found"]
+        self.update_table()
+        if self._select_after_refresh:
+            self._select_row_by_name_path(*self._select_after_refresh)
+            self._select_after_refresh = None
+        if self._select_first_after_load:
+            self._select_first_after_load = False
+            self._select_first_row()
+
+        total_time_ms = (time.time() - self._load_start_time) * 1000
+        show_statusbar_message(self, f"Data loaded in {total_time_ms:.1f}ms (count: {result['count_ms']:.1f}ms, data: {result['data_ms']:.1f}ms) | Records fetched: {len(self.filtered_data)} / {self.found_records}")
+
+    def _on_table_data_failed(self, error):
+        print(f"Error loading data from database: {error}")
+        self.filtered_data = []
+        self.found_records = 0
+        self.update_table()
+        show_statusbar_message(self, f"Error loading data: {error}")
 
     def refresh_table(self):
         self.load_data_from_database(keep_search=True)
@@ -651,20 +722,14 @@ class CentralWidget(QWidget):
                     main_action.db_manager.close()
                 except Exception as e:
                     print(f"Error refreshing templates: {e}")
-        if self._select_after_refresh:
-            self._select_row_by_name_path(*self._select_after_refresh)
-            self._select_after_refresh = None
 
     def _select_row_by_name_path(self, name, path):
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item:
-                row_data = item.data(256)
-                if row_data and row_data.get('name') == name and row_data.get('path') == path:
-                    self.table.selectRow(row)
-                    self.selected_row_data = row_data
-                    self._selected_row_index = row
-                    break
+        row = self.table_model.find_row(lambda r: r.get('name') == name and r.get('path') == path)
+        if row >= 0:
+            self.table.selectRow(row)
+            self.table.scrollTo(self.table_model.index(row, 0))
+            self.selected_row_data = self.table_model.row_data(row)
+            self._selected_row_index = row
 
     def _on_search_text_changed(self, text):
         self._search_timer.stop()
@@ -679,162 +744,61 @@ class CentralWidget(QWidget):
         if not refresh_only:
             query = self.search_edit.text().lower()
 
-    def _truncate_path_by_width(self, path, column_width):
-        if not path:
-            return ""
-        font_metrics = QFontMetrics(self.table.font())
-        ellipsis = "..."
-        ellipsis_width = font_metrics.horizontalAdvance(ellipsis)
-        available_width = column_width - 20
-        if font_metrics.horizontalAdvance(path) <= available_width:
-            return path
-        if available_width <= ellipsis_width:
-            return ellipsis
-        available_for_text = available_width - ellipsis_width
-        for i in range(len(path), 0, -1):
-            truncated = path[:i]
-            if font_metrics.horizontalAdvance(truncated) <= available_for_text:
-                return truncated + ellipsis
-        return ellipsis
-
     def update_table(self):
-        total_rows = self.found_records
-        total_pages = max(1, (total_rows + self.page_size - 1) // self.page_size)
-        self.current_page = max(1, min(self.current_page, total_pages))
-        self.page_input.blockSignals(True)
-        self.page_input.setMaximum(total_pages)
-        self.page_input.setValue(self.current_page)
-        self.page_input.blockSignals(False)
-        page_data = self.filtered_data
-        self.table.setRowCount(len(page_data))
-        path_column_width = self.table.columnWidth(3)
-        for row_idx, row_data in enumerate(page_data):
-            price, currency, note = self.db_manager.get_item_price_detail(row_data['id'])
-            if price is not None and currency:
-                try:
-                    price_float = float(price)
-                    if price_float.is_integer():
-                        price_str = f"{int(price_float):,}".replace(",", ".")
-                    else:
-                        price_str = f"{price_float:,.2f}".replace(",", ".")
-                    price_str = f"{price_str} {currency}"
-                except Exception:
-                    price_str = f"{price} {currency}"
-            else:
-                price_str = "-"
-            if note:
-                price_note_str = f"{price_str} - {note}"
-            else:
-                price_note_str = f"{price_str} -"
-            earnings = self.db_manager.get_earnings_by_file_id(row_data['id'])
-            shares_str = ""
-            amount_str = ""
-            operational_percent_str = ""
-            if earnings:
-                usernames = [e['username'] for e in earnings]
-                shares_str = "Shares: " + ", ".join(usernames)
-                share_amount = earnings[0]['amount'] if len(earnings) > 0 else None
-                if share_amount is not None and currency:
-                    try:
-                        share_float = float(share_amount)
-                        if share_float.is_integer():
-                            share_str = f"{int(share_float):,}".replace(",", ".")
-                        else:
-                            share_str = f"{share_float:,.2f}".replace(",", ".")
-                        amount_str = f"Amount: {share_str} {currency} each"
-                    except Exception:
-                        amount_str = f"Amount: {share_amount} {currency} each"
-                # Calculate operational percentage used for this record
-                try:
-                    price_float = float(price)
-                    n = len(earnings)
-                    share_amount_float = float(earnings[0]["amount"])
-                    used_percentage = round((1 - (share_amount_float * n / price_float)) * 100)
-                    operational_percent_str = f"Operational Percentage: {used_percentage}%"
-                except Exception:
-                    operational_percent_str = ""
-            client_id = self.db_manager.get_assigned_client_id_for_file(row_data['id'])
-            client_name = self.db_manager.get_client_name_by_file_id(row_data['id'])
-            batch_number = "-"
-            if client_id:
-                batch_number_val = self.db_manager.get_assigned_batch_number(row_data['id'], client_id)
-                if batch_number_val:
-                    batch_number = batch_number_val
-            tooltip = (
-                f"Date: {row_data.get('date','')}\n"
-                f"Name: {row_data.get('name','')}\n"
-                f"Root: {row_data.get('root','')}\n"
-                f"Path: {row_data.get('path','')}\n"
-                f"Status: {row_data.get('status','')}\n"
-                f"Client: {client_name}\n"
-                f"Batch Number: {batch_number}\n"
-                f"Price: {price_note_str}\n"
-                f"{shares_str}\n"
-                f"{amount_str}\n"
-                f"{operational_percent_str}"
-            )
-            date_item = QTableWidgetItem(row_data['date'])
-            date_item.setData(256, row_data)
-            date_item.setToolTip(tooltip)
-            self.table.setItem(row_idx, 0, date_item)
-            name_item = QTableWidgetItem(row_data['name'])
-            name_item.setToolTip(tooltip)
-            self.table.setItem(row_idx, 1, name_item)
-            root_item = QTableWidgetItem(row_data['root'])
-            root_item.setToolTip(tooltip)
-            self.table.setItem(row_idx, 2, root_item)
-            truncated_path = self._truncate_path_by_width(row_data['path'], path_column_width)
-            path_item = QTableWidgetItem(truncated_path)
-            path_item.setData(Qt.UserRole, row_data['path'])
-            path_item.setToolTip(tooltip)
-            self.table.setItem(row_idx, 3, path_item)
-            combo = NoWheelComboBox(self.table)
-            combo.addItems(self.status_options)
-            combo.setCurrentText(row_data['status'])
-            self._set_status_text_color(combo, row_data['status'])
-            combo.currentTextChanged.connect(lambda val, row=row_idx: self._on_status_changed(row, val))
-            combo.setFocusPolicy(Qt.StrongFocus)
-            self.table.setCellWidget(row_idx, 4, combo)
-            combo.setToolTip(tooltip)
-        self.page_label.setText(f"Page {self.current_page} / {total_pages}")
-        self.prev_btn.setEnabled(self.current_page > 1)
-        self.next_btn.setEnabled(self.current_page < total_pages)
+        # Refreshes keep the scroll position (the row's block is fetched on demand);
+        # new searches and sorts reset current_page and start from the top
+        top_row = self.table.rowAt(0) if self.current_page > 1 else -1
+        self.table_model.reset_rows(getattr(self, "_query_filters", {}), self.filtered_data, self.found_records)
+        if not (0 < top_row < self.found_records and self._scroll_to_row(top_row)):
+            self.table.scrollToTop()
+        self._update_page_position()
         self.update_stats_label()
-        if self._selected_row_index is not None and 0 <= self._selected_row_index < self.table.rowCount():
-            self.table.selectRow(self._selected_row_index)
+        if self.selected_row_data:
+            selected_id = self.selected_row_data.get('id')
+            row = self.table_model.find_row(lambda r: r['id'] == selected_id)
+            if row >= 0:
+                self.table.selectRow(row)
+                self._selected_row_index = row
         # Trigger empty table timer if table is empty
-        if self.table.rowCount() == 0:
+        if self.table_model.rowCount() == 0:
             if not self._empty_table_timer.isActive():
                 self._empty_table_timer.start()
         else:
             if self._empty_table_timer.isActive():
                 self._empty_table_timer.stop()
-        
-        # Trigger path update timer to fix truncation after render
-        if self.table.rowCount() > 0:
-            self._path_update_timer.start()
 
     def _on_empty_table_timeout(self):
-        if self.table.rowCount() == 0:
+        if self.table_model.rowCount() == 0:
             self.refresh_table()
 
-    def _update_path_truncation(self):
-        """Update path truncation after table is fully rendered"""
-        path_column_width = self.table.columnWidth(3)
-        for row_idx in range(self.table.rowCount()):
-            path_item = self.table.item(row_idx, 3)
-            if path_item:
-                full_path = path_item.data(Qt.UserRole)
-                if full_path:
-                    truncated_path = self._truncate_path_by_width(full_path, path_column_width)
-                    path_item.setText(truncated_path)
+    def _update_page_position(self, *_):
+        """Keep the page label, buttons and spin box in step with the scroll position."""
+        total_rows = self.found_records
+        total_pages = max(1, (total_rows + self.page_size - 1) // self.page_size)
+        top_row = max(0, self.table.rowAt(0))
+        self.current_page = min(total_pages, top_row // self.page_size + 1)
+        self.page_input.blockSignals(True)
+        self.page_input.setMaximum(total_pages)
+        self.page_input.setValue(self.current_page)
+        self.page_input.blockSignals(False)
+        self.page_label.setText(f"Page {self.current_page} / {total_pages}")
+        self.prev_btn.setEnabled(self.current_page > 1)
+        self.next_btn.setEnabled(self.current_page < total_pages)
 
     def goto_page(self, value):
         total_rows = self.found_records
         total_pages = max(1, (total_rows + self.page_size - 1) // self.page_size)
         if 1 <= value <= total_pages:
-            self.current_page = value
-            self.load_data_from_database(keep_search=True)
+            self._scroll_to_row((value - 1) * self.page_size)
+            self._update_page_position()
+
+    def _scroll_to_row(self, row):
+        if not self.table_model.ensure_row_loaded(row):
+            return False
+        # Lay out the rows just inserted so the scroll range already covers them
+        self.table.doItemsLayout()
+        self.table.scrollTo(self.table_model.index(row, 0), QAbstractItemView.PositionAtTop)
+        return True
 
     def _on_page_input_value_changed(self, value):
         self._pending_page_value = value
@@ -891,73 +855,45 @@ class CentralWidget(QWidget):
                 f"Total: {self.total_records} | Draft: {self.total_draft} | Last: {last_date}"
             )
 
-    def on_row_selected(self):
-        current_row = self.table.currentRow()
+    def on_row_selected(self, *_):
+        current_row = self.table.currentIndex().row()
         if current_row >= 0:
-            date_item = self.table.item(current_row, 0)
-            if date_item:
-                row_data = date_item.data(256)
-                if row_data:
-                    self.selected_row_data = row_data
-                    self._selected_row_index = current_row
-                    self._pending_row_data = row_data
-                    self._selection_debounce_timer.start()
-
-    def _set_status_text_color(self, combo, status):
-        if status in self.status_config:
-            config = self.status_config[status]
-            color = config.get("color", "")
-            font_weight = config.get("font_weight", "normal")
-            combo.setStyleSheet(f"color: {color}; font-weight: {font_weight};")
-        else:
-            combo.setStyleSheet("")
+            row_data = self.table_model.row_data(current_row)
+            if row_data:
+                self.selected_row_data = row_data
+                self._selected_row_index = current_row
+                self._pending_row_data = row_data
+                self._selection_debounce_timer.start()
 
-    def _on_status_changed(self, row, value):
-        if row < 0 or row >= len(self.filtered_data):
-            return
-        row_data = self.filtered_data[row]
-        old_status = row_data['status']
-        row_data['status'] = value
+    def _on_status_changed(self, row_data, value):
         try:
             self.db_manager.connect()
             status_id = self.db_manager.get_status_id(value)
             if status_id is not None:
                 self.db_manager.update_file_status(row_data['id'], status_id)
+                row_data['status'] = value
                 row_data['status_id'] = status_id
-                combo = self.table.cellWidget(row, 4)
-                if combo:
-                    self._set_status_text_color(combo, value)
                 self.load_data_from_database(keep_search=True)
         except Exception as e:
             print(f"Error updating status: {e}")
-            row_data['status'] = old_status
-            combo = self.table.cellWidget(row, 4)
-            if combo:
-                combo.setCurrentText(old_status)
         finally:
             self.db_manager.close()
 
     def prev_page(self):
         if self.current_page > 1:
-            self.current_page -= 1
-            self.load_data_from_database(keep_search=True)
+            self.goto_page(self.current_page - 1)
 
     def next_page(self):
         total_rows = self.found_records
         total_pages = max(1, (total_rows + self.page_size - 1) // self.page_size)
         if self.current_page < total_pages:
-            self.current_page += 1
-            self.load_data_from_database(keep_search=True)
+            self.goto_page(self.current_page + 1)
 
     def show_context_menu(self, pos):
         index = self.table.indexAt(pos)
         if not index.isValid():
             return
-        row = index.row()
-        item = self.table.item(row, 0)
-        if not item:
-            return
-        row_data = item.data(256)
+        row_data = self.table_model.row_data(index.row())
         if not row_data:
             return
 
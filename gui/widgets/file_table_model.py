@@ -0,0 +1,356 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+import qtawesome as qta
+
+
+class FileTableModel(QAbstractTableModel):
+    """Lazy table model for the main archive view.
+
+    Rows are loaded in blocks of block_size from DatabaseFilesHelper as the view
+    asks for them (canFetchMore/fetchMore). Blocks and their tooltip details are
+    fetched through db_manager.submit_query, off the GUI thread: a row shows a
+    placeholder until its block arrives and dataChanged is emitted. Only the max_blocks most recently
+    used blocks are kept; an evicted block is fetched again when it scrolls back
+    into view. Appending the next block seeks from the last row of the previous
+    one (keyset), any other block is read by OFFSET.
+    """
+
+    status_change_requested = Signal(dict, str)
+
+    COLUMNS = [
+        ("Date", "fa6s.calendar", "date"),
+        ("Name", "fa6s.file", "name"),
+        ("Root", "fa6s.folder", "root"),
+        ("Path", "fa6s.folder-tree", "path"),
+        ("Status", "fa6s.circle-info", "status"),
+    ]
+    STATUS_COLUMN = 4
+
+    def __init__(self, db_manager, block_size=200, max_blocks=10, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self._filters = {}
+        self._total = 0
+        self._row_count = 0
+        self._blocks = OrderedDict()
+        self._details = {}
+        self._pending = set()
+        self._generation = 0
+        self._header_icons = {}
+
+    def set_db_manager(self, db_manager):
+        self._cancel_pending()
+        self.db_manager = db_manager
+
+    def reset_rows(self, filters, first_rows, total):
+        """Start over for a new query; first_rows is block 0 as already fetched by the caller."""
+        self.beginResetModel()
+        self._cancel_pending()
+        self._filters = dict(filters)
+        self._total = total
+        self._blocks.clear()
+        self._details.clear()
+        if first_rows:
+            self._blocks[0] = list(first_rows)
+        self._row_count = min(total, len(first_rows))
+        self.endResetModel()
+
+    def total_rows(self):
+        return self._total
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal or not 0 <= section < len(self.COLUMNS):
+            return None
+        label, icon_name, _ = self.COLUMNS[section]
+        if role == Qt.DisplayRole:
+            return label
+        if role == Qt.DecorationRole:
+            if section not in self._header_icons:
+                self._header_icons[section] = qta.icon(icon_name)
+            return self._header_icons[section]
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.STATUS_COLUMN:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row_data = self.row_data(index.row())
+        if row_data is None:
+            # Placeholder until the row's block arrives (dataChanged follows)
+            if role == Qt.DisplayRole and index.column() == 1 and index.row() < self._row_count:
+                return "Loading..."
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return row_data.get(self.COLUMNS[index.column()][2])
+        if role == Qt.UserRole:
+            return row_data
+        if role == Qt.ToolTipRole:
+            return self._build_tooltip(row_data, self._row_details(index.row()))
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.column() != self.STATUS_COLUMN:
+            return False
+        row_data = self.row_data(index.row())
+        if row_data is None or value == row_data.get("status"):
+            return False
+        # The owner writes the status to the database and reloads the model
+        self.status_change_requested.emit(row_data, value)
+        return True
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._row_count < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self._grow_to(min(self._total, self._row_count + self.block_size))
+
+    def ensure_row_loaded(self, row):
+        """Make row part of the model (for jumps) and start loading its block."""
+        if not 0 <= row < self._total:
+            return False
+        if row >= self._row_count:
+            self._grow_to(min(self._total, (row // self.block_size + 1) * self.block_size))
+        self.row_data(row)
+        return True
+
+    def row_data(self, row):
+        """Return the cached row, or None while its block is still loading."""
+        if not 0 <= row < self._row_count:
+            return None
+        block = self._get_block(row // self.block_size)
+        if block is None:
+            return None
+        offset = row % self.block_size
+        if offset >= len(block):
+            return None
+        return block[offset]
+
+    def find_row(self, predicate):
+        """Return the row number of the first cached row matching predicate, or -1."""
+        for block_index in sorted(self._blocks):
+            for offset, row_data in enumerate(self._blocks[block_index]):
+                if predicate(row_data):
+                    return block_index * self.block_size + offset
+        return -1
+
+    def has_file_ids(self, file_ids):
+        """True when every id in file_ids is in a cached block."""
+        missing = set(file_ids)
+        for block in self._blocks.values():
+            missing.difference_update(row_data["id"] for row_data in block)
+            if not missing:
+                return True
+        return not missing
+
+    def refresh_file_ids(self, file_ids):
+        """Re-fetch the cached blocks holding any of file_ids; returns how many were requested.
+
+        The old rows stay on screen until the new ones arrive.
+        """
+        file_ids = set(file_ids)
+        stale = [
+            block_index for block_index, block in self._blocks.items()
+            if any(row_data["id"] in file_ids for row_data in block)
+        ]
+        for block_index in stale:
+            self._details.pop(block_index, None)
+            self._request_block(block_index)
+        return len(stale)
+
+    def _grow_to(self, new_count):
+        if new_count <= self._row_count:
+            return
+        # Start loading the block holding the new last row before the view asks for it
+        self._get_block((new_count - 1) // self.block_size)
+        self.beginInsertRows(QModelIndex(), self._row_count, new_count - 1)
+        self._row_count = new_count
+        self.endInsertRows()
+
+    def _get_block(self, block_index):
+        block = self._blocks.get(block_index)
+        if block is None:
+            self._request_block(block_index)
+        else:
+            self._blocks.move_to_end(block_index)
+        return block
+
+    def _query_key(self, kind, block_index):
+        return f"file_table_{kind}_{block_index}"
+
+    def _cancel_pending(self):
+        # Results of the previous query are dropped by the generation check
+        # even if a cancel arrives too late
+        self._generation += 1
+        if self.db_manager is not None:
+            for kind, block_index in self._pending:
+                self.db_manager.cancel_query(self._query_key(kind, block_index))
+        self._pending.clear()
+
+    def _request_block(self, block_index):
+        if ("block", block_index) in self._pending or self.db_manager is None:
+            return
+        kwargs = dict(self._filters)
+        previous = self._blocks.get(block_index - 1)
+        if previous and len(previous) == self.block_size and self._filters.get("sort_field") != "relevance":
+            last = previous[-1]
+            kwargs["seek"] = ("next", last["sort_key"], last["id"])
+        generation = self._generation
+        self._pending.add(("block", block_index))
+        # page is still passed with seek: the local replica only reads by page
+        self.db_manager.submit_query(
+            self._query_key("block", block_index),
+            self.db_manager.get_files_page,
+            page=block_index + 1, page_size=self.block_size,
+            on_result=lambda rows: self._on_block_loaded(generation, block_index, rows),
+            on_error=lambda e: self._on_block_failed(generation, block_index, e),
+            **kwargs
+        )
+
+    def _on_block_loaded(self, generation, block_index, rows):
+        if generation != self._generation:
+            return
+        self._pending.discard(("block", block_index))
+        self._blocks[block_index] = list(rows or [])
+        self._details.pop(block_index, None)
+        while len(self._blocks) > self.max_blocks:
+            evicted, _ = self._blocks.popitem(last=False)
+            self._details.pop(evicted, None)
+        self._emit_block_changed(block_index)
+
+    def _on_block_failed(self, generation, block_index, error):
+        if generation != self._generation:
+            return
+        # Not cached: the block is requested again the next time the view asks for it
+        self._pending.discard(("block", block_index))
+        print(f"Error loading rows {block_index * self.block_size}+: {error}")
+
+    def _emit_block_changed(self, block_index):
+        first = block_index * self.block_size
+        last = min(first + self.block_size, self._row_count) - 1
+        if first <= last:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.COLUMNS) - 1))
+
+    def _row_details(self, row):
+        block_index = row // self.block_size
+        details = self._details.get(block_index)
+        if details is None:
+            self._request_details(block_index)
+            details = {}
+        row_data = self.row_data(row)
+        return details.get(row_data["id"], {}) if row_data else {}
+
+    def _request_details(self, block_index):
+        block = self._blocks.get(block_index)
+        if not block or ("details", block_index) in self._pending or self.db_manager is None:
+            return
+        generation = self._generation
+        self._pending.add(("details", block_index))
+        self.db_manager.submit_query(
+            self._query_key("details", block_index),
+            self.db_manager.get_files_page_details,
+            [r["id"] for r in block],
+            on_result=lambda details: self._on_details_loaded(generation, block_index, details),
+            on_error=lambda e: self._on_details_failed(generation, block_index, e),
+        )
+
+    def _on_details_loaded(self, generation, block_index, details):
+        if generation != self._generation:
+            return
+        self._pending.discard(("details", block_index))
+        if block_index in self._blocks:
+            self._details[block_index] = details or {}
+            self._emit_block_changed(block_index)
+
+    def _on_details_failed(self, generation, block_index, error):
+        if generation != self._generation:
+            return
+        self._pending.discard(("details", block_index))
+        print(f"Error loading row details: {error}")
+
+    def _build_tooltip(self, row_data, details):
+        price = details.get("price", "")
+        currency = details.get("currency", "IDR")
+        note = details.get("note", "")
+        if price is not None and currency:
+            try:
+                price_float = float(price)
+                if price_float.is_integer():
+                    price_str = f"{int(price_float):,}".replace(",", ".")
+                else:
+                    price_str = f"{price_float:,.2f}".replace(",", ".")
+                price_str = f"{price_str} {currency}"
+            except Exception:
+                price_str = f"{price} {currency}"
+        else:
+            price_str = "-"
+        if note:
+            price_note_str = f"{price_str} - {note}"
+        else:
+            price_note_str = f"{price_str} -"
+        earnings = details.get("earnings", [])
+        shares_str = ""
+        amount_str = ""
+        operational_percent_str = ""
+        if earnings:
+            usernames = [e['username'] for e in earnings]
+            shares_str = "Shares: " + ", ".join(usernames)
+            share_amount = earnings[0]['amount'] if len(earnings) > 0 else None
+            if share_amount is not None and currency:
+                try:
+                    share_float = float(share_amount)
+                    if share_float.is_integer():
+                        share_str = f"{int(share_float):,}".replace(",", ".")
+                    else:
+                        share_str = f"{share_float:,.2f}".replace(",", ".")
+                    amount_str = f"Amount: {share_str} {currency} each"
+                except Exception:
+                    amount_str = f"Amount: {share_amount} {currency} each"
+            # Calculate operational percentage used for this record
+            try:
+                price_float = float(price)
+                n = len(earnings)
+                share_amount_float = float(earnings[0]["amount"])
+                used_percentage = round((1 - (share_amount_float * n / price_float)) * 100)
+                operational_percent_str = f"Operational Percentage: {used_percentage}%"
+            except Exception:
+                operational_percent_str = ""
+        client_id = details.get("client_id")
+        client_name = details.get("client_name", "")
+        batch_number = "-"
+        if client_id and details.get("batch_number"):
+            batch_number = details["batch_number"]
+        return (
+            f"Date: {row_data.get('date','')}\n"
+            f"Name: {row_data.get('name','')}\n"
+            f"Root: {row_data.get('root','')}\n"
+            f"Path: {row_data.get('path','')}\n"
+            f"Status: {row_data.get('status','')}\n"
+            f"Client: {client_name}\n"
+            f"Batch Number: {batch_number}\n"
+            f"Price: {price_note_str}\n"
+            f"{shares_str}\n"
+            f"{amount_str}\n"
+            f"{operational_percent_str}"
+        )
@@ -84,7 +84,9 @@ class MainMenu(QMenuBar):
 
     def show_teams_profile(self):
         from gui.dialogs.teams_profile_dialog import TeamsProfileDialog
-        dialog = TeamsProfileDialog(self)
+        parent = self.parent()
+        db_manager = getattr(parent, 'db_manager', None)
+        dialog = TeamsProfileDialog(self, db_manager=db_manager)
         dialog.exec()
 
     def show_teams_attendance(self):
@@ -95,7 +97,9 @@ class MainMenu(QMenuBar):
         dialog.exec()
 
     def show_client_dialog(self):
-        dialog = ClientDataDialog(self)
+        parent = self.parent()
+        db_manager = getattr(parent, 'db_manager', None)
+        dialog = ClientDataDialog(self, db_manager=db_manager)
         dialog.exec()
 
     def show_batch_management_dialog(self):
@@ -175,10 +179,13 @@ class MainMenu(QMenuBar):
         basedir = Path(__file__).parent.parent.parent
         db_config_path = basedir / "configs" / "db_config.json"
         db_config_manager = ConfigManager(str(db_config_path))
-        db_manager = DatabaseManager(db_config_manager, self.config_manager)
-
-        dialog = PreferencesWindow(self.config_manager, db_manager, self)
-        dialog.exec()
+        # No application database manager to share: use a short-lived one
+        db_manager = DatabaseManager(db_config_manager, self.config_manager, auto_initialize=False)
+        try:
+            dialog = PreferencesWindow(self.config_manager, db_manager, self)
+            dialog.exec()
+        finally:
+            db_manager.shutdown()
 
     def show_database_config(self):
         parent = self.parent()
@@ -56,8 +56,6 @@ class MainWindow(QMainWindow):
 
         self.central_widget.row_selected.connect(self.properties_widget.update_properties)
         
-        self.db_manager.data_changed.connect(self.attendance_bar.refresh_attendance)
-
         self.status_bar = QStatusBar(self)
         self.setStatusBar(self.status_bar)
         
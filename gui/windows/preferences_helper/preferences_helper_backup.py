@@ -1,7 +1,7 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QGroupBox, QLabel, QPushButton, QListWidget,
     QAbstractItemView, QHBoxLayout, QMessageBox, QDialog, QProgressBar,
-    QFileDialog, QListWidgetItem, QComboBox, QFrame, QSizePolicy
+    QFileDialog, QListWidgetItem, QComboBox, QFrame, QSizePolicy, QSpinBox
 )
 from PySide6.QtCore import QCoreApplication, QThread, Signal, Qt
 import qtawesome as qta
@@ -36,11 +36,16 @@ class _BackupWorker(QThread):
                     progress_callback=lambda p, t: self.progress.emit('csv', p, t),
                 )
             elif self.mode == 'import_csv':
-                self.helper.import_from_csv(
+                summary = self.helper.import_from_csv(
                     self.kwargs['path'],
                     progress_callback=lambda p, t: self.progress.emit('csv', p, t),
                     resolution_mode=self.kwargs.get('resolution_mode', 'skip'),
                 )
+                if summary and summary.get('reject_path'):
+                    self.kwargs['success_message'] = (
+                        f"{self.kwargs.get('success_message', 'Done.')}\n\n"
+                        f"{summary['rejected']} row(s) could not be imported; see:\n{summary['reject_path']}"
+                    )
             elif self.mode == 'export_sql':
                 self.helper.export_database(
                     self.kwargs['path'],
@@ -118,7 +123,8 @@ class PreferencesBackupHelper:
         self.parent.backup_sql_btn.setCursor(Qt.PointingHandCursor)
         self.parent.backup_sql_btn.setToolTip(
             "Export the full database to a SQL script. Recommended for large databases; "
-            "uses pg_dump if available, otherwise the built-in streaming engine."
+            "uses pg_dump if available, otherwise the built-in streaming engine. "
+            "Saving as .sql.gz always uses the built-in engine and compresses the file."
         )
         export_layout.addWidget(self.parent.backup_sql_btn)
 
@@ -200,6 +206,24 @@ class PreferencesBackupHelper:
 
         manual_layout.addWidget(tool_hint_frame)
 
+        # ---- Built-in engine parallelism ----
+        workers_row = QHBoxLayout()
+        workers_row.setContentsMargins(0, 0, 0, 0)
+        workers_row.setSpacing(8)
+        workers_label = QLabel("Parallel workers:")
+        workers_row.addWidget(workers_label)
+        self.parent.backup_workers_spin = QSpinBox()
+        self.parent.backup_workers_spin.setRange(1, backup_helper.MAX_PARALLEL_WORKERS)
+        self.parent.backup_workers_spin.setValue(backup_helper.get_parallel_workers())
+        self.parent.backup_workers_spin.setToolTip(
+            "Number of database connections the built-in engine uses to back up or restore "
+            "tables at the same time. 1 processes tables one after another; a restore with "
+            "more than one worker is no longer a single all-or-nothing transaction."
+        )
+        workers_row.addWidget(self.parent.backup_workers_spin)
+        workers_row.addWidget(self._make_description("1 = sequential. Applies to the built-in engine only."), 1)
+        manual_layout.addLayout(workers_row)
+
         tab_layout.addWidget(manual_group)
 
         # ============================================================
@@ -252,6 +276,10 @@ class PreferencesBackupHelper:
 
         return tab
 
+    def save_backup_settings(self):
+        """Save the backup tab settings to db_config.json"""
+        self.db_manager.backup_helper.set_parallel_workers(self.parent.backup_workers_spin.value())
+
     def _make_description(self, text):
         """Return a consistently styled description label."""
         label = QLabel(text)
@@ -267,7 +295,7 @@ class PreferencesBackupHelper:
             return
         backup_files = []
         for fname in os.listdir(backup_dir):
-            if fname.startswith("archive_database_") and fname.endswith(".sql"):
+            if fname.startswith("archive_database_") and fname.endswith((".sql", ".sql.gz")):
                 fpath = os.path.join(backup_dir, fname)
                 backup_files.append((fpath, os.path.getmtime(fpath)))
         backup_files.sort(key=lambda x: x[1], reverse=True)
@@ -279,6 +307,11 @@ class PreferencesBackupHelper:
             item_layout = QHBoxLayout(item_widget)
             item_layout.setContentsMargins(6, 4, 6, 4)
             item_layout.setSpacing(8)
+            # Hourly deltas are restored together with their daily base
+            delta_files = self.db_manager.backup_helper.list_delta_files(fpath)
+            if delta_files:
+                dt = datetime.fromtimestamp(os.path.getmtime(delta_files[-1]))
+                fname = f"{fname} + {len(delta_files)} delta{'s' if len(delta_files) != 1 else ''}"
             label = QLabel(f"{fname}  ({dt.strftime('%Y-%m-%d %H:%M:%S')})")
             if days_old == 0:
                 label.setStyleSheet("color: #1976d2;")
@@ -300,7 +333,7 @@ class PreferencesBackupHelper:
         """Calculate days old from filename"""
         fname = os.path.basename(db_file_path)
         try:
-            base = fname.replace("archive_database_", "").replace(".sql", "")
+            base = fname.replace("archive_database_", "").split(".", 1)[0]
             dt = datetime.strptime(base, "%Y%m%d").date()
             days_old = (date.today() - dt).days
             return days_old if days_old >= 0 else 0
@@ -311,7 +344,8 @@ class PreferencesBackupHelper:
 
     def restore_db_backup_clicked(self, backup_path, backup_days_old):
         """Handle restore backup button click"""
-        dt = datetime.fromtimestamp(os.path.getmtime(backup_path))
+        delta_files = self.db_manager.backup_helper.list_delta_files(backup_path)
+        dt = datetime.fromtimestamp(os.path.getmtime(delta_files[-1] if delta_files else backup_path))
         age_str = f"{backup_days_old} day{'s' if backup_days_old != 1 else ''}"
         msg = (
             f"This backup is {age_str} old (created {dt.strftime('%Y-%m-%d %H:%M:%S')}).\n"
@@ -331,13 +365,13 @@ class PreferencesBackupHelper:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_dir = os.path.join(self.db_manager.db_dir, "db_backups")
         os.makedirs(backup_dir, exist_ok=True)
-        backup_path = os.path.join(backup_dir, f"manual_database_{timestamp}.sql")
+        backup_path = os.path.join(backup_dir, f"manual_database_{timestamp}.sql.gz")
 
         self._run_export_worker(
             mode='export_sql',
             path=backup_path,
             success_message=f"Database backup created:\n{backup_path}",
-            extra_kwargs={'use_pg_dump': self.db_manager.backup_helper.has_pg_dump()},
+            extra_kwargs={'use_pg_dump': False},
             on_success=lambda: self.refresh_db_backup_list(),
         )
 
@@ -352,15 +386,9 @@ class PreferencesBackupHelper:
         if not filename:
             return
 
-        # Pre-count rows for progress (cheap; runs once on the main thread)
+        # Planner estimates only: counting every table would scan them all on the main thread
         try:
-            total_rows = 0
-            self.db_manager.connect(write=False)
-            cursor = self.db_manager.connection.cursor()
-            for table_name in self.db_manager.backup_helper.get_all_user_tables():
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                total_rows += cursor.fetchone()[0]
-            self.db_manager.close()
+            total_rows = sum(self.db_manager.backup_helper.estimate_table_rows().values())
         except Exception:
             total_rows = 0
 
@@ -414,7 +442,8 @@ class PreferencesBackupHelper:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         default_filename = f"Rak_Arsip_Database_Backup_{timestamp}.sql"
         filename, _ = QFileDialog.getSaveFileName(
-            self.parent, "Save Database Backup (SQL)", default_filename, "SQL Files (*.sql)"
+            self.parent, "Save Database Backup (SQL)", default_filename,
+            "SQL Files (*.sql);;Compressed SQL Files (*.sql.gz)"
         )
         if not filename:
             return
@@ -434,9 +463,9 @@ class PreferencesBackupHelper:
         )
 
     def restore_database_sql(self):
-        """Import database from SQL file (.sql)."""
+        """Import database from SQL file (.sql or .sql.gz)."""
         filename, _ = QFileDialog.getOpenFileName(
-            self.parent, "Select SQL Backup", "", "SQL Files (*.sql);;All Files (*)"
+            self.parent, "Select SQL Backup", "", "SQL Files (*.sql *.sql.gz);;All Files (*)"
         )
         if not filename:
             return
@@ -72,6 +72,7 @@ class PreferencesWindow(QDialog):
         """Apply changes from all helpers"""
         try:
             self.actions_helper.save_action_options_data()
+            self.backup_helper.save_backup_settings()
             QMessageBox.information(self, "Success", "Preferences saved successfully.")
             self.accept()
         except Exception as e: